@@ -16,8 +16,8 @@ ambiguous queries like 'comfortable shoes' or 'something for a wedding'."
 import os
 import uuid
 import json
-import boto3
-from typing import Optional
+import threading
+from typing import Callable, Iterator, List, Optional
 
 BEDROCK_REGION = os.getenv("AWS_REGION", "us-east-1")
 
@@ -31,21 +31,50 @@ class BedrockClient:
         agent_alias_id: str,
         region: Optional[str] = None,
         mock_mode: bool = False,
+        product_loader: Optional[Callable[[List[str]], List[dict]]] = None,
     ):
+        """
+        Initialize the client.
+
+        Args:
+            agent_id: Bedrock Agent ID
+            agent_alias_id: Bedrock Agent alias ID
+            region: AWS region (defaults to AWS_REGION)
+            mock_mode: If True, answer with canned responses instead of AWS
+            product_loader: Optional lookup of full products by shoe_id (e.g.
+                DynamoDBClient.get_products_by_ids), used to hydrate the
+                compact results the action group returns
+        """
         self.agent_id = agent_id
         self.agent_alias_id = agent_alias_id
         self.region = region or BEDROCK_REGION
         self.mock_mode = mock_mode
+        self.product_loader = product_loader
 
-        if not self.mock_mode:
-            # TODO: This client will be used after you create your Bedrock Agent
-            # in AWS console (Day 2, Block 1-2 of Learning Plan)
-            self._client = boto3.client(
-                "bedrock-agent-runtime",
-                region_name=self.region
-            )
-        else:
-            self._client = None
+        # The boto3 client is created on first use (see _client)
+        self._boto_client = None
+        self._boto_client_lock = threading.Lock()
+
+    @property
+    def _client(self):
+        """
+        Bedrock Agent Runtime client, created on first use; None in mock mode.
+
+        Most API cold starts never reach the agent (catalog reads, fast path
+        searches), so neither boto3 nor the service model is loaded for them.
+        """
+        if self.mock_mode:
+            return None
+        if self._boto_client is None:
+            with self._boto_client_lock:
+                if self._boto_client is None:
+                    import boto3
+
+                    self._boto_client = boto3.client(
+                        "bedrock-agent-runtime",
+                        region_name=self.region
+                    )
+        return self._boto_client
 
     def invoke_agent(self, query: str, session_id: Optional[str] = None) -> dict:
         """
@@ -71,50 +100,126 @@ class BedrockClient:
             return self._get_mock_response(query, current_session_id)
 
         try:
-            response = self._client.invoke_agent(
-                agentId=self.agent_id,
-                agentAliasId=self.agent_alias_id,
-                sessionId=current_session_id,
-                inputText=query,
-                enableTrace=True  # Enable trace to get Lambda response
-            )
-            completion = ""
+            chunks = []
             products = []
 
-            for event in response.get("completion"):
-                # Capture agent's text response
-                if 'chunk' in event:
-                    chunk = event["chunk"]
-                    completion += chunk["bytes"].decode()
-
-                # Extract products from trace (Lambda response)
-                if 'trace' in event:
-                    trace_data = event['trace']
-                    trace = trace_data.get('trace', {})
-                    orchestration = trace.get('orchestrationTrace', {})
-
-                    # Check for function invocation output
-                    if 'observation' in orchestration:
-                        observation = orchestration['observation']
-                        if 'actionGroupInvocationOutput' in observation:
-                            output = observation['actionGroupInvocationOutput']
-                            if 'text' in output:
-                                try:
-                                    # Parse the JSON product data from Lambda
-                                    products = json.loads(output['text'])
-                                    print(f"Extracted {len(products)} products from Lambda")
-                                except json.JSONDecodeError:
-                                    pass
+            for event_type, data in self.stream_agent(query, current_session_id):
+                if event_type == "text":
+                    chunks.append(data)
+                elif event_type == "products":
+                    products = data
 
             return {
-                "agent_response": completion,
+                "agent_response": "".join(chunks),
                 "products": products,
                 "session_id": current_session_id
             }
         except Exception as e:
             print(f"Error invoking agent: {e}")
-            return self._get_mock_response(query, current_session_id)
+            # Flag the stand-in answer so callers do not cache it
+            fallback = self._get_mock_response(query, current_session_id)
+            fallback["fallback"] = True
+            return fallback
+
+    def stream_agent(self, query: str, session_id: Optional[str] = None) -> Iterator[tuple]:
+        """
+        Invoke the Bedrock Agent and yield its output as it arrives.
+
+        Args:
+            query: Natural language search query from user
+            session_id: Optional session ID for conversation continuity
+
+        Yields:
+            (event_type, data) tuples:
+                - ("text", str): A completion chunk, as soon as it is received
+                - ("products", list): Products from the action group, as soon
+                  as its observation trace is parsed
+                - ("done", str): The session ID, after the last chunk
+
+        Raises:
+            ValueError: If the query is empty
+            Exception: If the agent invocation fails
+        """
+        if not query or query.strip() == "":
+            raise ValueError("Query cannot be empty")
 
+        current_session_id = session_id or str(uuid.uuid4())
+
+        if self.mock_mode:
+            mock = self._get_mock_response(query, current_session_id)
+            words = mock["agent_response"].split(" ")
+            for position, word in enumerate(words):
+                yield "text", word if position == 0 else " " + word
+            yield "products", mock["products"]
+            yield "done", current_session_id
+            return
+
+        response = self._client.invoke_agent(
+            agentId=self.agent_id,
+            agentAliasId=self.agent_alias_id,
+            sessionId=current_session_id,
+            inputText=query,
+            enableTrace=True  # Enable trace to get Lambda response
+        )
+
+        for event in response.get("completion"):
+            # Capture agent's text response
+            if 'chunk' in event:
+                yield "text", event["chunk"]["bytes"].decode()
+
+            # Extract products from trace (Lambda response)
+            if 'trace' in event:
+                products = self._extract_products(event['trace'])
+                if products is not None:
+                    yield "products", self._hydrate_products(products)
+
+        yield "done", current_session_id
+
+    def _hydrate_products(self, products: list) -> list:
+        """
+        Replace the action group's compact results with full catalog products.
+
+        Products the loader does not know (or all of them, if the lookup
+        fails) keep their compact fields, which are enough for ShoeProduct.
+        """
+        if not self.product_loader or not products:
+            return products
+
+        try:
+            loaded = self.product_loader([p["shoe_id"] for p in products if "shoe_id" in p])
+        except Exception as e:
+            print(f"Error hydrating agent products: {e}")
+            return products
+
+        by_id = {product["shoe_id"]: product for product in loaded}
+        return [by_id.get(p.get("shoe_id"), p) for p in products]
+
+    @staticmethod
+    def _extract_products(trace_data: dict) -> Optional[list]:
+        """
+        Parse the Lambda's products out of an action group observation trace.
+
+        Accepts the compact {"count": ..., "products": [...]} body as well as
+        the older bare list of full product documents.
+        """
+        trace = trace_data.get('trace', {})
+        orchestration = trace.get('orchestrationTrace', {})
+
+        # Check for function invocation output
+        observation = orchestration.get('observation', {})
+        output = observation.get('actionGroupInvocationOutput', {})
+        if 'text' not in output:
+            return None
+
+        try:
+            # Parse the JSON product data from Lambda
+            products = json.loads(output['text'])
+            if isinstance(products, dict):
+                products = products.get('products', [])
+            print(f"Extracted {len(products)} products from Lambda")
+            return products
+        except json.JSONDecodeError:
+            return None
 
     def _get_mock_response(self, query: str, session_id: str) -> dict:
         """Generate mock response for development/testing."""
@@ -0,0 +1,314 @@
+"""
+Columnar view of the cached catalog for vectorized filtering.
+
+Filtering a list of product dicts touches every dict once per filter. When the
+whole catalog is held in memory (DynamoDBClient with cache_ttl_seconds), we
+instead keep it as columns: NumPy arrays for price and rating and integer codes
+for type, color and brand.
+
+Categorical and size filters are answered from an inverted index: one bitmap
+of product positions per type, color, brand and size value. A bitmap is a
+Python int (bit i set = product i matches), so combining filters is a single
+C-level AND over 1 bit per product, and counts are int.bit_count() without
+materializing any product.
+
+Price and rating also have sorted secondary arrays: price ranges are two
+binary searches into the sorted prices, and sorted results ("top 10 by
+rating", "cheapest first") use the presorted order for the whole catalog
+or a partial selection (argpartition) over the matching products.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Code used in categorical columns when a product has no value for the field
+MISSING_CODE = -1
+
+# Sortable columns and their natural direction (True = highest first)
+SORT_FIELDS = {"price": False, "rating": True}
+
+
+def _encode_categories(values: List[Any]) -> Tuple[np.ndarray, Dict[Any, int]]:
+    """Integer-code a categorical column; codes follow sorted value order."""
+    distinct = sorted({v for v in values if v is not None})
+    vocabulary = {value: code for code, value in enumerate(distinct)}
+    codes = np.fromiter(
+        (vocabulary.get(v, MISSING_CODE) for v in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return codes, vocabulary
+
+
+def _to_float_column(values: List[Any]) -> np.ndarray:
+    """Build a float64 column, with NaN where the value is missing."""
+    return np.fromiter(
+        (float(v) if v is not None else np.nan for v in values),
+        dtype=np.float64,
+        count=len(values),
+    )
+
+
+def mask_to_bitmap(mask: np.ndarray) -> int:
+    """Pack a boolean mask into a bitmap (bit i = mask[i])."""
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+
+def bitmap_to_mask(bitmap: int, length: int) -> np.ndarray:
+    """Unpack a bitmap into a boolean mask of the given length."""
+    packed = np.frombuffer(bitmap.to_bytes((length + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(packed, count=length, bitorder="little").astype(bool)
+
+
+class CatalogIndex:
+    """Immutable columnar index over a list of products"""
+
+    def __init__(self, products: List[Dict[str, Any]]):
+        """
+        Build the columns and bitmaps for a product list.
+
+        Args:
+            products: Catalog items. They are kept (not copied) and returned
+                by select(), so they must not be mutated afterwards.
+        """
+        self.products = products
+        # Object array of the same dicts, so a mask selects them without a Python loop
+        self._rows = np.empty(len(products), dtype=object)
+        self._rows[:] = products
+
+        self.price = _to_float_column([p.get("price") for p in products])
+        self.rating = _to_float_column([p.get("rating") for p in products])
+        self.type_codes, self.type_vocabulary = _encode_categories(
+            [p.get("type") for p in products]
+        )
+        self.color_codes, self.color_vocabulary = _encode_categories(
+            [p.get("color") for p in products]
+        )
+        self.brand_codes, self.brand_vocabulary = _encode_categories(
+            [p.get("brand") for p in products]
+        )
+
+        # Inverted index: value -> bitmap of the products that have it
+        self.all_products = (1 << len(products)) - 1
+        self.type_bitmaps = self._category_bitmaps(self.type_codes, self.type_vocabulary)
+        self.color_bitmaps = self._category_bitmaps(self.color_codes, self.color_vocabulary)
+        self.brand_bitmaps = self._category_bitmaps(self.brand_codes, self.brand_vocabulary)
+
+        size_values = sorted({float(s) for p in products for s in p.get("sizes") or []})
+        columns = {size: column for column, size in enumerate(size_values)}
+        available = np.zeros((len(products), len(size_values)), dtype=bool)
+        for row, product in enumerate(products):
+            for size in product.get("sizes") or []:
+                available[row, columns[float(size)]] = True
+        self.size_bitmaps = {
+            size: mask_to_bitmap(available[:, column]) for size, column in columns.items()
+        }
+
+        # Sorted secondary arrays: positions in sort order, per (field, descending).
+        # Price ascending is built eagerly for range lookups; the others on first use.
+        self._sort_orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        self.price_order = self._sort_order("price", False)
+        self.sorted_price = self.price[self.price_order]
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def bitmap(
+        self,
+        type: Optional[str] = None,
+        color: Optional[str] = None,
+        size: Optional[float] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        brand: Optional[str] = None,
+    ) -> int:
+        """
+        Evaluate product filters as a bitmap of matching positions.
+
+        Filters follow DynamoDBClient._filter_products: empty type, color and
+        size values are ignored, and products without a price never match a
+        price bound.
+
+        Returns:
+            Bitmap with bit i set when product i matches
+        """
+        result = self.all_products
+
+        if type:
+            result &= self.type_bitmaps.get(type, 0)
+        if color:
+            result &= self.color_bitmaps.get(color, 0)
+        if brand:
+            result &= self.brand_bitmaps.get(brand, 0)
+        if size:
+            result &= self.size_bitmaps.get(float(size), 0)
+
+        if result and (price_min is not None or price_max is not None):
+            result &= self._price_range_bitmap(price_min, price_max)
+
+        return result
+
+    def mask(self, **filters) -> np.ndarray:
+        """
+        Evaluate product filters as one boolean mask.
+
+        Args:
+            **filters: Same keyword filters as bitmap()
+
+        Returns:
+            Boolean array with one entry per product
+        """
+        return bitmap_to_mask(self.bitmap(**filters), len(self.products))
+
+    def select(
+        self,
+        sort_by: Optional[str] = None,
+        descending: Optional[bool] = None,
+        limit: Optional[int] = None,
+        **filters,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the products matching the filters.
+
+        Args:
+            sort_by: Optional column to sort by ("price" or "rating").
+                Products without a value come last; ties keep catalog order.
+            descending: Sort direction; defaults to highest rating first and
+                cheapest first
+            limit: Optional maximum number of products (the top-k when sorted);
+                0 or less selects nothing
+            **filters: Same keyword filters as bitmap()
+
+        Returns:
+            List of matching products, in catalog order unless sorted
+
+        Raises:
+            ValueError: If sort_by is not a sortable column
+        """
+        if sort_by is None:
+            if limit is not None and limit <= 0:
+                return []
+            return self._rows[self.mask(**filters)][:limit].tolist()
+
+        positions = self.top_k(sort_by, descending, limit, **filters)
+        return self._rows[positions].tolist()
+
+    def top_k(
+        self,
+        sort_by: str,
+        descending: Optional[bool] = None,
+        k: Optional[int] = None,
+        **filters,
+    ) -> np.ndarray:
+        """
+        Positions of the first k matching products in sort order.
+
+        Without filters this is a slice of the presorted order. With filters,
+        only the matching products' keys are considered, and when k is smaller
+        than the match count they are partially selected (argpartition) so
+        just k of them get sorted.
+
+        Args:
+            sort_by: Column to sort by ("price" or "rating")
+            descending: Sort direction (see select())
+            k: Number of positions to return, or None for all matches;
+                0 or less returns none
+            **filters: Same keyword filters as bitmap()
+
+        Returns:
+            Array of product positions
+
+        Raises:
+            ValueError: If sort_by is not a sortable column
+        """
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by '{sort_by}'")
+        if descending is None:
+            descending = SORT_FIELDS[sort_by]
+        if k is not None and k <= 0:
+            return np.empty(0, dtype=np.intp)
+
+        if not any(value is not None for value in filters.values()):
+            return self._sort_order(sort_by, descending)[:k]
+
+        candidates = np.flatnonzero(self.mask(**filters))
+        keys = self._sort_keys(sort_by, descending)[candidates]
+
+        if k is not None and k < len(candidates):
+            # Keep everything strictly before the k-th key, then fill up with
+            # the tied products in catalog order so the result is deterministic
+            kth = np.partition(keys, k - 1)[k - 1]
+            before = np.flatnonzero(keys < kth)
+            tied = np.flatnonzero(keys == kth)[:k - len(before)]
+            chosen = np.concatenate([before, tied])
+            candidates, keys = candidates[chosen], keys[chosen]
+
+        return candidates[np.lexsort((candidates, keys))]
+
+    def count(self, **filters) -> int:
+        """Count the products matching the filters without selecting them."""
+        return self.bitmap(**filters).bit_count()
+
+    def facet_counts(self, **filters) -> Dict[str, Any]:
+        """
+        Count the matching products per type, color, brand and size value.
+
+        Args:
+            **filters: Same keyword filters as bitmap()
+
+        Returns:
+            Dictionary with 'total' and per-facet {value: count} maps. Values
+            with no matching products are left out.
+        """
+        matches = self.bitmap(**filters)
+
+        def counts(bitmaps: Dict[Any, int]) -> Dict[Any, int]:
+            result = {}
+            for value, bitmap in bitmaps.items():
+                count = (bitmap & matches).bit_count()
+                if count:
+                    result[value] = count
+            return result
+
+        return {
+            "total": matches.bit_count(),
+            "types": counts(self.type_bitmaps),
+            "colors": counts(self.color_bitmaps),
+            "brands": counts(self.brand_bitmaps),
+            "sizes": counts(self.size_bitmaps),
+        }
+
+    def _price_range_bitmap(
+        self, price_min: Optional[float], price_max: Optional[float]
+    ) -> int:
+        """Bitmap of products priced within [price_min, price_max] via binary search."""
+        lo = 0 if price_min is None else np.searchsorted(self.sorted_price, price_min, "left")
+        hi = (
+            np.searchsorted(self.sorted_price, np.inf, "right")
+            if price_max is None
+            else np.searchsorted(self.sorted_price, price_max, "right")
+        )
+        in_range = np.zeros(len(self.products), dtype=bool)
+        in_range[self.price_order[lo:hi]] = True
+        return mask_to_bitmap(in_range)
+
+    def _sort_keys(self, sort_by: str, descending: bool) -> np.ndarray:
+        """Ascending sort keys for a column; missing values map to +inf (last)."""
+        values = self.price if sort_by == "price" else self.rating
+        keys = -values if descending else values.copy()
+        keys[np.isnan(keys)] = np.inf
+        return keys
+
+    def _sort_order(self, sort_by: str, descending: bool) -> np.ndarray:
+        """Presorted positions for a column and direction, built on first use."""
+        order = self._sort_orders.get((sort_by, descending))
+        if order is None:
+            # A concurrent first use just sorts twice; the results are identical
+            order = np.argsort(self._sort_keys(sort_by, descending), kind="stable")
+            self._sort_orders[(sort_by, descending)] = order
+        return order
+
+    @staticmethod
+    def _category_bitmaps(codes: np.ndarray, vocabulary: Dict[Any, int]) -> Dict[Any, int]:
+        """Build one bitmap per value of an integer-coded column."""
+        return {value: mask_to_bitmap(codes == code) for value, code in vocabulary.items()}
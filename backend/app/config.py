@@ -18,10 +18,33 @@ class Settings(BaseSettings):
 
     # DynamoDB Configuration
     dynamodb_table_name: str = "ShoeInventory"
+    # Seconds to keep the in-memory catalog snapshot; 0 disables the cache
+    catalog_cache_ttl_seconds: float = 0.0
+    # Parallel scan segments; 1 scans page by page, 0 derives from table size
+    dynamodb_scan_segments: int = 1
 
     # Bedrock Configuration
     bedrock_agent_id: Optional[str] = None
     bedrock_agent_alias_id: Optional[str] = None
+    # Answer simple searches ("red running shoes under $100") without the agent
+    search_fast_path_enabled: bool = True
+    # Agent search results cache; a TTL of 0 disables it. Entries are keyed on the
+    # snapshot's content hash, so they need catalog_cache_ttl_seconds.
+    search_cache_max_entries: int = 256
+    search_cache_ttl_seconds: float = 300.0
+
+    # Cache-Control max-age for catalog reads (browsers and CloudFront); 0 = revalidate
+    api_cache_max_age_seconds: int = 60
+    # Serialized /api/products and /api/featured bodies kept in memory; 0 disables.
+    # Entries are keyed on the snapshot's content hash, so they need catalog_cache_ttl_seconds.
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+    # gzip responses of at least this many bytes for clients that accept it
+    gzip_minimum_size: int = 1024
+    gzip_compress_level: int = 6
+
+    # Thread pools for blocking boto3 calls
+    catalog_executor_workers: int = 8
+    agent_executor_workers: int = 4
 
     # Application Configuration
     app_name: str = "Shoe Shopping Agent"
@@ -1,12 +1,91 @@
 """
 DynamoDB client for interacting with the ShoeInventory table.
 Handles product queries, filtering, and retrieval operations.
+
+boto3 and NumPy (via app.catalog_index) are imported on first use rather than
+at module import: the API Lambda imports this module during init, and most of
+its cold start used to be spent loading them before any request arrived.
 """
-import boto3
-from typing import Optional, Dict, List, Any
+import base64
+import binascii
+import hashlib
+import json
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, Dict, List, Any, Tuple
 from decimal import Decimal
-from boto3.dynamodb.conditions import Attr
-from botocore.exceptions import ClientError
+
+from app.dynamodb_codec import deserialize_item
+
+if TYPE_CHECKING:
+    from app.catalog_index import CatalogIndex
+
+# Parallel scan tuning: one segment per this many bytes of table data when the
+# segment count is derived from the table size (scan_segments=0)
+SCAN_SEGMENT_TARGET_BYTES = 4 * 1024 * 1024
+MAX_SCAN_SEGMENTS = 16
+
+# Secondary indexes used by the filter query planner (see infra/dynamodb.tf).
+# All of them use price as the sort key, so price bounds become key conditions.
+TYPE_INDEX = "type-price-index"
+COLOR_INDEX = "color-price-index"
+TYPE_COLOR_INDEX = "type_color-price-index"
+
+# Attributes of a LastEvaluatedKey per index read (None = the table itself):
+# the table key plus the index's partition and sort keys
+INDEX_KEY_ATTRIBUTES = {
+    None: {"shoe_id"},
+    TYPE_INDEX: {"shoe_id", "type", "price"},
+    COLOR_INDEX: {"shoe_id", "color", "price"},
+    TYPE_COLOR_INDEX: {"shoe_id", "type_color", "price"},
+}
+# Wire types those key attributes may have
+KEY_ATTRIBUTE_TYPES = {"S", "N"}
+
+# After a failed DescribeTable, scan for this long before looking indexes up again
+INDEX_LOOKUP_RETRY_SECONDS = 30.0
+
+# Sparse index holding only featured products: featured_key is written (with
+# FEATURED_KEY_VALUE) on featured items only, and rating is the sort key
+FEATURED_INDEX = "featured-rating-index"
+FEATURED_KEY_VALUE = "featured"
+
+# BatchGetItem accepts at most 100 keys per request; unprocessed keys are
+# retried with exponential backoff starting at BATCH_GET_BACKOFF_SECONDS
+BATCH_GET_MAX_KEYS = 100
+BATCH_GET_MAX_RETRIES = 5
+BATCH_GET_BACKOFF_SECONDS = 0.05
+
+# Key of the catalog metadata item (category aggregate and catalog version).
+# It lives in ShoeInventory but is never returned as a product.
+CATALOG_META_ID = "__catalog_meta__"
+
+_type_serializer = None
+
+
+def _client_error() -> type:
+    """
+    Return botocore's ClientError, importing botocore on first use.
+
+    Call it in the except clause (``except _client_error() as e:``). Python
+    only evaluates that expression once an exception reaches the clause, so
+    importing this module, successful reads and mock mode never load botocore.
+    """
+    from botocore.exceptions import ClientError
+
+    return ClientError
+
+
+def _serialize(value: Any) -> Dict[str, Any]:
+    """Encode a Python value in DynamoDB wire format."""
+    global _type_serializer
+    if _type_serializer is None:
+        from boto3.dynamodb.types import TypeSerializer
+
+        _type_serializer = TypeSerializer()
+    return _type_serializer.serialize(value)
 
 
 class DynamoDBClient:
@@ -17,6 +96,8 @@ class DynamoDBClient:
         table_name: str,
         region: str = "us-east-1",
         mock_mode: bool = False,
+        cache_ttl_seconds: Optional[float] = None,
+        scan_segments: int = 1,
     ):
         """
         Initialize DynamoDB client.
@@ -25,49 +106,78 @@ class DynamoDBClient:
             table_name: Name of the DynamoDB table
             region: AWS region (defaults to us-east-1)
             mock_mode: If True, returns mock data instead of calling AWS
+            cache_ttl_seconds: If set, the whole catalog is loaded once and
+                read methods are answered from memory for this many seconds
+            scan_segments: Number of parallel scan segments. 1 scans page by
+                page, 0 derives the count from the table size
         """
         self.table_name = table_name
         self.region = region
         self.mock_mode = mock_mode
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.scan_segments = scan_segments
+        self._auto_scan_segments: Optional[int] = None
+        self._index_names: Optional[set] = None
+        self._index_lookup_retry_at = 0.0
+
+        # Catalog snapshot cache (opt-in)
+        self._snapshot: Optional[List[Dict[str, Any]]] = None
+        self._snapshot_by_id: Dict[str, Dict[str, Any]] = {}
+        self._snapshot_index: Optional["CatalogIndex"] = None
+        # Featured products, highest rated first
+        self._snapshot_featured: List[Dict[str, Any]] = []
+        self._snapshot_version: Optional[str] = None
+        self._snapshot_loaded_at = 0.0
+        self._snapshot_lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+        # The low-level boto3 client is created on first use (see _client)
+        self._boto_client = None
+        self._boto_client_lock = threading.Lock()
+
+    @property
+    def _client(self):
+        """
+        Low-level boto3 DynamoDB client, created on first use; None in mock mode.
 
-        # Initialize boto3 resource only if not in mock mode
-        if not self.mock_mode:
-            dynamodb = boto3.resource("dynamodb", region_name=self.region)
-            self._table = dynamodb.Table(self.table_name)
-        else:
-            self._table = None
+        Items are decoded from wire format by app.dynamodb_codec, which
+        skips the resource layer's Decimal round trip.
+        """
+        if self.mock_mode:
+            return None
+        if self._boto_client is None:
+            # Clients are created from boto3's default session, which is not thread-safe
+            with self._boto_client_lock:
+                if self._boto_client is None:
+                    import boto3
 
-    def get_all_products(self) -> List[Dict[str, Any]]:
+                    self._boto_client = boto3.client("dynamodb", region_name=self.region)
+        return self._boto_client
+
+    def get_all_products(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Retrieve all products from the table.
 
+        Args:
+            fields: Optional attribute names to return (shoe_id is always included)
+
         Returns:
             List of all products
 
         Raises:
             Exception: If DynamoDB query fails
         """
+        if self.cache_enabled:
+            return self._project(self._get_snapshot(), fields)
+
         if self.mock_mode:
-            return self._get_mock_products()
+            return self._project(self._get_mock_products(), fields)
 
         try:
-            products = []
-            scan_kwargs = {}
-
-            # Handle pagination
-            while True:
-                response = self._table.scan(**scan_kwargs)
-                products.extend(response.get("Items", []))
+            products = self._scan_all(**self._projection(fields))
+            return products
 
-                # Check if there are more items to fetch
-                if "LastEvaluatedKey" not in response:
-                    break
-
-                scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
-
-            return self._convert_decimals(products)
-
-        except ClientError as e:
+        except _client_error() as e:
             raise Exception(f"DynamoDB error: {str(e)}")
         except Exception as e:
             raise Exception(f"Error retrieving products: {str(e)}")
@@ -79,6 +189,9 @@ class DynamoDBClient:
         size: Optional[float] = None,
         price_min: Optional[float] = None,
         price_max: Optional[float] = None,
+        fields: Optional[List[str]] = None,
+        sort_by: Optional[str] = None,
+        descending: Optional[bool] = None,
     ) -> List[Dict[str, Any]]:
         """
         Retrieve products with filters applied.
@@ -89,76 +202,325 @@ class DynamoDBClient:
             size: Filter by available size
             price_min: Minimum price filter
             price_max: Maximum price filter
+            fields: Optional attribute names to return (shoe_id is always included)
+            sort_by: Optional "price" or "rating" to sort the results by
+            descending: Sort direction; defaults to cheapest first and highest
+                rating first
 
         Returns:
             List of filtered products
 
         Raises:
+            ValueError: If sort_by is not a sortable field
             Exception: If DynamoDB query fails
         """
+        if sort_by is not None:
+            from app.catalog_index import SORT_FIELDS
+
+            if sort_by not in SORT_FIELDS:
+                raise ValueError(f"Cannot sort by '{sort_by}'")
+
+        if self.cache_enabled:
+            products = self._get_snapshot_index().select(
+                sort_by=sort_by,
+                descending=descending,
+                type=type,
+                color=color,
+                size=size,
+                price_min=price_min,
+                price_max=price_max,
+            )
+            return self._project(products, fields)
+
         if self.mock_mode:
-            return self._get_mock_products(
+            products = self._get_mock_products(
                 type=type, color=color, size=size, price_min=price_min, price_max=price_max
             )
+            return self._project(self._sort_products(products, sort_by, descending), fields)
 
         try:
-            # Build filter expression
-            filter_expression = None
+            plan = self.plan_products_query(
+                type=type, color=color, size=size, price_min=price_min, price_max=price_max
+            )
+            # The sort key has to be read even when it was not selected
+            read_fields = fields and sort_by and list(dict.fromkeys([*fields, sort_by]))
+            plan["request"].update(self._projection(read_fields or fields))
+            products = self._execute_plan(plan)
+            if sort_by:
+                products = self._project(
+                    self._sort_products(products, sort_by, descending), fields
+                )
+            return products
 
-            if type:
-                filter_expression = Attr("type").eq(type)
+        except _client_error() as e:
+            raise Exception(f"DynamoDB error: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error filtering products: {str(e)}")
 
-            if color:
-                color_filter = Attr("color").eq(color)
-                filter_expression = (
-                    color_filter if filter_expression is None else filter_expression & color_filter
-                )
+    def plan_products_query(
+        self,
+        type: Optional[str] = None,
+        color: Optional[str] = None,
+        size: Optional[float] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Choose how to read the table for a set of product filters.
 
-            if size:
-                size_filter = Attr("sizes").contains(size)
-                filter_expression = (
-                    size_filter if filter_expression is None else filter_expression & size_filter
-                )
+        Prefers a Query against the most selective secondary index that exists
+        (type#color, then type, then color), using price as the key range.
+        Falls back to a filtered Scan when no index applies.
 
-            if price_min is not None:
-                price_min_filter = Attr("price").gte(Decimal(str(price_min)))
-                filter_expression = (
-                    price_min_filter
-                    if filter_expression is None
-                    else filter_expression & price_min_filter
-                )
+        Args:
+            type: Filter by shoe type
+            color: Filter by color
+            size: Filter by available size
+            price_min: Minimum price filter
+            price_max: Maximum price filter
+
+        Returns:
+            Dictionary with 'operation' ('Query' or 'Scan'), 'index',
+            'key_conditions' and 'filters' (readable descriptions) and
+            'request' (keyword arguments for the table call)
+        """
+        from boto3.dynamodb.conditions import Attr, Key
+
+        indexes = self._available_indexes()
+        index_name = None
+        key_condition = None
+        key_terms = []
+        filter_conditions = []
+        filter_terms = []
+
+        if type and color and TYPE_COLOR_INDEX in indexes:
+            index_name = TYPE_COLOR_INDEX
+            key_condition = Key("type_color").eq(f"{type}#{color}")
+            key_terms.append(f"type_color = {type}#{color}")
+            type = color = None
+        elif type and TYPE_INDEX in indexes:
+            index_name = TYPE_INDEX
+            key_condition = Key("type").eq(type)
+            key_terms.append(f"type = {type}")
+            type = None
+        elif color and COLOR_INDEX in indexes:
+            index_name = COLOR_INDEX
+            key_condition = Key("color").eq(color)
+            key_terms.append(f"color = {color}")
+            color = None
+
+        if type:
+            filter_conditions.append(Attr("type").eq(type))
+            filter_terms.append(f"type = {type}")
+
+        if color:
+            filter_conditions.append(Attr("color").eq(color))
+            filter_terms.append(f"color = {color}")
+
+        if size:
+            filter_conditions.append(Attr("sizes").contains(Decimal(str(size))))
+            filter_terms.append(f"sizes contains {size}")
+
+        low = Decimal(str(price_min)) if price_min is not None else None
+        high = Decimal(str(price_max)) if price_max is not None else None
+
+        if key_condition is not None and (low is not None or high is not None):
+            # Price is the sort key of every index, so bound the key range
+            if low is not None and high is not None:
+                key_condition = key_condition & Key("price").between(low, high)
+                key_terms.append(f"price between {price_min} and {price_max}")
+            elif low is not None:
+                key_condition = key_condition & Key("price").gte(low)
+                key_terms.append(f"price >= {price_min}")
+            else:
+                key_condition = key_condition & Key("price").lte(high)
+                key_terms.append(f"price <= {price_max}")
+        else:
+            if low is not None:
+                filter_conditions.append(Attr("price").gte(low))
+                filter_terms.append(f"price >= {price_min}")
+            if high is not None:
+                filter_conditions.append(Attr("price").lte(high))
+                filter_terms.append(f"price <= {price_max}")
+
+        request = {}
+        if key_condition is not None:
+            request["IndexName"] = index_name
+            request["KeyConditionExpression"] = key_condition
+
+        if filter_conditions:
+            filter_expression = filter_conditions[0]
+            for condition in filter_conditions[1:]:
+                filter_expression = filter_expression & condition
+            request["FilterExpression"] = filter_expression
+
+        return {
+            "operation": "Query" if key_condition is not None else "Scan",
+            "index": index_name,
+            "key_conditions": key_terms,
+            "filters": filter_terms,
+            "request": request,
+        }
+
+    def explain_products_by_filters(
+        self,
+        type: Optional[str] = None,
+        color: Optional[str] = None,
+        size: Optional[float] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run get_products_by_filters and report the plan that served it.
+
+        Returns:
+            Dictionary with 'operation', 'index', 'key_conditions', 'filters',
+            'items_read' (items DynamoDB evaluated) and 'items_returned'
+
+        Raises:
+            Exception: If DynamoDB query fails
+        """
+        filters = dict(
+            type=type, color=color, size=size, price_min=price_min, price_max=price_max
+        )
+
+        if self.cache_enabled or self.mock_mode:
+            products = self.get_products_by_filters(**filters)
+            return {
+                "operation": "Snapshot" if self.cache_enabled else "Mock",
+                "index": None,
+                "key_conditions": [],
+                "filters": [f"{k} = {v}" for k, v in filters.items() if v is not None],
+                "items_read": 0,
+                "items_returned": len(products),
+            }
+
+        try:
+            plan = self.plan_products_query(**filters)
+            read_stats = {"items_read": 0}
+            products = self._execute_plan(plan, read_stats=read_stats)
+
+            explanation = {k: v for k, v in plan.items() if k != "request"}
+            explanation["items_read"] = read_stats["items_read"]
+            explanation["items_returned"] = len(products)
+            return explanation
+
+        except _client_error() as e:
+            raise Exception(f"DynamoDB error: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error explaining product filters: {str(e)}")
+
+    def get_products_page(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        type: Optional[str] = None,
+        color: Optional[str] = None,
+        size: Optional[float] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+        fields: Optional[List[str]] = None,
+        sort_by: Optional[str] = None,
+        descending: Optional[bool] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Retrieve one page of (optionally filtered) products.
 
-            if price_max is not None:
-                price_max_filter = Attr("price").lte(Decimal(str(price_max)))
-                filter_expression = (
-                    price_max_filter
-                    if filter_expression is None
-                    else filter_expression & price_max_filter
+        Only the items of the requested page are read: table reads resume from
+        the ExclusiveStartKey carried in the cursor, and snapshot reads resume
+        from an offset into the cached catalog. Sorted snapshot pages select
+        just the top offset + limit products. Sorted pages without the cache
+        have to read every matching item, since the table has no global order.
+
+        Args:
+            limit: Maximum number of products to return
+            cursor: Opaque cursor from a previous page, or None for the first page
+            type, color, size, price_min, price_max: Same filters as
+                get_products_by_filters
+            fields: Optional attribute names to return (shoe_id is always included)
+            sort_by, descending: Same sorting as get_products_by_filters
+
+        Returns:
+            Tuple of (products, next_cursor). next_cursor is None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed or no longer valid
+            Exception: If DynamoDB query fails
+        """
+        filters = dict(
+            type=type, color=color, size=size, price_min=price_min, price_max=price_max
+        )
+        position = self._decode_cursor(cursor) if cursor else {}
+
+        if self.cache_enabled or self.mock_mode or sort_by:
+            if position and "o" not in position:
+                raise ValueError("Cursor is no longer valid for this catalog")
+            offset = position.get("o", 0)
+
+            if self.cache_enabled:
+                index = self._get_snapshot_index()
+                products = index.select(
+                    sort_by=sort_by, descending=descending, limit=offset + limit, **filters
+                )
+                total = index.count(**filters)
+                version = self.catalog_version
+            else:
+                products = self.get_products_by_filters(
+                    **filters, fields=fields, sort_by=sort_by, descending=descending
                 )
+                total = len(products)
+                version = None
+
+            if position and position.get("v") != version:
+                raise ValueError("Cursor is no longer valid for this catalog")
+
+            page = products[offset:offset + limit]
+            next_offset = offset + len(page)
+            next_cursor = (
+                self._encode_cursor({"o": next_offset, "v": version})
+                if next_offset < total
+                else None
+            )
+            return self._project(page, fields), next_cursor
 
-            # Execute scan with filter
-            products = []
-            scan_kwargs = {}
-            if filter_expression:
-                scan_kwargs["FilterExpression"] = filter_expression
+        plan = self.plan_products_query(**filters)
+        if position and ("k" not in position or position.get("i") != plan["index"]):
+            raise ValueError("Cursor does not match these filters")
+        if position:
+            self._validate_start_key(position["k"], plan["index"])
 
-            # Handle pagination
-            while True:
-                response = self._table.scan(**scan_kwargs)
-                products.extend(response.get("Items", []))
+        try:
+            read = self._client.query if plan["operation"] == "Query" else self._client.scan
+            plan["request"].update(self._projection(fields))
+            start_key = position.get("k")
+            items = []
 
-                # Check if there are more items to fetch
-                if "LastEvaluatedKey" not in response:
-                    break
+            while len(items) < limit:
+                request = dict(plan["request"], Limit=limit - len(items))
+                if start_key:
+                    request["ExclusiveStartKey"] = start_key
 
-                scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+                response = read(**self._build_request(**request))
+                items.extend(self._decode_items(response))
 
-            return self._convert_decimals(products)
+                start_key = response.get("LastEvaluatedKey")
+                if not start_key:
+                    break
+
+            next_cursor = (
+                self._encode_cursor({"k": start_key, "i": plan["index"]})
+                if start_key
+                else None
+            )
+            return items, next_cursor
 
-        except ClientError as e:
+        except _client_error() as e:
+            if position and e.response.get("Error", {}).get("Code") == "ValidationException":
+                # A well-formed key DynamoDB still rejects (e.g. a non-numeric price)
+                raise ValueError(f"Invalid cursor: {str(e)}")
             raise Exception(f"DynamoDB error: {str(e)}")
         except Exception as e:
-            raise Exception(f"Error filtering products: {str(e)}")
+            raise Exception(f"Error retrieving products page: {str(e)}")
 
     def get_product_by_id(self, shoe_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -173,6 +535,10 @@ class DynamoDBClient:
         Raises:
             Exception: If DynamoDB query fails
         """
+        if self.cache_enabled:
+            self._get_snapshot()
+            return self._snapshot_by_id.get(shoe_id)
+
         if self.mock_mode:
             mock_products = self._get_mock_products()
             for product in mock_products:
@@ -180,53 +546,120 @@ class DynamoDBClient:
                     return product
             return None
 
+        if shoe_id == CATALOG_META_ID:
+            return None
+
         try:
-            response = self._table.get_item(Key={"shoe_id": shoe_id})
+            response = self._client.get_item(
+                TableName=self.table_name, Key={"shoe_id": {"S": shoe_id}}
+            )
 
             if "Item" in response:
-                return self._convert_decimals([response["Item"]])[0]
+                return deserialize_item(response["Item"])
 
             return None
 
-        except ClientError as e:
+        except _client_error() as e:
             raise Exception(f"DynamoDB error: {str(e)}")
         except Exception as e:
             raise Exception(f"Error retrieving product: {str(e)}")
 
-    def get_featured_products(self) -> List[Dict[str, Any]]:
+    def get_products_by_ids(self, shoe_ids: List[str]) -> List[Dict[str, Any]]:
         """
-        Retrieve only featured products.
+        Retrieve several products in as few round trips as possible.
+
+        Uses BatchGetItem in chunks of 100 keys and retries UnprocessedKeys
+        with exponential backoff.
+
+        Args:
+            shoe_ids: Product IDs to look up (duplicates are ignored)
 
         Returns:
-            List of featured products
+            Found products in the order their IDs first appear in shoe_ids;
+            unknown IDs are skipped
 
         Raises:
-            Exception: If DynamoDB query fails
+            Exception: If DynamoDB query fails or keys stay unprocessed
         """
+        unique_ids = [
+            shoe_id for shoe_id in dict.fromkeys(shoe_ids) if shoe_id != CATALOG_META_ID
+        ]
+
+        if self.cache_enabled:
+            self._get_snapshot()
+            by_id = self._snapshot_by_id
+            return [by_id[shoe_id] for shoe_id in unique_ids if shoe_id in by_id]
+
         if self.mock_mode:
-            mock_products = self._get_mock_products()
-            return [p for p in mock_products if p.get("featured", False)]
+            by_id = {p["shoe_id"]: p for p in self._get_mock_products()}
+            return [by_id[shoe_id] for shoe_id in unique_ids if shoe_id in by_id]
 
         try:
-            filter_expression = Attr("featured").eq(True)
+            found = {}
+            for start in range(0, len(unique_ids), BATCH_GET_MAX_KEYS):
+                chunk = unique_ids[start:start + BATCH_GET_MAX_KEYS]
+                for item in self._batch_get_chunk(chunk):
+                    found[item["shoe_id"]] = item
 
-            products = []
-            scan_kwargs = {"FilterExpression": filter_expression}
+            products = [found[shoe_id] for shoe_id in unique_ids if shoe_id in found]
+            return products
 
-            # Handle pagination
-            while True:
-                response = self._table.scan(**scan_kwargs)
-                products.extend(response.get("Items", []))
+        except _client_error() as e:
+            raise Exception(f"DynamoDB error: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error retrieving products by ID: {str(e)}")
 
-                # Check if there are more items to fetch
-                if "LastEvaluatedKey" not in response:
-                    break
+    def get_featured_products(
+        self,
+        fields: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieve only featured products, highest rated first.
+
+        Reads the sparse featured-rating-index when it exists, so the cost
+        depends on the number of featured products rather than the catalog
+        size. Falls back to a filtered scan otherwise. Every read path returns
+        the same order, so limit keeps the top rated products.
 
-                scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        Args:
+            fields: Optional attribute names to return (shoe_id is always included)
+            limit: Optional maximum number of products to return
 
-            return self._convert_decimals(products)
+        Returns:
+            List of featured products
 
-        except ClientError as e:
+        Raises:
+            Exception: If DynamoDB query fails
+        """
+        if self.cache_enabled:
+            self._get_snapshot()
+            return self._project(self._snapshot_featured[:limit], fields)
+
+        if self.mock_mode:
+            featured = self._featured_by_rating(self._get_mock_products())
+            return self._project(featured[:limit], fields)
+
+        from boto3.dynamodb.conditions import Attr, Key
+
+        try:
+            if FEATURED_INDEX in self._available_indexes():
+                products = self._query_all(
+                    max_items=limit,
+                    IndexName=FEATURED_INDEX,
+                    KeyConditionExpression=Key("featured_key").eq(FEATURED_KEY_VALUE),
+                    ScanIndexForward=False,
+                    **self._projection(fields),
+                )
+                return products
+
+            filter_expression = Attr("featured").eq(True)
+            products = self._scan_all(
+                FilterExpression=filter_expression, **self._projection(fields)
+            )
+            return self._featured_by_rating(products)[:limit]
+
+        except _client_error() as e:
             raise Exception(f"DynamoDB error: {str(e)}")
         except Exception as e:
             raise Exception(f"Error retrieving featured products: {str(e)}")
@@ -241,6 +674,11 @@ class DynamoDBClient:
         Raises:
             Exception: If DynamoDB query fails
         """
+        if self.cache_enabled:
+            # The index vocabularies are the sorted distinct values already
+            index = self._get_snapshot_index()
+            return {"types": list(index.type_vocabulary), "colors": list(index.color_vocabulary)}
+
         if self.mock_mode:
             return {
                 "types": ["running", "casual", "formal", "athletic", "boots"],
@@ -248,57 +686,692 @@ class DynamoDBClient:
             }
 
         try:
-            products = []
-            scan_kwargs = {}
+            # One GetItem on the maintained aggregate; scan only if it is missing
+            meta = self._get_catalog_meta()
+            if meta is not None:
+                return {"types": meta.get("types", []), "colors": meta.get("colors", [])}
 
-            # Handle pagination
-            while True:
-                response = self._table.scan(**scan_kwargs)
-                products.extend(response.get("Items", []))
+            products = self._scan_all()
+            return self._extract_categories(products)
 
-                # Check if there are more items to fetch
-                if "LastEvaluatedKey" not in response:
-                    break
+        except _client_error() as e:
+            raise Exception(f"DynamoDB error: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error retrieving categories: {str(e)}")
+
+    def get_facets(
+        self,
+        type: Optional[str] = None,
+        color: Optional[str] = None,
+        size: Optional[float] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Count the products matching the filters per type, color, brand and size.
+
+        With the snapshot cache the counts are bitmap cardinalities from the
+        catalog index, so no products are materialized. Otherwise the matching
+        products are read and indexed for this call.
+
+        Args:
+            type, color, size, price_min, price_max: Same filters as
+                get_products_by_filters
+
+        Returns:
+            Dictionary with 'total' and 'types', 'colors', 'brands' and
+            'sizes' maps of value -> count
+
+        Raises:
+            Exception: If DynamoDB query fails
+        """
+        filters = dict(
+            type=type, color=color, size=size, price_min=price_min, price_max=price_max
+        )
+        if self.cache_enabled:
+            return self._get_snapshot_index().facet_counts(**filters)
+
+        products = self.get_products_by_filters(
+            **filters, fields=["type", "color", "brand", "sizes"]
+        )
+        from app.catalog_index import CatalogIndex
+
+        return CatalogIndex(products).facet_counts()
+
+    def rebuild_categories(self) -> Dict[str, Any]:
+        """
+        Recompute the catalog metadata item from a full scan and store it.
+
+        Run this after loading or changing products (see
+        scripts/rebuild_catalog_meta.py). In mock mode nothing is stored.
+
+        Returns:
+            The metadata item: 'types', 'colors', 'item_count' and 'version'
+
+        Raises:
+            Exception: If DynamoDB query fails
+        """
+        if self.mock_mode:
+            return self._build_catalog_meta(self._get_mock_products())
 
-                scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        try:
+            products = self._scan_all()
+            meta = self._build_catalog_meta(products)
+            self._client.put_item(
+                TableName=self.table_name,
+                Item={name: _serialize(value) for name, value in meta.items()},
+            )
+            return meta
 
-            # Extract unique types and colors
-            types = set()
-            colors = set()
+        except _client_error() as e:
+            raise Exception(f"DynamoDB error: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error rebuilding categories: {str(e)}")
 
-            for product in products:
-                if "type" in product:
-                    types.add(product["type"])
-                if "color" in product:
-                    colors.add(product["color"])
+    def check_categories_consistency(self) -> Dict[str, Any]:
+        """
+        Compare the stored metadata item with a full scan of the table.
 
-            return {"types": sorted(list(types)), "colors": sorted(list(colors))}
+        Returns:
+            Dictionary with 'consistent' plus the differences: types/colors
+            present in the table but not stored ('missing_*'), stored but no
+            longer present ('stale_*'), and both item counts
 
-        except ClientError as e:
+        Raises:
+            Exception: If DynamoDB query fails
+        """
+        try:
+            if self.mock_mode:
+                products = self._get_mock_products()
+                meta = self._build_catalog_meta(products)
+            else:
+                products = self._scan_all()
+                meta = self._get_catalog_meta() or {}
+
+            actual = self._build_catalog_meta(products)
+            report = {
+                "missing_types": sorted(set(actual["types"]) - set(meta.get("types", []))),
+                "stale_types": sorted(set(meta.get("types", [])) - set(actual["types"])),
+                "missing_colors": sorted(set(actual["colors"]) - set(meta.get("colors", []))),
+                "stale_colors": sorted(set(meta.get("colors", [])) - set(actual["colors"])),
+                "stored_item_count": meta.get("item_count"),
+                "actual_item_count": actual["item_count"],
+            }
+            report["consistent"] = (
+                bool(meta)
+                and not any(report[k] for k in report if k.startswith(("missing", "stale")))
+                and report["stored_item_count"] == report["actual_item_count"]
+            )
+            return report
+
+        except _client_error() as e:
             raise Exception(f"DynamoDB error: {str(e)}")
         except Exception as e:
-            raise Exception(f"Error retrieving categories: {str(e)}")
+            raise Exception(f"Error checking categories: {str(e)}")
+
+    @property
+    def cache_enabled(self) -> bool:
+        """True when read methods are served from the catalog snapshot."""
+        return bool(self.cache_ttl_seconds)
+
+    @property
+    def catalog_version(self) -> Optional[str]:
+        """Content hash of the current catalog snapshot, if one is loaded."""
+        return self._snapshot_version
+
+    def get_catalog_version(self) -> Optional[str]:
+        """
+        Return the version (content hash) of the current catalog.
+
+        Uses the snapshot when the cache is enabled, and otherwise the catalog
+        metadata item, so no scan is needed.
+
+        Returns:
+            The catalog version, or None if the metadata item was never built
+
+        Raises:
+            Exception: If DynamoDB query fails
+        """
+        if self.cache_enabled:
+            self._get_snapshot()
+            return self._snapshot_version
+
+        if self.mock_mode:
+            return self._compute_catalog_version(self._get_mock_products())
+
+        try:
+            meta = self._get_catalog_meta()
+            return meta.get("version") if meta else None
+
+        except _client_error() as e:
+            raise Exception(f"DynamoDB error: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error reading catalog version: {str(e)}")
+
+    def get_content_version(self) -> Optional[str]:
+        """
+        Return the content hash of the catalog reads are answered from, if known.
+
+        Unlike get_catalog_version, the metadata item is not used: its version
+        is only as current as its last rebuild, so products written since then
+        would not change it. Only the snapshot (and mock data) are hashed as
+        they are read.
+
+        Returns:
+            The snapshot's content hash, or None when reads go to the table
+        """
+        if self.cache_enabled:
+            self._get_snapshot()
+            return self._snapshot_version
+
+        if self.mock_mode:
+            return self._compute_catalog_version(self._get_mock_products())
+
+        return None
+
+    def invalidate_cache(self, version: Optional[str] = None) -> bool:
+        """
+        Drop the catalog snapshot so the next read reloads the table.
+
+        Args:
+            version: Optional catalog version known to the caller. If it matches
+                the loaded snapshot, the snapshot is kept.
+
+        Returns:
+            True if the snapshot was dropped
+        """
+        with self._snapshot_lock:
+            if version is not None and version == self._snapshot_version:
+                return False
+
+            self._snapshot = None
+            self._snapshot_by_id = {}
+            self._snapshot_index = None
+            self._snapshot_featured = []
+            self._snapshot_version = None
+            self._snapshot_loaded_at = 0.0
+            self.cache_stats["invalidations"] += 1
+            return True
+
+    def _snapshot_is_fresh(self) -> bool:
+        """Check whether a snapshot is loaded and still within its TTL."""
+        return (
+            self._snapshot is not None
+            and time.monotonic() - self._snapshot_loaded_at < self.cache_ttl_seconds
+        )
+
+    def _get_snapshot(self) -> List[Dict[str, Any]]:
+        """
+        Return the cached catalog, loading it from the table when stale.
+
+        The returned items are shared between callers and must not be mutated.
+        """
+        if self._snapshot_is_fresh():
+            self.cache_stats["hits"] += 1
+            return self._snapshot
+
+        with self._snapshot_lock:
+            # Another thread may have reloaded while we waited for the lock
+            if self._snapshot_is_fresh():
+                self.cache_stats["hits"] += 1
+                return self._snapshot
+
+            self.cache_stats["misses"] += 1
+            products = self._load_catalog()
+            self._snapshot_by_id = {p["shoe_id"]: p for p in products}
+            from app.catalog_index import CatalogIndex
+
+            self._snapshot_index = CatalogIndex(products)
+            self._snapshot_featured = self._featured_by_rating(products)
+            self._snapshot_version = self._compute_catalog_version(products)
+            self._snapshot_loaded_at = time.monotonic()
+            self._snapshot = products
+            return products
+
+    def _get_snapshot_index(self) -> "CatalogIndex":
+        """Return the columnar index of the cached catalog (see _get_snapshot)."""
+        self._get_snapshot()
+        return self._snapshot_index
+
+    def _get_catalog_meta(self) -> Optional[Dict[str, Any]]:
+        """Read the catalog metadata item, or None if it was never built."""
+        response = self._client.get_item(
+            TableName=self.table_name, Key={"shoe_id": {"S": CATALOG_META_ID}}
+        )
+        if "Item" not in response:
+            return None
+
+        return deserialize_item(response["Item"])
+
+    def _build_catalog_meta(self, products: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Compute the metadata item for a product list."""
+        categories = self._extract_categories(products)
+        return {
+            "shoe_id": CATALOG_META_ID,
+            "types": categories["types"],
+            "colors": categories["colors"],
+            "item_count": len(products),
+            "version": self._compute_catalog_version(products),
+        }
+
+    def _load_catalog(self) -> List[Dict[str, Any]]:
+        """Read the whole table for the snapshot cache."""
+        if self.mock_mode:
+            return self._get_mock_products()
+
+        try:
+            products = self._scan_all()
+            return products
+
+        except _client_error() as e:
+            raise Exception(f"DynamoDB error: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error loading catalog: {str(e)}")
+
+    def _execute_plan(
+        self, plan: Dict[str, Any], read_stats: Optional[Dict[str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Run a plan from plan_products_query and return the raw items."""
+        if plan["operation"] == "Query":
+            return self._query_all(read_stats=read_stats, **plan["request"])
+        return self._scan_all(read_stats=read_stats, **plan["request"])
+
+    def _query_all(
+        self,
+        read_stats: Optional[Dict[str, int]] = None,
+        max_items: Optional[int] = None,
+        **query_kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query the table or an index, following LastEvaluatedKey to the end.
+
+        Args:
+            read_stats: Optional dict whose 'items_read' is incremented by the
+                number of items DynamoDB evaluated
+            max_items: Optional cap; pages are requested with a matching Limit
+                and reading stops once this many items are collected
+            **query_kwargs: Arguments for Table.query
+
+        Returns:
+            Raw items from every page
+        """
+        items = []
+        scanned = 0
+
+        while max_items is None or len(items) < max_items:
+            if max_items is not None:
+                query_kwargs["Limit"] = max_items - len(items)
+
+            response = self._client.query(**self._build_request(**query_kwargs))
+            items.extend(self._decode_items(response))
+            scanned += response.get("ScannedCount", len(response.get("Items", [])))
+
+            if "LastEvaluatedKey" not in response:
+                break
+
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+        if read_stats is not None:
+            read_stats["items_read"] = read_stats.get("items_read", 0) + scanned
+
+        return items
+
+    def _scan_all(
+        self, read_stats: Optional[Dict[str, int]] = None, **scan_kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Scan the table, following LastEvaluatedKey until every page is read.
+
+        With more than one scan segment, the segments are scanned concurrently
+        and their items concatenated in segment order.
+
+        Args:
+            read_stats: Optional dict whose 'items_read' is incremented by the
+                number of items DynamoDB evaluated
+            **scan_kwargs: Extra arguments for Table.scan (e.g. FilterExpression)
+
+        Returns:
+            Raw items from every page
+        """
+        total_segments = self._resolve_scan_segments()
+        if total_segments <= 1:
+            segments = [self._scan_segment(scan_kwargs)]
+        else:
+            segment_kwargs = [
+                {**scan_kwargs, "Segment": segment, "TotalSegments": total_segments}
+                for segment in range(total_segments)
+            ]
+            with ThreadPoolExecutor(
+                max_workers=total_segments, thread_name_prefix="scan"
+            ) as executor:
+                segments = list(executor.map(self._scan_segment, segment_kwargs))
+
+        if read_stats is not None:
+            read_stats["items_read"] = read_stats.get("items_read", 0) + sum(
+                scanned for _, scanned in segments
+            )
+
+        return [item for segment_items, _ in segments for item in segment_items]
 
-    def _convert_decimals(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _scan_segment(self, scan_kwargs: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], int]:
         """
-        Convert Decimal types to float for JSON serialization.
+        Read every page of one scan (or one segment of a parallel scan).
+
+        Returns:
+            Tuple of (items, number of items DynamoDB evaluated)
+        """
+        scan_kwargs = dict(scan_kwargs)
+        items = []
+        scanned = 0
+
+        # Handle pagination
+        while True:
+            response = self._client.scan(**self._build_request(**scan_kwargs))
+            items.extend(self._decode_items(response))
+            scanned += response.get("ScannedCount", len(response.get("Items", [])))
+
+            # Check if there are more items to fetch
+            if "LastEvaluatedKey" not in response:
+                break
+
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+        return items, scanned
+
+    def _batch_get_chunk(self, shoe_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Run BatchGetItem for up to 100 keys, retrying unprocessed keys.
+
+        Raises:
+            Exception: If keys are still unprocessed after the last retry
+        """
+        items = []
+        request_items = {
+            self.table_name: {"Keys": [{"shoe_id": {"S": shoe_id}} for shoe_id in shoe_ids]}
+        }
+
+        for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+            if attempt:
+                time.sleep(BATCH_GET_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+
+            response = self._client.batch_get_item(RequestItems=request_items)
+            items.extend(
+                deserialize_item(item)
+                for item in response.get("Responses", {}).get(self.table_name, [])
+            )
+
+            request_items = response.get("UnprocessedKeys") or {}
+            if not request_items.get(self.table_name, {}).get("Keys"):
+                return items
+
+        raise Exception(
+            f"{len(request_items[self.table_name]['Keys'])} keys still unprocessed "
+            f"after {BATCH_GET_MAX_RETRIES} retries"
+        )
+
+    def _available_indexes(self) -> set:
+        """
+        Names of the table's active global secondary indexes.
+
+        Looked up once via DescribeTable. If the lookup fails (e.g. a
+        throttle), no index is used and the planner falls back to scans until
+        the lookup is retried INDEX_LOOKUP_RETRY_SECONDS later.
+        """
+        if self._index_names is not None:
+            return self._index_names
+        if time.monotonic() < self._index_lookup_retry_at:
+            return set()
+
+        try:
+            self._index_names = {
+                index["IndexName"]
+                for index in (self._describe_table().get("GlobalSecondaryIndexes") or [])
+                if index.get("IndexStatus", "ACTIVE") == "ACTIVE"
+            }
+        except Exception:
+            self._index_lookup_retry_at = time.monotonic() + INDEX_LOOKUP_RETRY_SECONDS
+            return set()
+
+        return self._index_names
+
+    def _describe_table(self) -> Dict[str, Any]:
+        """Return the DescribeTable description of the table."""
+        return self._client.describe_table(TableName=self.table_name)["Table"]
+
+    def _build_request(self, **kwargs) -> Dict[str, Any]:
+        """
+        Turn resource-style read arguments into a low-level client request.
+
+        Condition objects (FilterExpression, KeyConditionExpression) are
+        rendered to expression strings with their name and value placeholders
+        merged into ExpressionAttributeNames/Values. ExclusiveStartKey is
+        expected in wire format, as returned in LastEvaluatedKey.
+        """
+        request = {"TableName": self.table_name}
+        names = dict(kwargs.pop("ExpressionAttributeNames", None) or {})
+        values = {}
+        from boto3.dynamodb.conditions import ConditionExpressionBuilder
+
+        builder = ConditionExpressionBuilder()
+
+        for param, is_key_condition in (
+            ("KeyConditionExpression", True),
+            ("FilterExpression", False),
+        ):
+            condition = kwargs.pop(param, None)
+            if condition is None:
+                continue
+
+            built = builder.build_expression(condition, is_key_condition=is_key_condition)
+            request[param] = built.condition_expression
+            names.update(built.attribute_name_placeholders)
+            values.update(
+                (placeholder, _serialize(value))
+                for placeholder, value in built.attribute_value_placeholders.items()
+            )
+
+        if names:
+            request["ExpressionAttributeNames"] = names
+        if values:
+            request["ExpressionAttributeValues"] = values
+
+        request.update(kwargs)
+        return request
+
+    @staticmethod
+    def _decode_items(response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Decode the Items of a scan/query page, dropping the metadata item."""
+        items = []
+        for item in response.get("Items", []):
+            if item.get("shoe_id", {}).get("S") != CATALOG_META_ID:
+                items.append(deserialize_item(item))
+        return items
+
+    def _resolve_scan_segments(self) -> int:
+        """
+        Work out how many parallel scan segments to use.
+
+        An explicit scan_segments value wins. For scan_segments=0 the count is
+        derived once from the table size reported by DescribeTable.
+        """
+        if self.scan_segments > 0:
+            return min(self.scan_segments, MAX_SCAN_SEGMENTS)
+
+        if self._auto_scan_segments is None:
+            try:
+                table_size = int(self._describe_table().get("TableSizeBytes") or 0)
+            except (_client_error(), TypeError, ValueError):
+                table_size = 0
+            self._auto_scan_segments = max(
+                1, min(MAX_SCAN_SEGMENTS, math.ceil(table_size / SCAN_SEGMENT_TARGET_BYTES))
+            )
+
+        return self._auto_scan_segments
+
+    @staticmethod
+    def _projection(fields: Optional[List[str]]) -> Dict[str, Any]:
+        """
+        Build ProjectionExpression arguments for a read.
+
+        Attribute names go through placeholders because several of ours
+        (name, type, size) are DynamoDB reserved words.
 
         Args:
-            items: List of items from DynamoDB
+            fields: Attribute names to read, or None for whole items
 
         Returns:
-            List with Decimals converted to floats
-        """
-        converted_items = []
-        for item in items:
-            converted_item = {}
-            for key, value in item.items():
-                if isinstance(value, Decimal):
-                    converted_item[key] = float(value)
-                else:
-                    converted_item[key] = value
-            converted_items.append(converted_item)
-        return converted_items
+            Keyword arguments to merge into a scan/query request
+        """
+        if not fields:
+            return {}
+
+        names = list(dict.fromkeys(["shoe_id", *fields]))
+        placeholders = {f"#f{i}": name for i, name in enumerate(names)}
+        return {
+            "ProjectionExpression": ", ".join(placeholders),
+            "ExpressionAttributeNames": placeholders,
+        }
+
+    @staticmethod
+    def _project(
+        products: List[Dict[str, Any]], fields: Optional[List[str]]
+    ) -> List[Dict[str, Any]]:
+        """Apply a field selection to in-memory products."""
+        if not fields:
+            return list(products)
+
+        names = list(dict.fromkeys(["shoe_id", *fields]))
+        return [{name: p[name] for name in names if name in p} for p in products]
+
+    @staticmethod
+    def _encode_cursor(position: Dict[str, Any]) -> str:
+        """Pack a page position into an opaque, URL-safe cursor string."""
+        payload = json.dumps(position, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Dict[str, Any]:
+        """
+        Unpack a cursor produced by _encode_cursor.
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            if not isinstance(position, dict):
+                raise ValueError("cursor is not an object")
+            if "k" in position and not (
+                isinstance(position["k"], dict)
+                and all(isinstance(value, dict) for value in position["k"].values())
+            ):
+                raise ValueError("cursor key is invalid")
+            if "o" in position and (not isinstance(position["o"], int) or position["o"] < 0):
+                raise ValueError("cursor offset is invalid")
+            return position
+        except (ValueError, TypeError, AttributeError, binascii.Error, UnicodeError) as e:
+            raise ValueError(f"Invalid cursor: {str(e)}")
+
+    @staticmethod
+    def _validate_start_key(start_key: Dict[str, Any], index_name: Optional[str]):
+        """
+        Check a cursor's ExclusiveStartKey against the key schema of the read it resumes.
+
+        Raises:
+            ValueError: If the attribute names or wire types do not fit the index
+        """
+        if set(start_key) != INDEX_KEY_ATTRIBUTES.get(index_name):
+            raise ValueError("Invalid cursor: key does not match the index")
+        for value in start_key.values():
+            if len(value) != 1:
+                raise ValueError("Invalid cursor: key has an invalid attribute value")
+            (wire_type, raw), = value.items()
+            if wire_type not in KEY_ATTRIBUTE_TYPES or not isinstance(raw, str):
+                raise ValueError("Invalid cursor: key has an invalid attribute value")
+            if wire_type == "N":
+                try:
+                    Decimal(raw)
+                except ArithmeticError:
+                    raise ValueError("Invalid cursor: key has an invalid number")
+
+    @staticmethod
+    def _compute_catalog_version(products: List[Dict[str, Any]]) -> str:
+        """Hash the catalog contents so identical tables get identical versions."""
+        ordered = sorted(products, key=lambda p: p.get("shoe_id", ""))
+        payload = json.dumps(ordered, sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _featured_by_rating(products: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """List the featured products highest rated first, as featured-rating-index does."""
+        featured = [p for p in products if p.get("featured", False)]
+        return sorted(featured, key=lambda p: p.get("rating") or 0, reverse=True)
+
+    @staticmethod
+    def _extract_categories(products: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+        """Collect the sorted unique types and colors of a product list."""
+        types = set()
+        colors = set()
+
+        for product in products:
+            if "type" in product:
+                types.add(product["type"])
+            if "color" in product:
+                colors.add(product["color"])
+
+        return {"types": sorted(list(types)), "colors": sorted(list(colors))}
+
+    @staticmethod
+    def _sort_products(
+        products: List[Dict[str, Any]], sort_by: Optional[str], descending: Optional[bool]
+    ) -> List[Dict[str, Any]]:
+        """
+        Sort in-memory products the way CatalogIndex.select does.
+
+        Products without the sort field come last and ties keep their order.
+        """
+        if not sort_by:
+            return products
+        if descending is None:
+            from app.catalog_index import SORT_FIELDS
+
+            descending = SORT_FIELDS[sort_by]
+
+        sign = -1 if descending else 1
+        return sorted(
+            products,
+            key=lambda p: (p.get(sort_by) is None, sign * (p.get(sort_by) or 0)),
+        )
+
+    @staticmethod
+    def _filter_products(
+        products: List[Dict[str, Any]],
+        type: Optional[str] = None,
+        color: Optional[str] = None,
+        size: Optional[float] = None,
+        price_min: Optional[float] = None,
+        price_max: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Apply the product filters to an in-memory product list."""
+        filtered_products = products
+
+        if type:
+            filtered_products = [p for p in filtered_products if p.get("type") == type]
+
+        if color:
+            filtered_products = [p for p in filtered_products if p.get("color") == color]
+
+        if size:
+            filtered_products = [p for p in filtered_products if size in p.get("sizes", [])]
+
+        if price_min is not None:
+            filtered_products = [p for p in filtered_products if p["price"] >= price_min]
+
+        if price_max is not None:
+            filtered_products = [p for p in filtered_products if p["price"] <= price_max]
+
+        return list(filtered_products)
 
     def _get_mock_products(
         self,
@@ -381,21 +1454,11 @@ class DynamoDBClient:
         ]
 
         # Apply filters
-        filtered_products = mock_products
-
-        if type:
-            filtered_products = [p for p in filtered_products if p["type"] == type]
-
-        if color:
-            filtered_products = [p for p in filtered_products if p["color"] == color]
-
-        if size:
-            filtered_products = [p for p in filtered_products if size in p["sizes"]]
-
-        if price_min is not None:
-            filtered_products = [p for p in filtered_products if p["price"] >= price_min]
-
-        if price_max is not None:
-            filtered_products = [p for p in filtered_products if p["price"] <= price_max]
-
-        return filtered_products
\ No newline at end of file
+        return self._filter_products(
+            mock_products,
+            type=type,
+            color=color,
+            size=size,
+            price_min=price_min,
+            price_max=price_max,
+        )
\ No newline at end of file
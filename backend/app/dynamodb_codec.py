@@ -0,0 +1,61 @@
+"""
+Fast conversion between DynamoDB wire JSON and plain Python values.
+
+The boto3 resource layer turns every number into a Decimal (TypeDeserializer),
+which we then had to convert again for JSON. Reading through the low-level
+client and decoding the wire format here produces ints and floats directly,
+including inside lists and maps.
+
+This module has no dependencies outside the standard library so that it can
+also be packaged next to the search_shoes Lambda (see infra/lambda.tf), which
+scans through the low-level client as well.
+"""
+from typing import Any, Dict, Union
+
+Number = Union[int, float]
+
+
+def to_number(text: str) -> Number:
+    """Parse a DynamoDB N value: int when integral in form, float otherwise."""
+    if "." in text or "e" in text or "E" in text:
+        return float(text)
+    return int(text)
+
+
+def deserialize_value(value: Dict[str, Any]) -> Any:
+    """
+    Decode one attribute value from wire format.
+
+    Args:
+        value: Attribute value such as {"S": "red"} or {"L": [{"N": "9.5"}]}
+
+    Returns:
+        The plain Python value (str, int, float, bool, None, list, dict, set, bytes)
+    """
+    # Single-key dicts; check the common types first
+    if "S" in value:
+        return value["S"]
+    if "N" in value:
+        return to_number(value["N"])
+    if "BOOL" in value:
+        return value["BOOL"]
+    if "L" in value:
+        return [deserialize_value(v) for v in value["L"]]
+    if "M" in value:
+        return {k: deserialize_value(v) for k, v in value["M"].items()}
+    if "NULL" in value:
+        return None
+    if "SS" in value:
+        return set(value["SS"])
+    if "NS" in value:
+        return {to_number(v) for v in value["NS"]}
+    if "B" in value:
+        return value["B"]
+    if "BS" in value:
+        return set(value["BS"])
+    raise TypeError(f"Unknown DynamoDB attribute value: {value!r}")
+
+
+def deserialize_item(item: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Decode a whole item (attribute name -> wire value)."""
+    return {name: deserialize_value(value) for name, value in item.items()}
@@ -0,0 +1,53 @@
+"""
+Dedicated thread pools for blocking boto3 calls.
+
+The FastAPI handlers are async, but DynamoDBClient and BedrockClient use the
+synchronous boto3 API. Running those calls on the event loop would block every
+other request on the worker, so they are handed to bounded executors instead.
+Catalog reads and agent invocations get separate pools so that slow Bedrock
+runs can never starve the product endpoints.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+from app.config import settings
+
+catalog_executor = ThreadPoolExecutor(
+    max_workers=settings.catalog_executor_workers,
+    thread_name_prefix="catalog",
+)
+
+agent_executor = ThreadPoolExecutor(
+    max_workers=settings.agent_executor_workers,
+    thread_name_prefix="agent",
+)
+
+
+async def run_in_executor(
+    executor: ThreadPoolExecutor, func: Callable[..., Any], *args, **kwargs
+) -> Any:
+    """
+    Run a blocking function on the given executor and await its result.
+
+    Args:
+        executor: Pool to run the call on
+        func: Blocking callable
+        *args, **kwargs: Arguments passed to func
+
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+
+async def run_catalog(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a DynamoDB catalog read on the catalog pool."""
+    return await run_in_executor(catalog_executor, func, *args, **kwargs)
+
+
+async def run_agent(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a Bedrock agent call on the agent pool."""
+    return await run_in_executor(agent_executor, func, *args, **kwargs)
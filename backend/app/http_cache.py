@@ -0,0 +1,311 @@
+"""
+HTTP caching helpers for catalog reads.
+
+Product, featured, category and facet responses only change when the catalog
+does, so with the snapshot cache their ETag is derived from the snapshot's
+content hash. A client or CDN that sends the ETag back in If-None-Match gets
+a 304 before the endpoint runs, so neither DynamoDB nor the serializer is
+involved. When reads go to the table there is no such hash (the catalog
+metadata item's version is only updated by a rebuild), and the ETag is a
+hash of the response body instead.
+
+Requests that do reach an endpoint can still skip validation and encoding:
+ResponseCache keeps the serialized JSON of hot reads, keyed on the normalized
+request parameters and the snapshot's content hash, along with its gzip
+encoding once a client has asked for it, so repeated reads are not
+recompressed either. Without the snapshot cache there is no hash to tie a body
+to, and nothing is stored.
+"""
+import gzip
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# GET endpoints whose responses depend only on the catalog and the URL
+CACHEABLE_PATHS = ("/api/products", "/api/featured", "/api/categories", "/api/facets")
+CACHEABLE_PREFIXES = ("/api/products/",)
+
+
+def is_cacheable(method: str, path: str) -> bool:
+    """True for GET requests to catalog read endpoints."""
+    return method == "GET" and (path in CACHEABLE_PATHS or path.startswith(CACHEABLE_PREFIXES))
+
+
+def version_etag(catalog_version: str, api_version: str) -> str:
+    """
+    Build the ETag for a catalog version.
+
+    The API version is included so a deploy that changes response shapes
+    does not answer 304 to bodies cached before it. The tag is weak because
+    the same representation may be sent compressed or not.
+    """
+    return f'W/"{api_version}-{catalog_version}"'
+
+
+def content_etag(body: bytes) -> str:
+    """Build an ETag from the response body itself."""
+    return f'W/"{hashlib.sha1(body).hexdigest()[:16]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against an ETag (weak comparison).
+
+    Args:
+        if_none_match: Header value, e.g. 'W/"a", "b"' or '*'
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+
+    current = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == current:
+            return True
+    return False
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """True if the Accept-Encoding header allows gzip (same test as GZipMiddleware)."""
+    return "gzip" in (accept_encoding or "")
+
+
+def cache_control(max_age: int) -> str:
+    """Cache-Control for catalog reads: shared caches may keep them max_age seconds."""
+    if max_age <= 0:
+        return "no-cache"
+    return f"public, max-age={max_age}"
+
+
+class ConditionalGetMiddleware:
+    """
+    ASGI middleware that tags catalog reads with an ETag and answers
+    If-None-Match with 304.
+
+    The ETag comes from the catalog's content hash, so a matching request
+    returns before the endpoint reads DynamoDB or serializes anything.
+    Without one (reads go to the table) the body hash is used instead. The
+    version is left in the request state ("catalog_version") for endpoints
+    that key caches on it.
+
+    This is plain ASGI rather than BaseHTTPMiddleware, which would turn every
+    response into a stream and defeat GZipMiddleware's minimum size.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        get_version: Callable[[], Awaitable[Optional[str]]],
+        api_version: str,
+        max_age: int,
+    ):
+        """
+        Args:
+            app: Wrapped ASGI app
+            get_version: Coroutine function returning the catalog content hash, or None
+            api_version: Application version, part of every ETag
+            max_age: Cache-Control max-age for tagged responses
+        """
+        self.app = app
+        self.get_version = get_version
+        self.api_version = api_version
+        self.cache_control = cache_control(max_age)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not is_cacheable(scope["method"], scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            version = await self.get_version()
+        except Exception as e:
+            logger.warning(f"Catalog version unavailable for ETag: {e}")
+            version = None
+
+        scope.setdefault("state", {})["catalog_version"] = version
+        if_none_match = Headers(scope=scope).get("if-none-match")
+
+        if not version:
+            await self._tag_with_content_hash(scope, receive, send, if_none_match)
+            return
+
+        etag = version_etag(version, self.api_version)
+        if etag_matches(if_none_match, etag):
+            await self._not_modified(etag)(scope, receive, send)
+            return
+
+        async def send_tagged(message: Message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                headers["ETag"] = etag
+                headers["Cache-Control"] = self.cache_control
+            await send(message)
+
+        await self.app(scope, receive, send_tagged)
+
+    async def _tag_with_content_hash(
+        self, scope: Scope, receive: Receive, send: Send, if_none_match: Optional[str]
+    ):
+        """Buffer a 200 response, tag it with its body hash and maybe answer 304."""
+        start: Message = {}
+        chunks = []
+
+        async def buffer(message: Message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                if start["status"] != 200:
+                    await send(start)
+            elif start.get("status") != 200:
+                await send(message)
+            else:
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, buffer)
+        if start.get("status") != 200:
+            return
+
+        body = b"".join(chunks)
+        etag = content_etag(body)
+        if etag_matches(if_none_match, etag):
+            await self._not_modified(etag)(scope, receive, send)
+            return
+
+        headers = MutableHeaders(scope=start)
+        headers["ETag"] = etag
+        headers["Cache-Control"] = self.cache_control
+        await send(start)
+        await send({"type": "http.response.body", "body": body, "more_body": False})
+
+    def _not_modified(self, etag: str) -> Response:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": self.cache_control})
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of serialized response bodies, bounded in bytes"""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Total size of the cached bodies; 0 disables the cache
+        """
+        self.max_bytes = max_bytes
+        # (request key, catalog version) -> [body, gzipped body or None], oldest first
+        self._entries: OrderedDict = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: Hashable, catalog_version: Optional[str]) -> Optional[bytes]:
+        """
+        Look up the body stored for a request.
+
+        Args:
+            key: Normalized request parameters (endpoint name first)
+            catalog_version: Current catalog version; None never hits
+
+        Returns:
+            The stored JSON bytes, or None on a miss
+        """
+        if not self.max_bytes or catalog_version is None:
+            return None
+
+        with self._lock:
+            entry = self._entries.get((key, catalog_version))
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end((key, catalog_version))
+            self.stats["hits"] += 1
+            return entry[0]
+
+    def gzipped(
+        self, key: Hashable, catalog_version: Optional[str], compresslevel: int
+    ) -> Optional[bytes]:
+        """
+        Return the gzip encoding of a stored body, compressing it on first use.
+
+        Args:
+            key: Normalized request parameters, as passed to put()
+            catalog_version: Catalog version, as passed to put()
+            compresslevel: zlib level used the first time
+
+        Returns:
+            The compressed bytes, or None if the body is not stored
+        """
+        with self._lock:
+            entry = self._entries.get((key, catalog_version))
+            if entry is None:
+                return None
+            if entry[1] is not None:
+                return entry[1]
+            body = entry[0]
+
+        # Compress outside the lock; a concurrent first request just compresses twice
+        compressed = gzip.compress(body, compresslevel=compresslevel, mtime=0)
+        with self._lock:
+            entry = self._entries.get((key, catalog_version))
+            if entry is not None and entry[1] is None:
+                entry[1] = compressed
+                self._size += len(compressed)
+                self._evict()
+        return compressed
+
+    def put(self, key: Hashable, catalog_version: Optional[str], body: bytes):
+        """
+        Store a body, evicting least recently used bodies to stay within max_bytes.
+
+        Bodies larger than the whole budget, or without a catalog version to
+        tie them to, are not stored.
+        """
+        if not self.max_bytes or catalog_version is None or len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop((key, catalog_version), None)
+            if previous is not None:
+                self._size -= self._entry_size(previous)
+            self._entries[(key, catalog_version)] = [body, None]
+            self._size += len(body)
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until within max_bytes. Caller holds the lock."""
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= self._entry_size(evicted)
+            self.stats["evictions"] += 1
+
+    @staticmethod
+    def _entry_size(entry: list) -> int:
+        return len(entry[0]) + len(entry[1] or b"")
+
+    def clear(self):
+        """Drop every cached body."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Report size, budget and hit/miss counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                **self.stats,
+            }
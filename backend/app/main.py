@@ -1,9 +1,16 @@
 """FastAPI application with enhanced error handling and validation."""
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional, List
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import AsyncIterator, Literal, Optional, List, Tuple
+import json
 import logging
+import threading
+import time
+import uuid
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -12,17 +19,33 @@ logger = logging.getLogger(__name__)
 from app.config import settings
 from app.models import (
     ShoeProduct,
+    catalog_products,
     ProductDetail,
     ProductListResponse,
     ProductFilter,
     ProductListResponse,
+    ProductBatchRequest,
+    ProductSummaryListResponse,
+    SUMMARY_FIELDS,
     SearchRequest,
     SearchResponse,
     CategoriesResponse,
+    FacetsResponse,
     HealthResponse,
 )
 from app.dynamodb_client import DynamoDBClient
 from app.bedrock_client import BedrockClient
+from app.executors import run_agent, run_catalog
+from app.query_parser import QueryParser, SearchStats, fast_path_response
+from app.search_cache import SearchCache
+from app.http_cache import ConditionalGetMiddleware, ResponseCache, accepts_gzip
+
+# Page size used when a cursor is sent without a limit, and the largest page
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# How often the search query parser re-reads the catalog's categories
+QUERY_PARSER_REFRESH_SECONDS = 300
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -31,15 +54,42 @@ app = FastAPI(
     version="1.0.0",
 )
 
+async def current_catalog_version() -> Optional[str]:
+    """
+    Catalog version for ETags and response caches, read off the event loop.
+
+    Only a content hash of the served catalog qualifies: the metadata item's
+    version does not change on writes that skip its rebuild, so ETags and
+    cached bodies keyed on it would stay stale.
+    """
+    return await run_catalog(dynamodb_client.get_content_version)
 
 
+# Conditional GET for catalog reads. Registered before CORS so that CORS is
+# the outer middleware and also adds its headers to 304 responses.
+app.add_middleware(
+    ConditionalGetMiddleware,
+    get_version=current_catalog_version,
+    api_version=app.version,
+    max_age=settings.api_cache_max_age_seconds,
+)
+
 # Configure CORS - Only allow specific origins
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,  # Only configured origins, no wildcard
     allow_credentials=True,
     allow_methods=["GET", "POST", "OPTIONS"],  # Only methods we actually use
-    allow_headers=["Content-Type", "Authorization"],  # Only headers we need
+    allow_headers=["Content-Type", "Authorization", "If-None-Match"],  # Only headers we need
+    expose_headers=["ETag"],
+)
+
+# Compress JSON bodies for clients that accept gzip. Responses that are already
+# encoded (cached product lists, see json_response) and SSE streams pass through.
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=settings.gzip_minimum_size,
+    compresslevel=settings.gzip_compress_level,
 )
 
 # Initialize clients
@@ -47,6 +97,8 @@ dynamodb_client = DynamoDBClient(
     table_name=settings.dynamodb_table_name,
     region=settings.aws_region,
     mock_mode=settings.mock_mode,
+    cache_ttl_seconds=settings.catalog_cache_ttl_seconds,
+    scan_segments=settings.dynamodb_scan_segments,
 )
 
 bedrock_client = None
@@ -56,6 +108,7 @@ if settings.bedrock_agent_id and settings.bedrock_agent_alias_id:
         agent_alias_id=settings.bedrock_agent_alias_id,
         region=settings.aws_region,
         mock_mode=settings.mock_mode,
+        product_loader=dynamodb_client.get_products_by_ids,
     )
 else:
     bedrock_client = BedrockClient(
@@ -65,6 +118,124 @@ else:
         mock_mode=True,
     )
 
+search_stats = SearchStats()
+response_cache = ResponseCache(max_bytes=settings.response_cache_max_bytes)
+search_cache = SearchCache(
+    max_entries=settings.search_cache_max_entries,
+    ttl_seconds=settings.search_cache_ttl_seconds,
+)
+_query_parser: Optional[QueryParser] = None
+_query_parser_loaded_at = 0.0
+_query_parser_lock = threading.Lock()
+
+
+def get_query_parser() -> QueryParser:
+    """Return the search query parser, rebuilding it when categories may have changed."""
+    global _query_parser, _query_parser_loaded_at
+
+    with _query_parser_lock:
+        if (
+            _query_parser is None
+            or time.monotonic() - _query_parser_loaded_at > QUERY_PARSER_REFRESH_SECONDS
+        ):
+            categories = dynamodb_client.get_categories()
+            _query_parser = QueryParser(categories["types"], categories["colors"])
+            _query_parser_loaded_at = time.monotonic()
+        return _query_parser
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse a fields= query value into attribute names.
+
+    Accepts a comma-separated list of ShoeProduct fields, or "summary" for the
+    fields list views render.
+    """
+    if fields is None:
+        return None
+
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    if names == ["summary"]:
+        return list(SUMMARY_FIELDS)
+
+    unknown = [name for name in names if name not in ShoeProduct.model_fields]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown) or fields}"
+        )
+    return names
+
+
+def summary_json(products: list, next_cursor: Optional[str] = None) -> bytes:
+    """Serialize partial products, leaving out fields that were not selected."""
+    body = ProductSummaryListResponse.from_catalog(products, next_cursor)
+    return body.model_dump_json(exclude_unset=True).encode()
+
+
+def product_list_json(products: list, next_cursor: Optional[str] = None) -> bytes:
+    """Serialize full products as a ProductListResponse."""
+    return ProductListResponse.from_catalog(products, next_cursor).model_dump_json().encode()
+
+
+def model_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model we built ourselves.
+
+    Returning the model instead would make FastAPI validate it against the
+    response_model again before encoding it.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+def cached_json(request: Request, key: tuple) -> Optional[Response]:
+    """
+    Return the stored response for a catalog read, if there is one.
+
+    Bodies are keyed on the catalog's content hash, which only exists with the
+    snapshot cache. Table reads have none and are never cached: nothing else
+    would tell us a stored body went stale.
+
+    Args:
+        request: Current request; ConditionalGetMiddleware put the content
+            hash on it as catalog_version
+        key: Endpoint name followed by its normalized parameters
+
+    Returns:
+        JSON response with the stored bytes, or None on a miss
+    """
+    body = response_cache.get(key, getattr(request.state, "catalog_version", None))
+    if body is None:
+        return None
+    return json_response(request, key, body)
+
+
+def store_json(request: Request, key: tuple, body: bytes) -> Response:
+    """Store a serialized catalog read for cached_json and return it as a response."""
+    response_cache.put(key, getattr(request.state, "catalog_version", None), body)
+    return json_response(request, key, body)
+
+
+def json_response(request: Request, key: tuple, body: bytes) -> Response:
+    """
+    Send a cacheable catalog read, reusing its cached gzip encoding when accepted.
+
+    Falls back to the plain body (compressed by GZipMiddleware, if large
+    enough) when the response is not in the cache.
+    """
+    if len(body) >= settings.gzip_minimum_size and accepts_gzip(
+        request.headers.get("accept-encoding")
+    ):
+        compressed = response_cache.gzipped(
+            key, getattr(request.state, "catalog_version", None), settings.gzip_compress_level
+        )
+        if compressed is not None:
+            return Response(
+                content=compressed,
+                media_type="application/json",
+                headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+            )
+    return Response(content=body, media_type="application/json")
+
 
 # Health Check Endpoint
 @app.get("/health", response_model=HealthResponse)
@@ -79,16 +250,36 @@ async def health_check():
 # Products Endpoints
 @app.get("/api/products", response_model=ProductListResponse)
 async def get_products(
+    request: Request,
     type: Optional[str] = Query(None, description="Filter by shoe type"),
     color: Optional[str] = Query(None, description="Filter by color"),
     size: Optional[float] = Query(None, description="Filter by available size"),
     price_min: Optional[float] = Query(None, ge=0.0, description="Minimum price"),
     price_max: Optional[float] = Query(None, ge=0.0, description="Maximum price"),
+    limit: Optional[int] = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Page size; omit for the full list"
+    ),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(
+        None, description='Comma-separated fields to return, or "summary"'
+    ),
+    sort: Optional[Literal["price", "rating"]] = Query(None, description="Sort field"),
+    order: Optional[Literal["asc", "desc"]] = Query(
+        None, description="Sort direction; defaults to asc for price, desc for rating"
+    ),
 ):
     """
     Retrieve all products with optional filters.
+
+    Pass limit (and then cursor) to read the catalog page by page, and fields
+    to get slimmer products containing only the selected attributes. sort and
+    order return the products sorted, e.g. sort=rating&limit=10 for the ten
+    best rated.
     """
     try:
+        selected_fields = parse_fields(fields)
+        descending = None if order is None else order == "desc"
+
         # Validate price range
         if price_min is not None and price_max is not None and price_min > price_max:
             raise HTTPException(
@@ -99,21 +290,54 @@ async def get_products(
         if size is not None and (size < 6 or size > 13):
             raise HTTPException(status_code=400, detail="size must be between 6 and 13")
 
-        if any([type, color, size, price_min, price_max]):
-            products = dynamodb_client.get_products_by_filters(
+        cache_key = (
+            "products", type, color, size, price_min, price_max, limit, cursor,
+            tuple(sorted(selected_fields)) if selected_fields else None, sort, descending,
+        )
+        cached = cached_json(request, cache_key)
+        if cached is not None:
+            return cached
+
+        if limit is not None or cursor is not None:
+            products, next_cursor = await run_catalog(
+                dynamodb_client.get_products_page,
+                limit=limit or DEFAULT_PAGE_SIZE,
+                cursor=cursor,
+                type=type,
+                color=color,
+                size=size,
+                price_min=price_min,
+                price_max=price_max,
+                fields=selected_fields,
+                sort_by=sort,
+                descending=descending,
+            )
+            serialize = summary_json if selected_fields else product_list_json
+            return store_json(request, cache_key, serialize(products, next_cursor))
+
+        if any([type, color, size, price_min, price_max, sort]):
+            products = await run_catalog(
+                dynamodb_client.get_products_by_filters,
                 type=type,
                 color=color,
                 size=size,
                 price_min=price_min,
                 price_max=price_max,
+                fields=selected_fields,
+                sort_by=sort,
+                descending=descending,
             )
         else:
-            products = dynamodb_client.get_all_products()
+            products = await run_catalog(
+                dynamodb_client.get_all_products, fields=selected_fields
+            )
 
-        shoe_products = [ShoeProduct(**product) for product in products]
-        return ProductListResponse(products=shoe_products)
+        serialize = summary_json if selected_fields else product_list_json
+        return store_json(request, cache_key, serialize(products))
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error retrieving products: {e}")
         raise HTTPException(
@@ -121,18 +345,35 @@ async def get_products(
         )
 
 
+@app.post("/api/products/batch", response_model=ProductListResponse)
+async def get_products_batch(request: ProductBatchRequest):
+    """
+    Retrieve several products by ID in one round trip.
+
+    Products come back in request order; unknown IDs are left out.
+    """
+    try:
+        products = await run_catalog(dynamodb_client.get_products_by_ids, request.shoe_ids)
+        return model_response(ProductListResponse.from_catalog(products))
+    except Exception as e:
+        logger.error(f"Error retrieving product batch: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Error retrieving products: {str(e)}"
+        )
+
+
 @app.get("/api/products/{shoe_id}", response_model=ProductDetail)
 async def get_product_by_id(shoe_id: str):
     """
     Retrieve a single product by its ID.
     """
     try:
-        product = dynamodb_client.get_product_by_id(shoe_id)
+        product = await run_catalog(dynamodb_client.get_product_by_id, shoe_id)
         if product is None:
             raise HTTPException(
                 status_code=404, detail=f"Product with ID '{shoe_id}' not found"
             )
-        return ProductDetail(**product)
+        return model_response(ProductDetail.model_validate(product))
     except HTTPException:
         raise
     except Exception as e:
@@ -143,14 +384,39 @@ async def get_product_by_id(shoe_id: str):
 
 
 @app.get("/api/featured", response_model=ProductListResponse)
-async def get_featured_products():
+async def get_featured_products(
+    request: Request,
+    fields: Optional[str] = Query(
+        None, description='Comma-separated fields to return, or "summary"'
+    ),
+    limit: Optional[int] = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Maximum number of products"
+    ),
+    sort: Optional[Literal["rating"]] = Query(
+        None, description="Accepted for old clients; results are always highest rated first"
+    ),
+):
     """
-    Retrieve featured products for homepage display.
+    Retrieve featured products for homepage display, highest rated first.
     """
     try:
-        products = dynamodb_client.get_featured_products()
-        shoe_products = [ShoeProduct(**product) for product in products]
-        return ProductListResponse(products=shoe_products)
+        selected_fields = parse_fields(fields)
+        cache_key = (
+            "featured", tuple(sorted(selected_fields)) if selected_fields else None, limit
+        )
+        cached = cached_json(request, cache_key)
+        if cached is not None:
+            return cached
+
+        products = await run_catalog(
+            dynamodb_client.get_featured_products,
+            fields=selected_fields,
+            limit=limit,
+        )
+        serialize = summary_json if selected_fields else product_list_json
+        return store_json(request, cache_key, serialize(products))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving featured products: {e}")
         raise HTTPException(
@@ -164,7 +430,7 @@ async def get_categories():
     Retrieve all available categories (types and colors).
     """
     try:
-        categories = dynamodb_client.get_categories()
+        categories = await run_catalog(dynamodb_client.get_categories)
         return CategoriesResponse(
             types=categories["types"],
             colors=categories["colors"],
@@ -176,29 +442,175 @@ async def get_categories():
         )
 
 
+@app.get("/api/facets", response_model=FacetsResponse)
+async def get_facets(
+    type: Optional[str] = Query(None, description="Filter by shoe type"),
+    color: Optional[str] = Query(None, description="Filter by color"),
+    size: Optional[float] = Query(None, description="Filter by available size"),
+    price_min: Optional[float] = Query(None, ge=0.0, description="Minimum price"),
+    price_max: Optional[float] = Query(None, ge=0.0, description="Maximum price"),
+):
+    """
+    Count the products matching the filters per type, color, brand and size.
+    """
+    try:
+        if price_min is not None and price_max is not None and price_min > price_max:
+            raise HTTPException(
+                status_code=400, detail="price_min cannot exceed price_max"
+            )
+
+        facets = await run_catalog(
+            dynamodb_client.get_facets,
+            type=type,
+            color=color,
+            size=size,
+            price_min=price_min,
+            price_max=price_max,
+        )
+        return FacetsResponse(
+            total=facets["total"],
+            types=facets["types"],
+            colors=facets["colors"],
+            brands=facets["brands"],
+            sizes={f"{value:g}": count for value, count in facets["sizes"].items()},
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving facets: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Error retrieving facets: {str(e)}"
+        )
+
+
 # AI Search Endpoint
+def validate_search_request(request: SearchRequest):
+    """Reject empty and overly long search queries."""
+    # Validate query presence
+    if not request.query or request.query.strip() == "":
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+
+    # Validate query length (optional)
+    if len(request.query.strip()) > 200:
+        raise HTTPException(status_code=400, detail="Query exceeds maximum length")
+
+
+async def search_fast_path(request: SearchRequest) -> Tuple[Optional[SearchResponse], str]:
+    """
+    Answer a simple search from the catalog without the agent, if possible.
+
+    Follow-ups in an agent session always go to the agent for context, and
+    so does any search the catalog fails to answer, so a DynamoDB error
+    never breaks a search the agent could handle.
+
+    Returns:
+        Tuple of (response or None when the agent is needed, query class)
+    """
+    if not settings.search_fast_path_enabled or request.session_id:
+        return None, "follow_up"
+
+    started = time.perf_counter()
+    try:
+        parser = await run_catalog(get_query_parser)
+    except Exception as e:
+        logger.warning(f"Search fast path unavailable, using the agent: {e}")
+        return None, "unparsed"
+
+    parsed = parser.parse(request.query)
+    if not parsed["confident"]:
+        return None, parsed["query_class"]
+
+    try:
+        products = await run_catalog(dynamodb_client.get_products_by_filters, **parsed["filters"])
+    except Exception as e:
+        logger.warning(f"Search fast path failed, using the agent: {e}")
+        return None, parsed["query_class"]
+
+    search_stats.record(
+        parsed["query_class"], fast_path=True, seconds=time.perf_counter() - started
+    )
+    response = SearchResponse.model_construct(
+        agent_response=fast_path_response(parsed["filters"], len(products)),
+        products=catalog_products(products),
+        session_id=str(uuid.uuid4()),
+    )
+    return response, parsed["query_class"]
+
+
+async def search_cache_lookup(request: SearchRequest) -> Tuple[Optional[SearchResponse], Optional[str]]:
+    """
+    Answer a repeated agent search from the result cache, if possible.
+
+    Results are keyed on the normalized query and the snapshot's content
+    hash, so a catalog change is never answered with stale products; without
+    one (reads going to the table) nothing is cached. Follow-ups in an agent
+    session depend on the conversation and are never cached. A hit gets a
+    fresh session_id; follow-ups to it start a new agent session. A failed
+    version lookup counts as a miss.
+
+    Returns:
+        Tuple of (cached response or None, catalog version to cache under)
+    """
+    if request.session_id or not search_cache.enabled:
+        return None, None
+
+    try:
+        version = await run_catalog(dynamodb_client.get_content_version)
+    except Exception as e:
+        logger.warning(f"Search cache lookup failed, using the agent: {e}")
+        return None, None
+
+    cached = search_cache.get(request.query, version)
+    if cached is None:
+        return None, version
+
+    # Cached products were validated when the agent result was first served
+    response = SearchResponse.model_construct(
+        agent_response=cached["agent_response"],
+        products=catalog_products(cached["products"]),
+        session_id=str(uuid.uuid4()),
+    )
+    return response, version
+
+
 @app.post("/api/search", response_model=SearchResponse)
 async def search_products(request: SearchRequest):
     """
     Natural language search using Bedrock agent.
     """
     try:
-        # Validate query presence
-        if not request.query or request.query.strip() == "":
-            raise HTTPException(status_code=400, detail="Query cannot be empty")
+        validate_search_request(request)
+
+        fast_response, query_class = await search_fast_path(request)
+        if fast_response is not None:
+            return model_response(fast_response)
 
-        # Validate query length (optional)
-        if len(request.query.strip()) > 200:
-            raise HTTPException(status_code=400, detail="Query exceeds maximum length")
+        cached_response, catalog_version = await search_cache_lookup(request)
+        if cached_response is not None:
+            return model_response(cached_response)
 
         # Ensure bedrock client is configured
         if not bedrock_client:
             raise HTTPException(status_code=500, detail="Bedrock client not configured")
         # Invoke Bedrock agent
-        result = bedrock_client.invoke_agent(
+        started = time.perf_counter()
+        result = await run_agent(
+            bedrock_client.invoke_agent,
             query=request.query,
             session_id=request.session_id,
         )
+        search_stats.record(query_class, fast_path=False, seconds=time.perf_counter() - started)
+
+        # Mock answers substituted for a failed agent call are not worth keeping
+        if not request.session_id and not result.get("fallback"):
+            search_cache.put(
+                request.query,
+                catalog_version,
+                {
+                    "agent_response": result.get("agent_response", ""),
+                    "products": result.get("products", []),
+                },
+            )
 
         # Convert products to Pydantic models
         products = [ShoeProduct(**product) for product in result.get("products", [])]
@@ -220,6 +632,130 @@ async def search_products(request: SearchRequest):
         )
 
 
+def sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def agent_search_events(
+    request: SearchRequest, query_class: str, catalog_version: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Relay BedrockClient.stream_agent as Server-Sent Events.
+
+    Each blocking read of the agent's event stream runs in the agent
+    executor, so chunks are forwarded as soon as Bedrock sends them.
+    A stream that completes is stored in the search result cache.
+    """
+    started = time.perf_counter()
+    first_chunk = True
+    chunks: List[str] = []
+    products = []
+    events = bedrock_client.stream_agent(request.query, request.session_id)
+    try:
+        while True:
+            item = await run_agent(next, events, None)
+            if item is None:
+                break
+
+            event_type, data = item
+            if event_type == "text":
+                if first_chunk:
+                    search_stats.record_first_chunk(time.perf_counter() - started)
+                    first_chunk = False
+                chunks.append(data)
+                yield sse_event("text", {"text": data})
+            elif event_type == "products":
+                products = data
+                yield sse_event(
+                    "products",
+                    {"products": [ShoeProduct(**p).model_dump(mode="json") for p in data]},
+                )
+            elif event_type == "done":
+                if not request.session_id:
+                    search_cache.put(
+                        request.query,
+                        catalog_version,
+                        {"agent_response": "".join(chunks), "products": products},
+                    )
+                yield sse_event("done", {"session_id": data})
+    except Exception as e:
+        logger.error(f"Error streaming search: {e}")
+        yield sse_event("error", {"detail": f"Error processing search: {str(e)}"})
+    finally:
+        try:
+            events.close()
+        except ValueError:
+            # Client went away while a read was still running in the executor
+            pass
+        search_stats.record(query_class, fast_path=False, seconds=time.perf_counter() - started)
+
+
+async def response_events(response: SearchResponse) -> AsyncIterator[str]:
+    """Send a complete answer as the same events the agent stream produces."""
+    yield sse_event("text", {"text": response.agent_response})
+    yield sse_event(
+        "products", {"products": [p.model_dump(mode="json") for p in response.products]}
+    )
+    yield sse_event("done", {"session_id": response.session_id})
+
+
+@app.post("/api/search/stream")
+async def stream_search_products(request: SearchRequest):
+    """
+    Natural language search streamed as Server-Sent Events.
+
+    Events, in order of arrival:
+        - text: {"text": ...} for each completion chunk
+        - products: {"products": [...]} once the action group result is parsed
+        - done: {"session_id": ...} when the agent has finished
+        - error: {"detail": ...} if the agent fails mid-stream
+
+    Streaming needs a server that flushes as it goes (uvicorn, or a Lambda
+    function URL in response streaming mode); API Gateway through Mangum
+    buffers the whole body, so there clients see all events at once.
+    """
+    try:
+        validate_search_request(request)
+
+        fast_response, query_class = await search_fast_path(request)
+        if fast_response is None:
+            fast_response, catalog_version = await search_cache_lookup(request)
+
+        if fast_response is not None:
+            events = response_events(fast_response)
+        else:
+            if not bedrock_client:
+                raise HTTPException(status_code=500, detail="Bedrock client not configured")
+            events = agent_search_events(request, query_class, catalog_version)
+
+        return StreamingResponse(
+            events,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing search: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"Error processing search: {str(e)}"
+        )
+
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """
+    Report search fast path hit rate and latency saved per query class,
+    and search result and response cache hit rates.
+    """
+    return {
+        "search": search_stats.snapshot(),
+        "search_cache": search_cache.snapshot(),
+        "response_cache": response_cache.snapshot(),
+    }
+
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -234,8 +770,12 @@ async def root():
             "health": "/health",
             "products": "/api/products",
             "product_detail": "/api/products/{shoe_id}",
+            "products_batch": "/api/products/batch",
             "featured": "/api/featured",
             "categories": "/api/categories",
+            "facets": "/api/facets",
             "search": "/api/search",
+            "search_stream": "/api/search/stream",
+            "metrics": "/api/metrics",
         },
     }
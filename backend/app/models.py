@@ -1,7 +1,7 @@
 """
 Pydantic models for request/response validation.
 """
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator, model_validator
 from typing import Optional
 from decimal import Decimal
 
@@ -43,6 +43,58 @@ class ShoeProduct(BaseModel):
         }
 
 
+# Bulk validator for product lists read from our own table: one core call per
+# list instead of one ShoeProduct(**item) per item
+_shoe_product_list = TypeAdapter(list[ShoeProduct])
+
+
+def catalog_products(items: list[dict]) -> list[ShoeProduct]:
+    """
+    Build ShoeProducts for catalog items read by DynamoDBClient.
+
+    Args:
+        items: Product dicts from our own table
+
+    Returns:
+        Validated products, in the same order
+    """
+    return _shoe_product_list.validate_python(items)
+
+
+# Fields list views render; requested with fields=summary
+SUMMARY_FIELDS = ["shoe_id", "name", "brand", "price", "image_url", "rating"]
+
+
+class ProductSummary(BaseModel):
+    """Partial product returned when a list endpoint is called with fields="""
+
+    shoe_id: str
+    name: Optional[str] = None
+    brand: Optional[str] = None
+    type: Optional[str] = None
+    color: Optional[str] = None
+    sizes: Optional[list[float]] = None
+    price: Optional[float] = None
+    image_url: Optional[str] = None
+    description: Optional[str] = None
+    featured: Optional[bool] = None
+    rating: Optional[float] = Field(default=None, ge=0.0, le=5.0)
+    stock: Optional[bool] = None
+    size: Optional[float] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "shoe_id": "nike-air-max-270-001",
+                "name": "Nike Air Max 270",
+                "brand": "Nike",
+                "price": 99.99,
+                "image_url": "https://example.com/nike-air-max.jpg",
+                "rating": 4.5,
+            }
+        }
+
+
 class ProductDetail(ShoeProduct):
     """Extended product model for detail view (can add more fields later)"""
 
@@ -86,11 +138,31 @@ class ProductListResponse(BaseModel):
 
     products: list[ShoeProduct]
     count: int = 0
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page; null on the last page"
+    )
 
-    def __init__(self, **data):
-        super().__init__(**data)
+    @model_validator(mode="after")
+    def default_count(self):
+        """Count the products when no count was given."""
         if self.count == 0:
             self.count = len(self.products)
+        return self
+
+    @classmethod
+    def from_catalog(
+        cls, items: list[dict], next_cursor: Optional[str] = None
+    ) -> "ProductListResponse":
+        """
+        Build the response for catalog items read by DynamoDBClient.
+
+        The items are validated in bulk and the envelope is assembled with
+        model_construct, so nothing is validated twice. External input should
+        go through the normal constructor.
+        """
+        return cls.model_construct(
+            products=catalog_products(items), count=len(items), next_cursor=next_cursor
+        )
 
     class Config:
         json_schema_extra = {
@@ -112,6 +184,49 @@ class ProductListResponse(BaseModel):
                     }
                 ],
                 "count": 1,
+                "next_cursor": None,
+            }
+        }
+
+
+class ProductSummaryListResponse(BaseModel):
+    """Response model for a list of partial products (fields= selection)"""
+
+    products: list[ProductSummary]
+    count: int = 0
+    next_cursor: Optional[str] = None
+
+    @model_validator(mode="after")
+    def default_count(self):
+        """Count the products when no count was given."""
+        if self.count == 0:
+            self.count = len(self.products)
+        return self
+
+    @classmethod
+    def from_catalog(
+        cls, items: list[dict], next_cursor: Optional[str] = None
+    ) -> "ProductSummaryListResponse":
+        """Build the response for projected catalog items (see ProductListResponse.from_catalog)."""
+        return cls.model_construct(
+            products=_product_summary_list.validate_python(items),
+            count=len(items),
+            next_cursor=next_cursor,
+        )
+
+
+_product_summary_list = TypeAdapter(list[ProductSummary])
+
+
+class ProductBatchRequest(BaseModel):
+    """Model for looking up several products by ID in one request"""
+
+    shoe_ids: list[str] = Field(..., min_length=1, max_length=500)
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "shoe_ids": ["nike-air-max-270-001", "nike-revolution-5-001"],
             }
         }
 
@@ -182,6 +297,29 @@ class CategoriesResponse(BaseModel):
         }
 
 
+class FacetsResponse(BaseModel):
+    """Response model for product counts per filter value"""
+
+    total: int
+    types: dict[str, int] = Field(default_factory=dict)
+    colors: dict[str, int] = Field(default_factory=dict)
+    brands: dict[str, int] = Field(default_factory=dict)
+    sizes: dict[str, int] = Field(
+        default_factory=dict, description='Keyed by size, e.g. "9" or "9.5"'
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "total": 3,
+                "types": {"running": 3},
+                "colors": {"black": 1, "red": 2},
+                "brands": {"Nike": 2, "Adidas": 1},
+                "sizes": {"9": 3, "9.5": 1, "10": 2},
+            }
+        }
+
+
 # Health Check Model
 class HealthResponse(BaseModel):
     """Health check response"""
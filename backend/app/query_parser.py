@@ -0,0 +1,289 @@
+"""
+Rule-based parser for simple product searches.
+
+Queries like "red running shoes under $100" only need a type, a color and a
+price bound pulled out of the text; sending them through the Bedrock Agent
+costs a full LLM round trip. QueryParser extracts type, color, size and price
+bounds using the catalog's own category values, and reports the query as
+confident only when every word was understood. /api/search answers confident
+queries straight from DynamoDB and sends everything else to the agent.
+"""
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+# Words that carry no filter meaning in a product search
+STOPWORDS = {
+    "a", "all", "and", "any", "are", "can", "color", "colored", "coloured", "do",
+    "find", "for", "get", "got", "have", "i", "im", "in", "is", "like", "looking",
+    "m", "me", "my", "need", "of", "options", "pair", "pairs", "please", "search",
+    "shoe", "shoes", "show", "some", "that", "the", "want", "what", "with", "would",
+    "you",
+}
+
+# Alternative spellings mapped to the catalog value they stand for
+COLOR_SYNONYMS = {"grey": "gray"}
+
+# Types that already name a kind of footwear ("red boots", not "red boots shoes")
+FOOTWEAR_TYPES = {"boots", "sandals", "sneakers"}
+
+# Sizes the API accepts (see /api/products)
+MIN_SIZE = 6.0
+MAX_SIZE = 13.0
+
+_NUMBER = r"\$?\s*(\d+(?:\.\d{1,2})?)\s*(?:dollars|bucks|usd)?"
+_PRICE_PATTERNS = [
+    # (pattern, bounds its groups fill)
+    (re.compile(rf"\bbetween\s+{_NUMBER}\s+(?:and|to)\s+{_NUMBER}"), ("price_min", "price_max")),
+    (re.compile(rf"\$\s*(\d+(?:\.\d{{1,2}})?)\s*(?:-|to)\s*{_NUMBER}"), ("price_min", "price_max")),
+    (re.compile(
+        rf"(?:\b(?:under|below|less than|cheaper than|up to|at most|max|maximum|no more than)\s+|<\s*)"
+        rf"{_NUMBER}"
+    ), ("price_max",)),
+    (re.compile(rf"{_NUMBER}\s+or\s+(?:less|under|below|cheaper)\b"), ("price_max",)),
+    (re.compile(
+        rf"(?:\b(?:over|above|more than|at least|min|minimum|from|starting at)\s+|>\s*)"
+        rf"{_NUMBER}"
+    ), ("price_min",)),
+    (re.compile(rf"{_NUMBER}\s+or\s+(?:more|over|above)\b"), ("price_min",)),
+]
+_SIZE_PATTERN = re.compile(r"\bsize\s*(\d{1,2}(?:\.5)?)\b")
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class QueryParser:
+    """Deterministic extractor of product filters from search text"""
+
+    def __init__(self, types: List[str], colors: List[str]):
+        """
+        Build the matchers for the catalog's categories.
+
+        Args:
+            types: Shoe types present in the catalog
+            colors: Colors present in the catalog
+        """
+        self.types = list(types)
+        self.colors = list(colors)
+        self._type_terms = self._terms(types, {})
+        self._color_terms = self._terms(colors, COLOR_SYNONYMS)
+
+    def parse(self, query: str) -> Dict[str, Any]:
+        """
+        Extract filters from a search query.
+
+        Args:
+            query: Natural language search text
+
+        Returns:
+            dict with keys:
+                - filters: type, color, size, price_min and price_max found
+                - confident: True when every word was understood and at least
+                  one filter was found
+                - query_class: Label for metrics, e.g. "color+price_max+type",
+                  or "partial" / "free_text" when not confident
+                - unparsed: Words that were not understood
+        """
+        text = " " + query.lower() + " "
+        filters: Dict[str, Any] = {}
+        ambiguous = False
+
+        # Sizes first, so "size 10 under $100" does not read 10 as a price
+        sizes = _SIZE_PATTERN.findall(text)
+        if sizes:
+            filters["size"] = float(sizes[0])
+            ambiguous |= len(set(sizes)) > 1 or not MIN_SIZE <= filters["size"] <= MAX_SIZE
+            text = _SIZE_PATTERN.sub(" ", text)
+
+        for pattern, bounds in _PRICE_PATTERNS:
+            for match in pattern.finditer(text):
+                for bound, value in zip(bounds, match.groups()):
+                    ambiguous |= bound in filters
+                    filters[bound] = float(value)
+            text = pattern.sub(" ", text)
+
+        if filters.get("price_min", 0) > filters.get("price_max", float("inf")):
+            ambiguous = True
+
+        for field, terms in (("type", self._type_terms), ("color", self._color_terms)):
+            found = set()
+            for term, value in terms:
+                term_pattern = re.compile(rf"\b{re.escape(term)}\b")
+                if term_pattern.search(text):
+                    found.add(value)
+                    text = term_pattern.sub(" ", text)
+            if found:
+                filters[field] = sorted(found)[0]
+                ambiguous |= len(found) > 1
+
+        unparsed = [word for word in _WORD_PATTERN.findall(text) if word not in STOPWORDS]
+        confident = bool(filters) and not unparsed and not ambiguous
+
+        if confident:
+            query_class = "+".join(sorted(filters))
+        else:
+            query_class = "partial" if filters else "free_text"
+
+        return {
+            "filters": filters,
+            "confident": confident,
+            "query_class": query_class,
+            "unparsed": unparsed,
+        }
+
+    @staticmethod
+    def _terms(values: List[str], synonyms: Dict[str, str]) -> List[tuple]:
+        """
+        List (term, value) pairs to look for, longest terms first.
+
+        Each value also matches its singular/plural form ("boot" for "boots").
+        """
+        terms = {}
+        for value in values:
+            lowered = value.lower()
+            terms[lowered] = value
+            if lowered.endswith("s"):
+                terms.setdefault(lowered[:-1], value)
+            else:
+                terms.setdefault(lowered + "s", value)
+        for synonym, value in synonyms.items():
+            if value in values:
+                terms.setdefault(synonym, value)
+        return sorted(terms.items(), key=lambda item: -len(item[0]))
+
+
+def describe_filters(filters: Dict[str, Any]) -> str:
+    """
+    Describe parsed filters in words, e.g. "red running shoes under $100".
+
+    Args:
+        filters: Filters as returned by QueryParser.parse
+
+    Returns:
+        A short noun phrase
+    """
+    words = []
+    if filters.get("color"):
+        words.append(filters["color"])
+    if filters.get("type"):
+        words.append(filters["type"])
+    if filters.get("type") not in FOOTWEAR_TYPES:
+        words.append("shoes")
+
+    if filters.get("size"):
+        words.append(f"in size {filters['size']:g}")
+
+    price_min = filters.get("price_min")
+    price_max = filters.get("price_max")
+    if price_min is not None and price_max is not None:
+        words.append(f"between ${price_min:g} and ${price_max:g}")
+    elif price_max is not None:
+        words.append(f"under ${price_max:g}")
+    elif price_min is not None:
+        words.append(f"over ${price_min:g}")
+
+    return " ".join(words)
+
+
+def fast_path_response(filters: Dict[str, Any], count: int) -> str:
+    """Templated agent_response for a search answered without the agent."""
+    description = describe_filters(filters)
+    if count == 0:
+        return (
+            f"I couldn't find any {description}. "
+            "Try a different color or size, or widen the price range."
+        )
+    if count == 1:
+        return f"I found 1 match for {description}."
+    return f"I found {count} {description} for you."
+
+
+class SearchStats:
+    """Thread-safe counters for search latency and fast path hits per query class"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._classes: Dict[str, Dict[str, float]] = {}
+        self._agent_calls = 0
+        self._agent_seconds = 0.0
+        self._streams = 0
+        self._first_chunk_seconds = 0.0
+
+    def record(self, query_class: str, fast_path: bool, seconds: float):
+        """
+        Record one search.
+
+        Args:
+            query_class: QueryParser query_class, "follow_up" for
+                searches that continue an agent session, or "unparsed"
+                when the catalog was unavailable to the parser
+            fast_path: True if it was answered without the agent
+            seconds: Time spent answering it
+        """
+        with self._lock:
+            stats = self._classes.setdefault(
+                query_class,
+                {"queries": 0, "fast_path_hits": 0, "fast_path_seconds": 0.0, "agent_seconds": 0.0},
+            )
+            stats["queries"] += 1
+            if fast_path:
+                stats["fast_path_hits"] += 1
+                stats["fast_path_seconds"] += seconds
+            else:
+                stats["agent_seconds"] += seconds
+                self._agent_calls += 1
+                self._agent_seconds += seconds
+
+    def record_first_chunk(self, seconds: float):
+        """Record the time until a streamed agent search sent its first text."""
+        with self._lock:
+            self._streams += 1
+            self._first_chunk_seconds += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Summarize hit rate and latency saved per query class.
+
+        Latency saved is estimated against the mean agent latency across all
+        classes, since queries the fast path answers never reach the agent.
+
+        Returns:
+            Dictionary with totals, streamed search time to first chunk,
+            and a 'classes' map
+        """
+        with self._lock:
+            avg_agent = self._agent_seconds / self._agent_calls if self._agent_calls else None
+            classes = {}
+            total_queries = total_hits = 0
+            for query_class, stats in sorted(self._classes.items()):
+                hits = stats["fast_path_hits"]
+                misses = stats["queries"] - hits
+                avg_fast = stats["fast_path_seconds"] / hits if hits else None
+                classes[query_class] = {
+                    "queries": stats["queries"],
+                    "fast_path_hits": hits,
+                    "hit_rate": hits / stats["queries"],
+                    "avg_fast_path_ms": _ms(avg_fast),
+                    "avg_agent_ms": _ms(stats["agent_seconds"] / misses if misses else None),
+                    "latency_saved_ms": _ms(
+                        hits * (avg_agent - avg_fast) if hits and avg_agent is not None else None
+                    ),
+                }
+                total_queries += stats["queries"]
+                total_hits += hits
+
+            return {
+                "queries": total_queries,
+                "fast_path_hits": total_hits,
+                "hit_rate": total_hits / total_queries if total_queries else 0.0,
+                "avg_agent_ms": _ms(avg_agent),
+                "streams": self._streams,
+                "avg_first_chunk_ms": _ms(
+                    self._first_chunk_seconds / self._streams if self._streams else None
+                ),
+                "classes": classes,
+            }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    """Seconds to rounded milliseconds, passing None through."""
+    return None if seconds is None else round(seconds * 1000, 2)
@@ -0,0 +1,141 @@
+"""
+Result cache for agent searches.
+
+Repeated searches ("Red running shoes under $100", "red running shoes under
+100") each cost a full Bedrock Agent invocation. SearchCache keeps agent
+results keyed on a normalized form of the query plus the catalog snapshot's
+content hash, so a catalog change never serves stale products. Without a
+content hash (reads going straight to the table) nothing is cached. Entries
+expire after a TTL and the least recently used entry is evicted when the
+cache is full.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+_THOUSANDS_SEPARATOR = re.compile(r"(?<=\d),(?=\d{3}\b)")
+_CURRENCY_WORD = re.compile(r"(\d)\s*(?:usd|dollars?|bucks)\b")
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_PUNCTUATION = re.compile(r"[^\w\s.]|(?<!\d)\.|\.(?!\d)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Reduce a search query to a canonical form for cache lookups.
+
+    Lowercases, drops currency symbols and words, writes numbers canonically
+    ("1,000.00" -> "1000", "99.50" -> "99.5"), removes punctuation and
+    collapses whitespace.
+
+    Args:
+        query: Search text as typed
+
+    Returns:
+        The normalized query
+    """
+    text = query.lower()
+    text = _THOUSANDS_SEPARATOR.sub("", text)
+    text = text.replace("$", " ")
+    text = _CURRENCY_WORD.sub(r"\1", text)
+    text = _NUMBER.sub(lambda m: format(Decimal(m.group()).normalize(), "f"), text)
+    text = _PUNCTUATION.sub(" ", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class SearchCache:
+    """Thread-safe LRU cache of search results with a TTL"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results
+            ttl_seconds: Seconds a result stays valid; 0 disables the cache
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # (normalized query, catalog version) -> (expires_at, result), oldest first
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        """True when results are cached at all."""
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, query: str, catalog_version: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up the cached result for a query.
+
+        Args:
+            query: Search text as typed
+            catalog_version: Current catalog version; None never hits
+
+        Returns:
+            The cached result, or None on a miss. It is shared and must not be
+            mutated.
+        """
+        if not self.enabled or catalog_version is None:
+            return None
+
+        key = (normalize_query(query), catalog_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+
+            expires_at, result = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.stats["expirations"] += 1
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return result
+
+    def put(self, query: str, catalog_version: Optional[str], result: Dict[str, Any]):
+        """
+        Store the result for a query, evicting the least recently used entry if full.
+
+        Args:
+            query: Search text as typed
+            catalog_version: Catalog version the result was computed against;
+                None stores nothing
+            result: Search result (agent_response and products)
+        """
+        if not self.enabled or catalog_version is None:
+            return
+
+        key = (normalize_query(query), catalog_version)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Report size, settings and hit/miss counters."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                **self.stats,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            }
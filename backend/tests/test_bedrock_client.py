@@ -25,8 +25,8 @@ class TestBedrockClientInitialization:
         assert client._client is None
 
     def test_client_initialization_with_boto3(self):
-        """Test BedrockClient initializes with boto3 in non-mock mode"""
-        with patch('app.bedrock_client.boto3.client') as mock_boto:
+        """Test BedrockClient creates its boto3 client on first use in non-mock mode"""
+        with patch('boto3.client') as mock_boto:
             client = BedrockClient(
                 agent_id="test-agent-id",
                 agent_alias_id="test-alias-id",
@@ -34,6 +34,9 @@ class TestBedrockClientInitialization:
                 mock_mode=False
             )
             assert client.mock_mode is False
+            mock_boto.assert_not_called()
+
+            assert client._client is client._client
             mock_boto.assert_called_once_with(
                 "bedrock-agent-runtime",
                 region_name="us-east-1"
@@ -158,7 +161,7 @@ class TestRealModeWithMockedBoto:
     @pytest.fixture
     def client_with_mocked_boto(self):
         """Create BedrockClient with mocked boto3"""
-        with patch('app.bedrock_client.boto3.client') as mock_boto:
+        with patch('boto3.client') as mock_boto:
             client = BedrockClient(
                 agent_id="test-agent-id",
                 agent_alias_id="test-alias-id",
@@ -215,3 +218,98 @@ class TestRealModeWithMockedBoto:
 
         assert "agent_response" in result
         assert "products" in result
+
+
+class TestStreamAgent:
+    """Test suite for streaming agent output"""
+
+    def test_stream_yields_chunks_as_they_arrive(self):
+        """Test completion chunks and trace products are yielded in order"""
+        with patch('boto3.client') as mock_boto:
+            mock_boto.return_value.invoke_agent.return_value = {"completion": iter([
+                {"chunk": {"bytes": b"Here are "}},
+                {"trace": {"trace": {"orchestrationTrace": {"observation": {
+                    "actionGroupInvocationOutput": {"text": '[{"shoe_id": "s-1"}]'}
+                }}}}},
+                {"chunk": {"bytes": b"your shoes."}},
+            ])}
+            client = BedrockClient(agent_id="a", agent_alias_id="b", mock_mode=False)
+
+            events = list(client.stream_agent("red shoes", session_id="session-1"))
+
+        assert events == [
+            ("text", "Here are "),
+            ("products", [{"shoe_id": "s-1"}]),
+            ("text", "your shoes."),
+            ("done", "session-1"),
+        ]
+
+    def test_invoke_agent_joins_stream(self):
+        """Test invoke_agent assembles the streamed events"""
+        client = BedrockClient(agent_id="a", agent_alias_id="b", mock_mode=True)
+
+        streamed = "".join(
+            data for kind, data in client.stream_agent("running shoes") if kind == "text"
+        )
+
+        assert streamed == client.invoke_agent("running shoes")["agent_response"]
+
+    def test_stream_rejects_empty_query(self):
+        """Test streaming validates the query"""
+        client = BedrockClient(agent_id="a", agent_alias_id="b", mock_mode=True)
+
+        with pytest.raises(ValueError, match="Query cannot be empty"):
+            list(client.stream_agent(" "))
+
+
+class TestCompactAgentResults:
+    """Test suite for hydrating compact action group results"""
+
+    @staticmethod
+    def trace(text):
+        return {"trace": {"trace": {"orchestrationTrace": {"observation": {
+            "actionGroupInvocationOutput": {"text": text}
+        }}}}}
+
+    def test_extract_compact_body(self):
+        """Test the {count, products} body and the legacy list both parse"""
+        compact = '{"count": 1, "products": [{"shoe_id": "s-1", "name": "A"}]}'
+
+        assert BedrockClient._extract_products(self.trace(compact)["trace"]) == [
+            {"shoe_id": "s-1", "name": "A"}
+        ]
+        assert BedrockClient._extract_products(self.trace('[{"shoe_id": "s-1"}]')["trace"]) == [
+            {"shoe_id": "s-1"}
+        ]
+
+    def test_products_hydrated_by_loader(self):
+        """Test compact results are replaced by full products, keeping agent order"""
+        loader = Mock(return_value=[
+            {"shoe_id": "s-2", "name": "B", "description": "full"},
+        ])
+        with patch('boto3.client') as mock_boto:
+            mock_boto.return_value.invoke_agent.return_value = {"completion": iter([
+                self.trace('{"count": 2, "products": [{"shoe_id": "s-1"}, {"shoe_id": "s-2"}]}'),
+            ])}
+            client = BedrockClient(
+                agent_id="a", agent_alias_id="b", mock_mode=False, product_loader=loader
+            )
+
+            result = client.invoke_agent("red shoes")
+
+        loader.assert_called_once_with(["s-1", "s-2"])
+        assert result["products"] == [
+            {"shoe_id": "s-1"},
+            {"shoe_id": "s-2", "name": "B", "description": "full"},
+        ]
+
+    def test_loader_failure_keeps_compact_products(self):
+        """Test a failed lookup falls back to the compact fields"""
+        client = BedrockClient(
+            agent_id="a",
+            agent_alias_id="b",
+            mock_mode=True,
+            product_loader=Mock(side_effect=Exception("throttled")),
+        )
+
+        assert client._hydrate_products([{"shoe_id": "s-1"}]) == [{"shoe_id": "s-1"}]
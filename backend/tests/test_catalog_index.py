@@ -0,0 +1,157 @@
+"""
+Test cases for the columnar catalog index.
+Checks vectorized filtering against the dict-based reference filter.
+"""
+import random
+
+import numpy as np
+import pytest
+
+from app.catalog_index import CatalogIndex, bitmap_to_mask, mask_to_bitmap
+from app.dynamodb_client import DynamoDBClient
+
+TYPES = ["running", "casual", "formal", "athletic", "boots"]
+COLORS = ["red", "blue", "black", "white", "brown"]
+BRANDS = ["Nike", "Adidas", "Clarks", "Puma"]
+SIZES = [6.0, 6.5, 7.0, 7.5, 8.0, 8.5, 9.0, 9.5, 10.0, 10.5, 11.0, 11.5, 12.0, 13.0]
+
+
+def make_catalog(count, seed=7):
+    """Build a reproducible synthetic catalog"""
+    rng = random.Random(seed)
+    return [
+        {
+            "shoe_id": f"shoe-{i}",
+            "brand": rng.choice(BRANDS),
+            "type": rng.choice(TYPES),
+            "color": rng.choice(COLORS),
+            "sizes": sorted(rng.sample(SIZES, rng.randint(1, 6))),
+            "price": round(rng.uniform(30, 250), 2),
+            "rating": round(rng.uniform(3, 5), 1),
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return make_catalog(2000)
+
+
+@pytest.fixture(scope="module")
+def index(catalog):
+    return CatalogIndex(catalog)
+
+
+class TestCatalogIndex:
+    """Test suite for CatalogIndex filtering"""
+
+    @pytest.mark.parametrize("filters", [
+        {},
+        {"type": "running"},
+        {"color": "black", "size": 9.5},
+        {"type": "boots", "color": "brown", "price_max": 120},
+        {"price_min": 75.5, "price_max": 80},
+        {"size": 13},
+        {"type": "running", "color": "red", "size": 10.0, "price_min": 50, "price_max": 200},
+    ])
+    def test_matches_dict_filter(self, catalog, index, filters):
+        """Test vectorized filters return the same products in the same order"""
+        expected = DynamoDBClient._filter_products(catalog, **filters)
+
+        assert index.select(**filters) == expected
+
+    def test_unknown_values_match_nothing(self, index):
+        """Test filtering on values absent from the catalog"""
+        assert index.select(type="sandals") == []
+        assert index.select(size=15) == []
+
+    def test_brand_filter(self, catalog, index):
+        """Test the brand column"""
+        assert index.select(brand="Puma") == [p for p in catalog if p["brand"] == "Puma"]
+
+    def test_count_and_facets_use_bitmaps(self, catalog, index):
+        """Test counts and facet counts agree with the selected products"""
+        filters = {"type": "running", "size": 9.0, "price_max": 150}
+        selected = index.select(**filters)
+
+        facets = index.facet_counts(**filters)
+
+        assert index.count(**filters) == facets["total"] == len(selected)
+        assert facets["types"] == {"running": len(selected)}
+        assert sum(facets["colors"].values()) == len(selected)
+        assert facets["sizes"][9.0] == len(selected)
+        for size, count in facets["sizes"].items():
+            assert count == sum(1 for p in selected if size in p["sizes"])
+
+    @pytest.mark.parametrize("sort_by,descending", [
+        ("price", False), ("price", True), ("rating", True), ("rating", False),
+    ])
+    @pytest.mark.parametrize("filters", [{}, {"color": "red"}, {"type": "formal", "size": 8.0}])
+    def test_sorted_top_k_matches_python_sort(self, catalog, index, sort_by, descending, filters):
+        """Test top-k agrees with a stable sort of the filtered products"""
+        sign = -1 if descending else 1
+        expected = sorted(
+            DynamoDBClient._filter_products(catalog, **filters),
+            key=lambda p: sign * p[sort_by],
+        )
+
+        for k in (1, 10, 57, None):
+            selected = index.select(sort_by=sort_by, descending=descending, limit=k, **filters)
+            assert selected == expected[:k]
+
+    @pytest.mark.parametrize("filters", [{}, {"type": "running"}])
+    @pytest.mark.parametrize("k", [0, -1])
+    def test_non_positive_k_selects_nothing(self, index, filters, k):
+        """Test k or limit of 0 or less returns no products, with or without filters"""
+        assert len(index.top_k("price", k=k, **filters)) == 0
+        assert index.select(sort_by="rating", limit=k, **filters) == []
+        assert index.select(limit=k, **filters) == []
+
+    def test_sort_defaults_and_missing_values(self):
+        """Test default directions and that unrated products come last"""
+        index = CatalogIndex([
+            {"shoe_id": "a", "price": 30, "rating": 4.0},
+            {"shoe_id": "b", "price": 10},
+            {"shoe_id": "c", "price": 20, "rating": 4.5},
+        ])
+
+        assert [p["shoe_id"] for p in index.select(sort_by="rating")] == ["c", "a", "b"]
+        assert [p["shoe_id"] for p in index.select(sort_by="price")] == ["b", "c", "a"]
+        with pytest.raises(ValueError):
+            index.select(sort_by="name")
+
+    def test_price_range_binary_search(self, catalog, index):
+        """Test price bounds are inclusive on both ends"""
+        price = catalog[0]["price"]
+
+        selected = index.select(price_min=price, price_max=price)
+
+        assert catalog[0] in selected
+        assert all(p["price"] == price for p in selected)
+
+    def test_bitmap_round_trip(self):
+        """Test masks survive conversion to bitmaps and back"""
+        mask = np.array([True, False, False, True, True, False, False, False, False, True])
+
+        assert mask_to_bitmap(mask) == 0b1000011001
+        assert bitmap_to_mask(mask_to_bitmap(mask), len(mask)).tolist() == mask.tolist()
+
+    def test_missing_attributes(self):
+        """Test products without optional attributes are indexed"""
+        index = CatalogIndex([
+            {"shoe_id": "a", "type": "running", "price": 50},
+            {"shoe_id": "b", "sizes": [9]},
+        ])
+
+        assert [p["shoe_id"] for p in index.select(type="running")] == ["a"]
+        assert [p["shoe_id"] for p in index.select(size=9)] == ["b"]
+        assert [p["shoe_id"] for p in index.select(price_max=100)] == ["a"]
+
+    def test_empty_catalog(self):
+        """Test an empty catalog builds and filters"""
+        index = CatalogIndex([])
+
+        assert len(index) == 0
+        assert index.select(type="running", size=9) == []
+        assert index.facet_counts()["total"] == 0
@@ -5,7 +5,15 @@ Tests both mock mode and mocked boto3 interactions.
 import pytest
 from unittest.mock import patch, MagicMock
 from decimal import Decimal
-from app.dynamodb_client import DynamoDBClient
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+from app.dynamodb_client import INDEX_LOOKUP_RETRY_SECONDS, DynamoDBClient
+
+
+def to_wire(items):
+    """Encode items the way the low-level DynamoDB client returns them"""
+    serializer = TypeSerializer()
+    return [{k: serializer.serialize(v) for k, v in item.items()} for item in items]
 
 
 class TestDynamoDBClientInitialization:
@@ -21,17 +29,20 @@ class TestDynamoDBClientInitialization:
         assert client.table_name == "ShoeInventory"
         assert client.region == "us-east-1"
         assert client.mock_mode is True
-        assert client._table is None
+        assert client._client is None
 
     def test_client_initialization_with_boto3(self):
-        """Test DynamoDBClient initializes with boto3 in non-mock mode"""
-        with patch('app.dynamodb_client.boto3.resource') as mock_boto:
+        """Test DynamoDBClient creates its boto3 client on first use in non-mock mode"""
+        with patch('boto3.client') as mock_boto:
             client = DynamoDBClient(
                 table_name="ShoeInventory",
                 region="us-east-1",
                 mock_mode=False
             )
             assert client.mock_mode is False
+            mock_boto.assert_not_called()
+
+            assert client._client is client._client
             mock_boto.assert_called_once_with("dynamodb", region_name="us-east-1")
 
     def test_client_uses_default_region(self):
@@ -150,56 +161,55 @@ class TestRealModeWithMockedBoto:
     @pytest.fixture
     def client_with_mocked_boto(self):
         """Create DynamoDBClient with mocked boto3"""
-        with patch('app.dynamodb_client.boto3.resource') as mock_boto:
-            mock_table = MagicMock()
-            mock_boto.return_value.Table.return_value = mock_table
+        with patch('boto3.client') as mock_boto:
+            mock_dynamodb = mock_boto.return_value
             client = DynamoDBClient(
                 table_name="ShoeInventory",
                 region="us-east-1",
                 mock_mode=False
             )
-            yield client, mock_table
+            yield client, mock_dynamodb
 
     def test_get_all_products_real(self, client_with_mocked_boto):
         """Test get_all_products calls DynamoDB scan"""
-        client, mock_table = client_with_mocked_boto
+        client, mock_dynamodb = client_with_mocked_boto
 
         mock_items = [
             {"shoe_id": "1", "name": "Nike Air", "type": "running", "price": Decimal("99.99")},
             {"shoe_id": "2", "name": "Adidas Ultra", "type": "running", "price": Decimal("120.00")}
         ]
-        mock_table.scan.return_value = {"Items": mock_items}
+        mock_dynamodb.scan.return_value = {"Items": to_wire(mock_items)}
 
         products = client.get_all_products()
 
-        mock_table.scan.assert_called()
+        mock_dynamodb.scan.assert_called()
         assert len(products) == 2
         # Verify Decimal was converted to float
         assert isinstance(products[0]["price"], float)
 
     def test_get_all_products_pagination(self, client_with_mocked_boto):
         """Test get_all_products handles pagination"""
-        client, mock_table = client_with_mocked_boto
+        client, mock_dynamodb = client_with_mocked_boto
 
         # Simulate pagination
-        mock_table.scan.side_effect = [
+        mock_dynamodb.scan.side_effect = [
             {
-                "Items": [{"shoe_id": "1", "name": "Shoe 1", "price": Decimal("50")}],
-                "LastEvaluatedKey": {"shoe_id": "1"}
+                "Items": to_wire([{"shoe_id": "1", "name": "Shoe 1", "price": Decimal("50")}]),
+                "LastEvaluatedKey": {"shoe_id": {"S": "1"}}
             },
             {
-                "Items": [{"shoe_id": "2", "name": "Shoe 2", "price": Decimal("60")}]
+                "Items": to_wire([{"shoe_id": "2", "name": "Shoe 2", "price": Decimal("60")}])
             }
         ]
 
         products = client.get_all_products()
 
-        assert mock_table.scan.call_count == 2
+        assert mock_dynamodb.scan.call_count == 2
         assert len(products) == 2
 
     def test_get_product_by_id_real(self, client_with_mocked_boto):
         """Test get_product_by_id calls DynamoDB get_item"""
-        client, mock_table = client_with_mocked_boto
+        client, mock_dynamodb = client_with_mocked_boto
 
         mock_item = {
             "shoe_id": "test-123",
@@ -207,19 +217,21 @@ class TestRealModeWithMockedBoto:
             "brand": "Nike",
             "price": Decimal("99.99")
         }
-        mock_table.get_item.return_value = {"Item": mock_item}
+        mock_dynamodb.get_item.return_value = {"Item": to_wire([mock_item])[0]}
 
         product = client.get_product_by_id("test-123")
 
-        mock_table.get_item.assert_called_with(Key={"shoe_id": "test-123"})
+        mock_dynamodb.get_item.assert_called_with(
+            TableName="ShoeInventory", Key={"shoe_id": {"S": "test-123"}}
+        )
         assert product is not None
         assert product["shoe_id"] == "test-123"
 
     def test_get_product_by_id_not_found_real(self, client_with_mocked_boto):
         """Test get_product_by_id returns None for missing item"""
-        client, mock_table = client_with_mocked_boto
+        client, mock_dynamodb = client_with_mocked_boto
 
-        mock_table.get_item.return_value = {}
+        mock_dynamodb.get_item.return_value = {}
 
         product = client.get_product_by_id("nonexistent-id")
 
@@ -227,38 +239,38 @@ class TestRealModeWithMockedBoto:
 
     def test_get_products_by_filters_real(self, client_with_mocked_boto):
         """Test get_products_by_filters applies filter expressions"""
-        client, mock_table = client_with_mocked_boto
+        client, mock_dynamodb = client_with_mocked_boto
 
         mock_items = [
             {"shoe_id": "1", "name": "Nike Air", "type": "running", "color": "red", "price": Decimal("85.00")}
         ]
-        mock_table.scan.return_value = {"Items": mock_items}
+        mock_dynamodb.scan.return_value = {"Items": to_wire(mock_items)}
 
         products = client.get_products_by_filters(type="running", color="red")
 
-        mock_table.scan.assert_called()
+        mock_dynamodb.scan.assert_called()
         # Verify filter was applied
-        call_kwargs = mock_table.scan.call_args[1]
+        call_kwargs = mock_dynamodb.scan.call_args[1]
         assert "FilterExpression" in call_kwargs
 
     def test_get_featured_products_real(self, client_with_mocked_boto):
         """Test get_featured_products filters by featured=True"""
-        client, mock_table = client_with_mocked_boto
+        client, mock_dynamodb = client_with_mocked_boto
 
         mock_items = [
             {"shoe_id": "1", "name": "Featured Shoe", "featured": True, "price": Decimal("99.99")}
         ]
-        mock_table.scan.return_value = {"Items": mock_items}
+        mock_dynamodb.scan.return_value = {"Items": to_wire(mock_items)}
 
         products = client.get_featured_products()
 
-        mock_table.scan.assert_called()
-        call_kwargs = mock_table.scan.call_args[1]
+        mock_dynamodb.scan.assert_called()
+        call_kwargs = mock_dynamodb.scan.call_args[1]
         assert "FilterExpression" in call_kwargs
 
     def test_get_categories_real(self, client_with_mocked_boto):
         """Test get_categories extracts unique types and colors"""
-        client, mock_table = client_with_mocked_boto
+        client, mock_dynamodb = client_with_mocked_boto
 
         mock_items = [
             {"shoe_id": "1", "type": "running", "color": "red"},
@@ -266,7 +278,7 @@ class TestRealModeWithMockedBoto:
             {"shoe_id": "3", "type": "running", "color": "black"},
             {"shoe_id": "4", "type": "formal", "color": "brown"}
         ]
-        mock_table.scan.return_value = {"Items": mock_items}
+        mock_dynamodb.scan.return_value = {"Items": to_wire(mock_items)}
 
         categories = client.get_categories()
 
@@ -283,19 +295,18 @@ class TestDecimalConversion:
     @pytest.fixture
     def client_with_mocked_boto(self):
         """Create DynamoDBClient with mocked boto3"""
-        with patch('app.dynamodb_client.boto3.resource') as mock_boto:
-            mock_table = MagicMock()
-            mock_boto.return_value.Table.return_value = mock_table
+        with patch('boto3.client') as mock_boto:
+            mock_dynamodb = mock_boto.return_value
             client = DynamoDBClient(
                 table_name="ShoeInventory",
                 region="us-east-1",
                 mock_mode=False
             )
-            yield client, mock_table
+            yield client, mock_dynamodb
 
     def test_decimal_conversion(self, client_with_mocked_boto):
         """Test that Decimal values are converted to float"""
-        client, mock_table = client_with_mocked_boto
+        client, mock_dynamodb = client_with_mocked_boto
 
         mock_items = [
             {
@@ -305,7 +316,7 @@ class TestDecimalConversion:
                 "rating": Decimal("4.5")
             }
         ]
-        mock_table.scan.return_value = {"Items": mock_items}
+        mock_dynamodb.scan.return_value = {"Items": to_wire(mock_items)}
 
         products = client.get_all_products()
 
@@ -321,30 +332,924 @@ class TestErrorHandling:
     @pytest.fixture
     def client_with_mocked_boto(self):
         """Create DynamoDBClient with mocked boto3"""
-        with patch('app.dynamodb_client.boto3.resource') as mock_boto:
-            mock_table = MagicMock()
-            mock_boto.return_value.Table.return_value = mock_table
+        with patch('boto3.client') as mock_boto:
+            mock_dynamodb = mock_boto.return_value
             client = DynamoDBClient(
                 table_name="ShoeInventory",
                 region="us-east-1",
                 mock_mode=False
             )
-            yield client, mock_table
+            yield client, mock_dynamodb
 
     def test_get_all_products_handles_error(self, client_with_mocked_boto):
         """Test get_all_products raises exception on error"""
-        client, mock_table = client_with_mocked_boto
+        client, mock_dynamodb = client_with_mocked_boto
 
-        mock_table.scan.side_effect = Exception("DynamoDB error")
+        mock_dynamodb.scan.side_effect = Exception("DynamoDB error")
 
         with pytest.raises(Exception, match="Error retrieving products"):
             client.get_all_products()
 
     def test_get_product_by_id_handles_error(self, client_with_mocked_boto):
         """Test get_product_by_id raises exception on error"""
-        client, mock_table = client_with_mocked_boto
+        client, mock_dynamodb = client_with_mocked_boto
 
-        mock_table.get_item.side_effect = Exception("DynamoDB error")
+        mock_dynamodb.get_item.side_effect = Exception("DynamoDB error")
 
         with pytest.raises(Exception, match="Error retrieving product"):
             client.get_product_by_id("test-id")
+
+
+class TestCatalogSnapshotCache:
+    """Test suite for the in-process catalog snapshot cache"""
+
+    @pytest.fixture
+    def cached_client(self):
+        """Create DynamoDBClient with mocked boto3 and the snapshot cache enabled"""
+        with patch('boto3.client') as mock_boto:
+            mock_dynamodb = mock_boto.return_value
+            mock_dynamodb.scan.return_value = {
+                "Items": to_wire([
+                    {"shoe_id": "1", "type": "running", "color": "red",
+                     "sizes": [Decimal("9"), Decimal("10")], "price": Decimal("80"), "featured": True},
+                    {"shoe_id": "2", "type": "casual", "color": "blue",
+                     "sizes": [Decimal("10")], "price": Decimal("120"), "featured": False},
+                ])
+            }
+            client = DynamoDBClient(
+                table_name="ShoeInventory",
+                region="us-east-1",
+                mock_mode=False,
+                cache_ttl_seconds=60,
+            )
+            yield client, mock_dynamodb
+
+    def test_featured_lists_built_with_snapshot(self):
+        """Test featured products come from lists built once per snapshot load"""
+        with patch('boto3.client') as mock_boto:
+            mock_boto.return_value.scan.return_value = {"Items": to_wire([
+                {"shoe_id": "1", "featured": True, "rating": Decimal("4.1")},
+                {"shoe_id": "2", "featured": False, "rating": Decimal("4.9")},
+                {"shoe_id": "3", "featured": True, "rating": Decimal("4.7")},
+            ])}
+            client = DynamoDBClient(table_name="ShoeInventory", cache_ttl_seconds=60)
+
+            with patch.object(
+                DynamoDBClient, "_featured_by_rating", wraps=DynamoDBClient._featured_by_rating
+            ) as build:
+                featured = client.get_featured_products()
+                top = client.get_featured_products(limit=1)
+
+        assert [p["shoe_id"] for p in featured] == ["3", "1"]
+        assert [p["shoe_id"] for p in top] == ["3"]
+        assert build.call_count == 1
+
+    def test_content_version_only_from_hashed_catalogs(self, cached_client):
+        """Test the content version is the snapshot hash, and None for table reads"""
+        client, mock_dynamodb = cached_client
+        assert client.get_content_version() == client.get_catalog_version()
+        assert client.get_content_version() is not None
+
+        mock_dynamodb.get_item.return_value = {"Item": to_wire([{"version": "meta-v1"}])[0]}
+        table_client = DynamoDBClient(table_name="ShoeInventory")
+        assert table_client.get_catalog_version() == "meta-v1"
+        assert table_client.get_content_version() is None
+
+    def test_cache_disabled_by_default(self):
+        """Test the snapshot cache is opt-in"""
+        client = DynamoDBClient(table_name="ShoeInventory", mock_mode=True)
+        assert client.cache_enabled is False
+
+    def test_read_methods_share_one_scan(self, cached_client):
+        """Test every read method is answered from a single table scan"""
+        client, mock_dynamodb = cached_client
+
+        assert len(client.get_all_products()) == 2
+        assert [p["shoe_id"] for p in client.get_products_by_filters(type="running")] == ["1"]
+        assert [p["shoe_id"] for p in client.get_featured_products()] == ["1"]
+        assert client.get_categories() == {"types": ["casual", "running"], "colors": ["blue", "red"]}
+        assert client.get_product_by_id("2")["price"] == 120.0
+
+        assert mock_dynamodb.scan.call_count == 1
+        assert client.cache_stats["misses"] == 1
+        assert client.cache_stats["hits"] == 4
+
+    def test_filters_applied_in_memory(self, cached_client):
+        """Test filters on the snapshot match the scan filter semantics"""
+        client, _ = cached_client
+
+        assert [p["shoe_id"] for p in client.get_products_by_filters(size=9.0)] == ["1"]
+        assert [p["shoe_id"] for p in client.get_products_by_filters(price_min=100)] == ["2"]
+        assert client.get_products_by_filters(color="red", price_max=50) == []
+
+    def test_snapshot_expires_after_ttl(self, cached_client):
+        """Test the table is re-read once the TTL has elapsed"""
+        client, mock_dynamodb = cached_client
+
+        with patch('app.dynamodb_client.time.monotonic', return_value=1000.0):
+            client.get_all_products()
+        with patch('app.dynamodb_client.time.monotonic', return_value=1030.0):
+            client.get_all_products()
+        assert mock_dynamodb.scan.call_count == 1
+
+        with patch('app.dynamodb_client.time.monotonic', return_value=1061.0):
+            client.get_all_products()
+        assert mock_dynamodb.scan.call_count == 2
+
+    def test_invalidate_cache(self, cached_client):
+        """Test explicit invalidation forces a reload"""
+        client, mock_dynamodb = cached_client
+
+        client.get_all_products()
+        assert client.invalidate_cache() is True
+        assert client.catalog_version is None
+        client.get_all_products()
+
+        assert mock_dynamodb.scan.call_count == 2
+        assert client.cache_stats["invalidations"] == 1
+
+    def test_versioned_invalidation_keeps_current_snapshot(self, cached_client):
+        """Test invalidating with the loaded version is a no-op"""
+        client, mock_dynamodb = cached_client
+
+        client.get_all_products()
+        version = client.catalog_version
+
+        assert version is not None
+        assert client.invalidate_cache(version=version) is False
+        assert client.invalidate_cache(version="stale-version") is True
+        client.get_all_products()
+        assert client.catalog_version == version
+        assert mock_dynamodb.scan.call_count == 2
+
+
+class TestParallelScan:
+    """Test suite for segmented parallel scans"""
+
+    @pytest.fixture
+    def moto_table(self):
+        """Create a moto-backed ShoeInventory table with 120 items"""
+        import boto3
+        from moto import mock_aws
+
+        with mock_aws():
+            dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
+            table = dynamodb.create_table(
+                TableName="ShoeInventory",
+                KeySchema=[{"AttributeName": "shoe_id", "KeyType": "HASH"}],
+                AttributeDefinitions=[{"AttributeName": "shoe_id", "AttributeType": "S"}],
+                BillingMode="PAY_PER_REQUEST",
+            )
+            with table.batch_writer() as batch:
+                for i in range(120):
+                    batch.put_item(Item={
+                        "shoe_id": f"shoe-{i:03d}",
+                        "type": "running" if i % 2 else "casual",
+                        "price": Decimal(50 + i),
+                    })
+            yield table
+
+    def test_parallel_scan_matches_sequential(self, moto_table):
+        """Test a 4-segment scan returns the same items as a page-by-page scan"""
+        sequential = DynamoDBClient(table_name="ShoeInventory", scan_segments=1)
+        parallel = DynamoDBClient(table_name="ShoeInventory", scan_segments=4)
+
+        expected = sorted(p["shoe_id"] for p in sequential.get_all_products())
+        actual = sorted(p["shoe_id"] for p in parallel.get_all_products())
+
+        assert len(actual) == 120
+        assert actual == expected
+
+    def test_parallel_scan_applies_filters(self, moto_table):
+        """Test filtered scans are split across segments too"""
+        client = DynamoDBClient(table_name="ShoeInventory", scan_segments=3)
+
+        products = client.get_products_by_filters(type="running")
+
+        assert len(products) == 60
+        assert all(p["type"] == "running" for p in products)
+
+    def test_segments_passed_to_scan(self):
+        """Test each segment scan carries Segment and TotalSegments"""
+        with patch('boto3.client') as mock_boto:
+            mock_dynamodb = mock_boto.return_value
+            mock_dynamodb.scan.return_value = {"Items": to_wire([{"shoe_id": "1"}])}
+            client = DynamoDBClient(table_name="ShoeInventory", scan_segments=4)
+
+            products = client.get_all_products()
+
+        segments = sorted(call.kwargs["Segment"] for call in mock_dynamodb.scan.call_args_list)
+        assert segments == [0, 1, 2, 3]
+        assert all(call.kwargs["TotalSegments"] == 4 for call in mock_dynamodb.scan.call_args_list)
+        assert len(products) == 4
+
+    def test_segment_count_derived_from_table_size(self):
+        """Test scan_segments=0 sizes the scan from DescribeTable"""
+        with patch('boto3.client') as mock_boto:
+            mock_dynamodb = mock_boto.return_value
+            mock_dynamodb.describe_table.return_value = {
+                "Table": {"TableSizeBytes": 10 * 1024 * 1024}
+            }
+            client = DynamoDBClient(table_name="ShoeInventory", scan_segments=0)
+
+            assert client._resolve_scan_segments() == 3
+
+            mock_dynamodb.describe_table.return_value = {"Table": {"TableSizeBytes": 0}}
+            small = DynamoDBClient(table_name="ShoeInventory", scan_segments=0)
+            assert small._resolve_scan_segments() == 1
+
+
+def create_indexed_table(dynamodb, items):
+    """Create ShoeInventory with the planner's GSIs and load items into it"""
+    indexes = [("type-price-index", "type", "price"), ("color-price-index", "color", "price"),
+               ("type_color-price-index", "type_color", "price"),
+               ("featured-rating-index", "featured_key", "rating")]
+    table = dynamodb.create_table(
+        TableName="ShoeInventory",
+        KeySchema=[{"AttributeName": "shoe_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": name, "AttributeType": "S"}
+            for name in ["shoe_id", "type", "color", "type_color", "featured_key"]
+        ] + [
+            {"AttributeName": name, "AttributeType": "N"} for name in ["price", "rating"]
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": index_name,
+                "KeySchema": [
+                    {"AttributeName": hash_key, "KeyType": "HASH"},
+                    {"AttributeName": range_key, "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+            for index_name, hash_key, range_key in indexes
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    with table.batch_writer() as batch:
+        for item in items:
+            batch.put_item(Item=item)
+    return table
+
+
+class TestQueryPlanner:
+    """Test suite for the GSI-aware filter query planner"""
+
+    TYPES = ["running", "casual", "formal", "boots"]
+    COLORS = ["red", "blue", "black"]
+
+    @pytest.fixture
+    def indexed_client(self):
+        """Create a moto table with GSIs and 96 items"""
+        import boto3
+        from moto import mock_aws
+
+        items = []
+        for i in range(96):
+            shoe_type = self.TYPES[i % 4]
+            color = self.COLORS[i % 3]
+            items.append({
+                "shoe_id": f"shoe-{i:03d}",
+                "type": shoe_type,
+                "color": color,
+                "type_color": f"{shoe_type}#{color}",
+                "sizes": [Decimal("9"), Decimal("10")] if i % 2 else [Decimal("11")],
+                "price": Decimal(50 + i),
+            })
+
+        with mock_aws():
+            create_indexed_table(boto3.resource("dynamodb", region_name="us-east-1"), items)
+            yield DynamoDBClient(table_name="ShoeInventory")
+
+    def test_plan_uses_type_color_index(self, indexed_client):
+        """Test type and color together pick the composite index"""
+        plan = indexed_client.plan_products_query(type="running", color="red", price_max=100)
+
+        assert plan["operation"] == "Query"
+        assert plan["index"] == "type_color-price-index"
+        assert plan["key_conditions"] == ["type_color = running#red", "price <= 100"]
+        assert plan["filters"] == []
+
+    def test_plan_uses_single_attribute_index(self, indexed_client):
+        """Test a single pinned attribute picks its index and filters the rest"""
+        plan = indexed_client.plan_products_query(color="blue", size=10.0)
+
+        assert plan["operation"] == "Query"
+        assert plan["index"] == "color-price-index"
+        assert plan["filters"] == ["sizes contains 10.0"]
+
+    def test_plan_falls_back_to_scan(self, indexed_client):
+        """Test filters without an indexed attribute still scan"""
+        plan = indexed_client.plan_products_query(price_min=60, price_max=80)
+
+        assert plan["operation"] == "Scan"
+        assert plan["index"] is None
+        assert plan["filters"] == ["price >= 60", "price <= 80"]
+
+    def test_query_results_match_scan(self, indexed_client):
+        """Test index queries return the same products as a filtered scan"""
+        filters = dict(type="formal", color="black", price_min=60, price_max=140)
+        products = indexed_client.get_products_by_filters(**filters)
+
+        scan_client = DynamoDBClient(table_name="ShoeInventory")
+        scan_client._index_names = set()
+        expected = scan_client.get_products_by_filters(**filters)
+
+        assert sorted(p["shoe_id"] for p in products) == sorted(p["shoe_id"] for p in expected)
+        assert len(products) > 0
+        assert [p["price"] for p in products] == sorted(p["price"] for p in products)
+
+    def test_explain_reports_items_read(self, indexed_client):
+        """Test explain reports fewer items read for an index query than a scan"""
+        query = indexed_client.explain_products_by_filters(type="running", color="red")
+
+        indexed_client._index_names = set()
+        scan = indexed_client.explain_products_by_filters(type="running", color="red")
+
+        assert query["operation"] == "Query"
+        assert query["items_read"] == query["items_returned"] == 8
+        assert scan["operation"] == "Scan"
+        assert scan["items_read"] == 96
+        assert scan["items_returned"] == 8
+        assert "request" not in query
+
+    def test_no_indexes_on_mocked_table(self):
+        """Test the planner scans when DescribeTable reports no indexes"""
+        with patch('boto3.client') as mock_boto:
+            mock_dynamodb = mock_boto.return_value
+            mock_dynamodb.describe_table.return_value = {"Table": {}}
+            client = DynamoDBClient(table_name="ShoeInventory")
+
+            assert client.plan_products_query(type="running")["operation"] == "Scan"
+
+    def test_failed_index_lookup_is_retried(self):
+        """Test a failed DescribeTable falls back to scans only until the retry delay passes"""
+        with patch('boto3.client') as mock_boto, \
+             patch('app.dynamodb_client.time.monotonic') as monotonic:
+            mock_dynamodb = mock_boto.return_value
+            mock_dynamodb.describe_table.side_effect = [
+                ClientError({"Error": {"Code": "ThrottlingException"}}, "DescribeTable"),
+                {"Table": {"GlobalSecondaryIndexes": [{"IndexName": "type-price-index"}]}},
+            ]
+            client = DynamoDBClient(table_name="ShoeInventory")
+
+            monotonic.return_value = 100.0
+            assert client.plan_products_query(type="running")["operation"] == "Scan"
+            assert client.plan_products_query(type="running")["operation"] == "Scan"
+            assert mock_dynamodb.describe_table.call_count == 1
+
+            monotonic.return_value = 100.0 + INDEX_LOOKUP_RETRY_SECONDS
+            assert client.plan_products_query(type="running")["index"] == "type-price-index"
+            assert mock_dynamodb.describe_table.call_count == 2
+
+
+class TestPagination:
+    """Test suite for cursor-based pagination"""
+
+    @pytest.fixture
+    def moto_client(self):
+        """Create a moto table with GSIs and 30 items"""
+        import boto3
+        from moto import mock_aws
+
+        items = [
+            {
+                "shoe_id": f"shoe-{i:02d}",
+                "type": "running" if i % 2 else "casual",
+                "color": "red",
+                "type_color": f"{'running' if i % 2 else 'casual'}#red",
+                "price": Decimal(50 + i),
+            }
+            for i in range(30)
+        ]
+        with mock_aws():
+            create_indexed_table(boto3.resource("dynamodb", region_name="us-east-1"), items)
+            yield DynamoDBClient(table_name="ShoeInventory")
+
+    @staticmethod
+    def read_all_pages(client, limit, **filters):
+        pages = []
+        cursor = None
+        while True:
+            page, cursor = client.get_products_page(limit=limit, cursor=cursor, **filters)
+            pages.append(page)
+            if cursor is None:
+                return pages
+
+    def test_mock_mode_pages(self):
+        """Test paging through mock products by offset"""
+        client = DynamoDBClient(table_name="ShoeInventory", mock_mode=True)
+
+        pages = self.read_all_pages(client, limit=3)
+
+        assert [len(page) for page in pages] == [3, 1]
+        assert [p["shoe_id"] for page in pages for p in page] == \
+            [p["shoe_id"] for p in client.get_all_products()]
+
+    def test_scan_pages_cover_table(self, moto_client):
+        """Test scan pages read the whole table without duplicates"""
+        pages = self.read_all_pages(moto_client, limit=7)
+
+        ids = [p["shoe_id"] for page in pages for p in page]
+        assert all(len(page) <= 7 for page in pages)
+        assert sorted(ids) == [f"shoe-{i:02d}" for i in range(30)]
+
+    def test_index_query_pages(self, moto_client):
+        """Test paging a filtered request served by a GSI query"""
+        pages = self.read_all_pages(moto_client, limit=4, type="running", color="red")
+
+        prices = [p["price"] for page in pages for p in page]
+        assert len(prices) == 15
+        assert prices == sorted(prices)
+
+    def test_cursor_rejected_for_other_filters(self, moto_client):
+        """Test a cursor from one plan cannot resume a different plan"""
+        _, cursor = moto_client.get_products_page(limit=5, type="running")
+
+        with pytest.raises(ValueError):
+            moto_client.get_products_page(limit=5, cursor=cursor, color="red")
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors raise ValueError"""
+        client = DynamoDBClient(table_name="ShoeInventory", mock_mode=True)
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            client.get_products_page(limit=2, cursor="not-a-cursor")
+
+    @pytest.mark.parametrize("key", [
+        {"shoe_id": {"X": "1"}},
+        {"other": {"S": "1"}},
+        {"shoe_id": {"S": 1}},
+        {"shoe_id": {"S": "1", "N": "1"}},
+        {"shoe_id": {"S": "1"}, "type": {"S": "running"}},
+    ])
+    def test_forged_cursor_key_rejected(self, moto_client, key):
+        """Test cursor keys that do not fit the index raise ValueError before reading"""
+        cursor = DynamoDBClient._encode_cursor({"k": key, "i": None})
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            moto_client.get_products_page(limit=5, cursor=cursor)
+
+    def test_cursor_key_with_invalid_number_rejected(self, moto_client):
+        """Test a key number that does not parse raises ValueError"""
+        _, cursor = moto_client.get_products_page(limit=5, type="running")
+        position = DynamoDBClient._decode_cursor(cursor)
+        position["k"]["price"] = {"N": "not-a-number"}
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            moto_client.get_products_page(
+                limit=5, cursor=DynamoDBClient._encode_cursor(position), type="running"
+            )
+
+    def test_cursor_key_rejected_by_dynamodb(self):
+        """Test a ValidationException for a cursor's start key becomes ValueError"""
+        with patch('boto3.client') as mock_boto:
+            mock_dynamodb = mock_boto.return_value
+            mock_dynamodb.describe_table.return_value = {"Table": {}}
+            mock_dynamodb.scan.side_effect = ClientError(
+                {"Error": {"Code": "ValidationException", "Message": "bad key"}}, "Scan"
+            )
+            client = DynamoDBClient(table_name="ShoeInventory")
+            cursor = DynamoDBClient._encode_cursor({"k": {"shoe_id": {"S": "1"}}, "i": None})
+
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                client.get_products_page(limit=5, cursor=cursor)
+            with pytest.raises(Exception, match="DynamoDB error"):
+                client.get_products_page(limit=5)
+
+    def test_snapshot_cursor_tied_to_catalog_version(self):
+        """Test snapshot cursors expire when the catalog contents change"""
+        client = DynamoDBClient(table_name="ShoeInventory", mock_mode=True, cache_ttl_seconds=60)
+        _, cursor = client.get_products_page(limit=2)
+
+        client._snapshot_version = "other-version"
+
+        with pytest.raises(ValueError, match="no longer valid"):
+            client.get_products_page(limit=2, cursor=cursor)
+
+
+class TestBatchGet:
+    """Test suite for BatchGetItem product lookups"""
+
+    @pytest.fixture
+    def client_with_mocked_boto(self):
+        """Create DynamoDBClient with a mocked boto3 client"""
+        with patch('boto3.client') as mock_boto:
+            mock_dynamodb = mock_boto.return_value
+            client = DynamoDBClient(table_name="ShoeInventory", mock_mode=False)
+            yield client, mock_dynamodb
+
+    def test_keeps_input_order_and_skips_missing(self, client_with_mocked_boto):
+        """Test results follow request order and unknown IDs are dropped"""
+        client, mock_dynamodb = client_with_mocked_boto
+        mock_dynamodb.batch_get_item.return_value = {
+            "Responses": {"ShoeInventory": to_wire([
+                {"shoe_id": "b", "price": Decimal("20")},
+                {"shoe_id": "a", "price": Decimal("10")},
+            ])},
+            "UnprocessedKeys": {},
+        }
+
+        products = client.get_products_by_ids(["a", "missing", "b", "a"])
+
+        assert [p["shoe_id"] for p in products] == ["a", "b"]
+        assert products[0]["price"] == 10.0
+        keys = mock_dynamodb.batch_get_item.call_args.kwargs["RequestItems"]["ShoeInventory"]["Keys"]
+        assert keys == [
+            {"shoe_id": {"S": "a"}}, {"shoe_id": {"S": "missing"}}, {"shoe_id": {"S": "b"}}
+        ]
+
+    def test_chunks_into_groups_of_100(self, client_with_mocked_boto):
+        """Test more than 100 IDs are split across BatchGetItem calls"""
+        client, mock_dynamodb = client_with_mocked_boto
+        mock_dynamodb.batch_get_item.return_value = {"Responses": {"ShoeInventory": []}}
+
+        client.get_products_by_ids([f"id-{i}" for i in range(250)])
+
+        sizes = [
+            len(call.kwargs["RequestItems"]["ShoeInventory"]["Keys"])
+            for call in mock_dynamodb.batch_get_item.call_args_list
+        ]
+        assert sizes == [100, 100, 50]
+
+    def test_retries_unprocessed_keys(self, client_with_mocked_boto):
+        """Test UnprocessedKeys are retried with backoff"""
+        client, mock_dynamodb = client_with_mocked_boto
+        mock_dynamodb.batch_get_item.side_effect = [
+            {
+                "Responses": {"ShoeInventory": to_wire([{"shoe_id": "a"}])},
+                "UnprocessedKeys": {"ShoeInventory": {"Keys": [{"shoe_id": {"S": "b"}}]}},
+            },
+            {"Responses": {"ShoeInventory": to_wire([{"shoe_id": "b"}])}, "UnprocessedKeys": {}},
+        ]
+
+        with patch('app.dynamodb_client.time.sleep') as mock_sleep:
+            products = client.get_products_by_ids(["a", "b"])
+
+        assert [p["shoe_id"] for p in products] == ["a", "b"]
+        mock_sleep.assert_called_once()
+        retry_items = mock_dynamodb.batch_get_item.call_args_list[1].kwargs["RequestItems"]
+        assert retry_items == {"ShoeInventory": {"Keys": [{"shoe_id": {"S": "b"}}]}}
+
+    def test_gives_up_after_max_retries(self, client_with_mocked_boto):
+        """Test persistent UnprocessedKeys raise an error"""
+        client, mock_dynamodb = client_with_mocked_boto
+        mock_dynamodb.batch_get_item.return_value = {
+            "Responses": {},
+            "UnprocessedKeys": {"ShoeInventory": {"Keys": [{"shoe_id": {"S": "a"}}]}},
+        }
+
+        with patch('app.dynamodb_client.time.sleep'):
+            with pytest.raises(Exception, match="unprocessed"):
+                client.get_products_by_ids(["a"])
+
+    def test_mock_mode(self):
+        """Test batch lookups in mock mode"""
+        client = DynamoDBClient(table_name="ShoeInventory", mock_mode=True)
+
+        products = client.get_products_by_ids(["mock-003", "mock-001"])
+
+        assert [p["shoe_id"] for p in products] == ["mock-003", "mock-001"]
+
+
+class TestFieldProjection:
+    """Test suite for field selection on list reads"""
+
+    def test_projection_expression_uses_placeholders(self):
+        """Test reserved attribute names are projected through placeholders"""
+        projection = DynamoDBClient._projection(["name", "price"])
+
+        assert projection["ProjectionExpression"] == "#f0, #f1, #f2"
+        assert projection["ExpressionAttributeNames"] == {
+            "#f0": "shoe_id", "#f1": "name", "#f2": "price"
+        }
+        assert DynamoDBClient._projection(None) == {}
+
+    def test_scan_sends_projection(self):
+        """Test get_all_products passes the projection to the scan"""
+        with patch('boto3.client') as mock_boto:
+            mock_dynamodb = mock_boto.return_value
+            mock_dynamodb.scan.return_value = {"Items": to_wire([{"shoe_id": "1", "name": "Shoe"}])}
+            client = DynamoDBClient(table_name="ShoeInventory")
+
+            client.get_all_products(fields=["name"])
+
+        call_kwargs = mock_dynamodb.scan.call_args.kwargs
+        assert call_kwargs["ProjectionExpression"] == "#f0, #f1"
+
+    def test_projection_with_filters_on_moto(self):
+        """Test filtered reads return only the selected attributes"""
+        import boto3
+        from moto import mock_aws
+
+        with mock_aws():
+            create_indexed_table(boto3.resource("dynamodb", region_name="us-east-1"), [
+                {"shoe_id": "1", "name": "Runner", "type": "running", "color": "red",
+                 "type_color": "running#red", "price": Decimal("80"), "description": "long text"},
+                {"shoe_id": "2", "name": "Loafer", "type": "casual", "color": "red",
+                 "type_color": "casual#red", "price": Decimal("60"), "description": "long text"},
+            ])
+            client = DynamoDBClient(table_name="ShoeInventory")
+
+            by_index = client.get_products_by_filters(type="running", fields=["name", "price"])
+            by_scan = client.get_products_by_filters(price_max=70, fields=["name", "type"])
+
+        assert by_index == [{"shoe_id": "1", "name": "Runner", "price": 80.0}]
+        assert by_scan == [{"shoe_id": "2", "name": "Loafer", "type": "casual"}]
+
+    def test_projection_in_mock_mode(self):
+        """Test field selection applies to mock products"""
+        client = DynamoDBClient(table_name="ShoeInventory", mock_mode=True)
+
+        products = client.get_featured_products(fields=["price"])
+
+        assert products and all(set(p) == {"shoe_id", "price"} for p in products)
+
+
+class TestCatalogMetadata:
+    """Test suite for the materialized categories aggregate"""
+
+    @pytest.fixture
+    def moto_client(self):
+        """Create a moto table with three products"""
+        import boto3
+        from moto import mock_aws
+
+        with mock_aws():
+            table = create_indexed_table(boto3.resource("dynamodb", region_name="us-east-1"), [
+                {"shoe_id": "1", "type": "running", "color": "red", "price": Decimal("80")},
+                {"shoe_id": "2", "type": "casual", "color": "blue", "price": Decimal("60")},
+                {"shoe_id": "3", "type": "running", "color": "blue", "price": Decimal("90")},
+            ])
+            yield DynamoDBClient(table_name="ShoeInventory"), table
+
+    def test_rebuild_stores_aggregate(self, moto_client):
+        """Test rebuild_categories writes the metadata item"""
+        client, table = moto_client
+
+        meta = client.rebuild_categories()
+
+        assert meta["types"] == ["casual", "running"]
+        assert meta["colors"] == ["blue", "red"]
+        assert meta["item_count"] == 3
+        stored = table.get_item(Key={"shoe_id": "__catalog_meta__"})["Item"]
+        assert stored["version"] == meta["version"]
+
+    def test_categories_read_without_scan(self, moto_client):
+        """Test get_categories is a single GetItem once the aggregate exists"""
+        client, _ = moto_client
+        client.rebuild_categories()
+
+        with patch.object(client, "_scan_all", side_effect=AssertionError("scanned")):
+            categories = client.get_categories()
+
+        assert categories == {"types": ["casual", "running"], "colors": ["blue", "red"]}
+
+    def test_categories_fall_back_to_scan(self, moto_client):
+        """Test get_categories still works before the aggregate is built"""
+        client, _ = moto_client
+
+        assert client.get_categories()["types"] == ["casual", "running"]
+
+    def test_metadata_item_hidden_from_products(self, moto_client):
+        """Test the metadata item never shows up as a product"""
+        client, _ = moto_client
+        client.rebuild_categories()
+
+        assert len(client.get_all_products()) == 3
+        assert client.get_product_by_id("__catalog_meta__") is None
+        assert client.get_products_by_ids(["__catalog_meta__", "1"])[0]["shoe_id"] == "1"
+        page, _ = client.get_products_page(limit=10)
+        assert "__catalog_meta__" not in [p["shoe_id"] for p in page]
+
+    def test_consistency_check_detects_drift(self, moto_client):
+        """Test the consistency check reports products added after a rebuild"""
+        client, table = moto_client
+        client.rebuild_categories()
+        assert client.check_categories_consistency()["consistent"] is True
+
+        table.put_item(Item={"shoe_id": "4", "type": "boots", "color": "brown",
+                             "price": Decimal("150")})
+        report = client.check_categories_consistency()
+
+        assert report["consistent"] is False
+        assert report["missing_types"] == ["boots"]
+        assert report["missing_colors"] == ["brown"]
+        assert report["stored_item_count"] == 3
+        assert report["actual_item_count"] == 4
+
+    def test_consistency_without_aggregate(self, moto_client):
+        """Test a missing aggregate is reported as inconsistent"""
+        client, _ = moto_client
+
+        assert client.check_categories_consistency()["consistent"] is False
+
+    def test_metadata_version_matches_snapshot_version(self, moto_client):
+        """Test the stored version equals the snapshot cache's catalog version"""
+        client, _ = moto_client
+        meta = client.rebuild_categories()
+
+        cached = DynamoDBClient(table_name="ShoeInventory", cache_ttl_seconds=60)
+        cached.get_all_products()
+
+        assert cached.catalog_version == meta["version"]
+
+    def test_get_catalog_version_reads_metadata(self, moto_client):
+        """Test get_catalog_version uses the metadata item without a snapshot"""
+        client, _ = moto_client
+        assert client.get_catalog_version() is None
+
+        meta = client.rebuild_categories()
+        assert client.get_catalog_version() == meta["version"]
+
+
+class TestFeaturedIndex:
+    """Test suite for the sparse featured-rating-index"""
+
+    @staticmethod
+    def build_catalog(total, featured):
+        """Products where the first `featured` items are featured"""
+        items = []
+        for i in range(total):
+            item = {
+                "shoe_id": f"shoe-{i:04d}",
+                "type": "running",
+                "color": "red",
+                "price": Decimal(50 + i % 100),
+                "rating": Decimal(str(round(3.0 + (i % 20) / 10, 1))),
+                "featured": i < featured,
+            }
+            if i < featured:
+                item["featured_key"] = "featured"
+            items.append(item)
+        return items
+
+    @staticmethod
+    def count_reads(client):
+        """Sum ScannedCount over every Query/Scan the client makes"""
+        reads = {"items_read": 0}
+
+        def _count(parsed, **kwargs):
+            reads["items_read"] += parsed.get("ScannedCount", 0)
+
+        events = client._client.meta.events
+        events.register("after-call.dynamodb.Query", _count)
+        events.register("after-call.dynamodb.Scan", _count)
+        return reads
+
+    @pytest.mark.parametrize("total", [50, 400])
+    def test_read_cost_scales_with_featured_count(self, total):
+        """Test items read equal the featured count whatever the catalog size"""
+        import boto3
+        from moto import mock_aws
+
+        with mock_aws():
+            create_indexed_table(
+                boto3.resource("dynamodb", region_name="us-east-1"),
+                self.build_catalog(total, featured=6),
+            )
+            client = DynamoDBClient(table_name="ShoeInventory")
+            reads = self.count_reads(client)
+
+            products = client.get_featured_products()
+
+        assert len(products) == 6
+        assert all(p["featured"] is True for p in products)
+        assert reads["items_read"] == 6
+
+    def test_limit_and_rating_order(self):
+        """Test the index returns the top rated featured products first"""
+        import boto3
+        from moto import mock_aws
+
+        with mock_aws():
+            create_indexed_table(
+                boto3.resource("dynamodb", region_name="us-east-1"),
+                self.build_catalog(100, featured=10),
+            )
+            client = DynamoDBClient(table_name="ShoeInventory")
+            reads = self.count_reads(client)
+
+            products = client.get_featured_products(limit=3)
+
+        ratings = [p["rating"] for p in products]
+        assert len(products) == 3
+        assert ratings == sorted(ratings, reverse=True)
+        assert ratings[0] == 3.9
+        assert reads["items_read"] == 3
+
+    def test_scan_fallback_orders_and_limits(self):
+        """Test the scan fallback honours limit and ordering"""
+        with patch('boto3.client') as mock_boto:
+            mock_dynamodb = mock_boto.return_value
+            mock_dynamodb.describe_table.return_value = {"Table": {"GlobalSecondaryIndexes": []}}
+            mock_dynamodb.scan.return_value = {"Items": to_wire([
+                {"shoe_id": "1", "featured": True, "rating": Decimal("4.1")},
+                {"shoe_id": "2", "featured": True, "rating": Decimal("4.8")},
+                {"shoe_id": "3", "featured": True, "rating": Decimal("4.5")},
+            ])}
+            client = DynamoDBClient(table_name="ShoeInventory")
+
+            products = client.get_featured_products(limit=2)
+
+        assert [p["shoe_id"] for p in products] == ["2", "3"]
+
+
+class TestDynamoDBCodec:
+    """Test suite for decoding DynamoDB wire items"""
+
+    def test_numbers_decode_to_int_and_float(self):
+        """Test N values become ints when integral in form, floats otherwise"""
+        from app.dynamodb_codec import deserialize_item
+
+        item = deserialize_item(to_wire([{
+            "shoe_id": "1",
+            "price": Decimal("89.99"),
+            "sizes": [Decimal("9"), Decimal("9.5")],
+            "featured": True,
+            "meta": {"stock": Decimal("3"), "note": None},
+        }])[0])
+
+        assert item == {
+            "shoe_id": "1",
+            "price": 89.99,
+            "sizes": [9, 9.5],
+            "featured": True,
+            "meta": {"stock": 3, "note": None},
+        }
+        assert isinstance(item["sizes"][0], int)
+
+    def test_matches_type_deserializer(self):
+        """Test decoding agrees with boto3's TypeDeserializer"""
+        from boto3.dynamodb.types import TypeDeserializer
+        from app.dynamodb_codec import deserialize_item
+
+        wire = to_wire([{"shoe_id": "x", "tags": {"a", "b"}, "ns": {Decimal("1"), Decimal("2.5")}}])[0]
+        expected = {k: TypeDeserializer().deserialize(v) for k, v in wire.items()}
+
+        assert deserialize_item(wire) == expected == {
+            "shoe_id": "x", "tags": {"a", "b"}, "ns": {1, 2.5}
+        }
+
+    def test_unknown_type_raises(self):
+        """Test unrecognised attribute values are rejected"""
+        from app.dynamodb_codec import deserialize_value
+
+        with pytest.raises(TypeError):
+            deserialize_value({"X": "?"})
+
+
+class TestFacets:
+    """Test suite for facet counts"""
+
+    def test_cached_facets_match_filtered_products(self):
+        """Test snapshot facet counts agree with the filtered product list"""
+        client = DynamoDBClient(table_name="ShoeInventory", mock_mode=True, cache_ttl_seconds=60)
+
+        facets = client.get_facets(color="black")
+        products = client.get_products_by_filters(color="black")
+
+        assert facets["total"] == len(products)
+        assert facets["types"] == {"formal": 1, "running": 1}
+        assert facets["sizes"][12.0] == 1
+
+    def test_uncached_facets(self):
+        """Test facet counts without the snapshot cache"""
+        client = DynamoDBClient(table_name="ShoeInventory", mock_mode=True)
+
+        facets = client.get_facets(price_max=90)
+
+        assert facets["total"] == 2
+        assert facets["brands"] == {"Adidas": 1, "Nike": 1}
+
+
+class TestSortedProducts:
+    """Test suite for sorted product reads"""
+
+    def test_cached_sorted_pages(self):
+        """Test sorted snapshot pages follow the global sort order"""
+        client = DynamoDBClient(table_name="ShoeInventory", mock_mode=True, cache_ttl_seconds=60)
+
+        first, cursor = client.get_products_page(limit=2, sort_by="price", descending=True)
+        second, end = client.get_products_page(
+            limit=2, cursor=cursor, sort_by="price", descending=True
+        )
+
+        assert [p["price"] for p in first + second] == [120.0, 95.0, 89.99, 75.5]
+        assert end is None
+
+    def test_uncached_sort_matches_cached(self):
+        """Test the dict sort and the index sort agree"""
+        cached = DynamoDBClient(table_name="ShoeInventory", mock_mode=True, cache_ttl_seconds=60)
+        uncached = DynamoDBClient(table_name="ShoeInventory", mock_mode=True)
+
+        for sort_by in ("price", "rating"):
+            assert cached.get_products_by_filters(sort_by=sort_by) == \
+                uncached.get_products_by_filters(sort_by=sort_by)
+
+    def test_unknown_sort_field(self):
+        """Test unknown sort fields raise ValueError"""
+        client = DynamoDBClient(table_name="ShoeInventory", mock_mode=True)
+
+        with pytest.raises(ValueError):
+            client.get_products_by_filters(sort_by="name")
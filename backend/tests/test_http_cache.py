@@ -0,0 +1,98 @@
+"""
+Test cases for HTTP caching helpers.
+"""
+import gzip
+
+from app.http_cache import (
+    ResponseCache,
+    cache_control,
+    content_etag,
+    etag_matches,
+    is_cacheable,
+    version_etag,
+)
+
+
+class TestEtags:
+    """Test suite for ETag building and If-None-Match matching"""
+
+    def test_version_etag_is_weak_and_versioned(self):
+        """Test the API version is part of the tag"""
+        assert version_etag("abc123", "1.0.0") == 'W/"1.0.0-abc123"'
+        assert version_etag("abc123", "1.0.0") != version_etag("abc123", "1.1.0")
+
+    def test_content_etag_depends_on_body(self):
+        """Test body hashes differ for different bodies"""
+        assert content_etag(b"a") == content_etag(b"a")
+        assert content_etag(b"a") != content_etag(b"b")
+
+    def test_etag_matches_lists_and_weakness(self):
+        """Test If-None-Match lists, wildcards and weak/strong forms"""
+        etag = 'W/"1.0.0-abc"'
+        assert etag_matches('"x", W/"1.0.0-abc"', etag)
+        assert etag_matches('"1.0.0-abc"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('W/"1.0.0-old"', etag)
+        assert not etag_matches(None, etag)
+
+    def test_cacheable_paths(self):
+        """Test only catalog GETs are tagged"""
+        assert is_cacheable("GET", "/api/products")
+        assert is_cacheable("GET", "/api/products/shoe-1")
+        assert not is_cacheable("POST", "/api/products/batch")
+        assert not is_cacheable("GET", "/api/metrics")
+
+    def test_cache_control(self):
+        """Test max-age 0 asks caches to revalidate every time"""
+        assert cache_control(60) == "public, max-age=60"
+        assert cache_control(0) == "no-cache"
+
+
+class TestResponseCache:
+    """Test suite for ResponseCache"""
+
+    def test_hit_requires_same_version(self):
+        """Test bodies are stored per catalog version"""
+        cache = ResponseCache()
+        cache.put(("products", "running"), "v1", b"[1]")
+
+        assert cache.get(("products", "running"), "v1") == b"[1]"
+        assert cache.get(("products", "running"), "v2") is None
+        assert cache.get(("products", "running"), None) is None
+
+    def test_evicts_to_byte_budget(self):
+        """Test least recently used bodies are evicted to stay within max_bytes"""
+        cache = ResponseCache(max_bytes=10)
+        cache.put("a", "v1", b"aaaa")
+        cache.put("b", "v1", b"bbbb")
+        cache.get("a", "v1")
+        cache.put("c", "v1", b"cccc")
+
+        assert cache.get("b", "v1") is None
+        assert cache.get("a", "v1") == b"aaaa"
+        snapshot = cache.snapshot()
+        assert snapshot["bytes"] == 8
+        assert snapshot["evictions"] == 1
+
+    def test_oversized_and_disabled(self):
+        """Test bodies over the budget and a zero budget are not stored"""
+        cache = ResponseCache(max_bytes=3)
+        cache.put("a", "v1", b"aaaa")
+        assert cache.snapshot()["entries"] == 0
+
+        disabled = ResponseCache(max_bytes=0)
+        disabled.put("a", "v1", b"")
+        assert disabled.get("a", "v1") is None
+
+    def test_gzipped_stored_with_body(self):
+        """Test the compressed body is computed once and counted in the budget"""
+        cache = ResponseCache()
+        body = b'{"products": []}' * 100
+        cache.put("a", "v1", body)
+
+        compressed = cache.gzipped("a", "v1", compresslevel=6)
+
+        assert gzip.decompress(compressed) == body
+        assert cache.gzipped("a", "v1", compresslevel=6) is compressed
+        assert cache.snapshot()["bytes"] == len(body) + len(compressed)
+        assert cache.gzipped("missing", "v1", compresslevel=6) is None
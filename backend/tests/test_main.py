@@ -2,14 +2,67 @@
 Test cases for FastAPI main application endpoints.
 Uses mock mode for testing without AWS dependencies.
 """
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
 import pytest
+import httpx
+from unittest.mock import patch
 from fastapi.testclient import TestClient
-from app.main import app
+from app.main import app, response_cache, search_cache
+
+
+def parse_sse(body):
+    """Split a Server-Sent Events body into (event, data) pairs"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def shoe_item(shoe_id, type="running"):
+    """A complete ShoeInventory item"""
+    return {
+        "shoe_id": shoe_id, "name": f"Shoe {shoe_id}", "brand": "Nike", "type": type,
+        "color": "red", "sizes": [Decimal("10")], "price": Decimal("100"),
+    }
+
+
+@pytest.fixture
+def table_client():
+    """Test client whose API reads a moto table directly (no snapshot cache)"""
+    import boto3
+    from moto import mock_aws
+    from app.dynamodb_client import DynamoDBClient
+
+    with mock_aws():
+        table = boto3.resource("dynamodb", region_name="us-east-1").create_table(
+            TableName="ShoeInventory",
+            KeySchema=[{"AttributeName": "shoe_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "shoe_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        for shoe_id in ("s0", "s1", "s2"):
+            table.put_item(Item=shoe_item(shoe_id))
+        dynamodb = DynamoDBClient(table_name="ShoeInventory", region="us-east-1")
+        dynamodb.rebuild_categories()
+
+        search_cache.clear()
+        response_cache.clear()
+        with patch("app.main.dynamodb_client", dynamodb):
+            yield TestClient(app), table
 
 
 @pytest.fixture
 def client():
     """Create test client"""
+    search_cache.clear()
+    response_cache.clear()
     return TestClient(app)
 
 
@@ -98,6 +151,88 @@ class TestProductsEndpoints:
         assert response.status_code == 400
         assert "size must be between 6 and 13" in response.json()["detail"]
 
+    def test_get_products_paginated(self, client):
+        """Test GET /api/products pages with limit and cursor"""
+        first = client.get("/api/products?limit=3").json()
+        assert len(first["products"]) == 3
+        assert first["count"] == 3
+        assert first["next_cursor"] is not None
+
+        second = client.get(f"/api/products?limit=3&cursor={first['next_cursor']}").json()
+        assert second["next_cursor"] is None
+
+        all_ids = [p["shoe_id"] for p in client.get("/api/products").json()["products"]]
+        paged_ids = [p["shoe_id"] for p in first["products"] + second["products"]]
+        assert paged_ids == all_ids
+
+    def test_get_products_unpaginated_has_no_cursor(self, client):
+        """Test GET /api/products without limit returns the full list"""
+        data = client.get("/api/products").json()
+        assert data["next_cursor"] is None
+
+    def test_get_products_invalid_cursor(self, client):
+        """Test GET /api/products with a malformed cursor returns 400"""
+        response = client.get("/api/products?limit=2&cursor=garbage")
+        assert response.status_code == 400
+        assert "cursor" in response.json()["detail"].lower()
+
+    def test_get_products_limit_out_of_range(self, client):
+        """Test GET /api/products rejects a zero limit"""
+        response = client.get("/api/products?limit=0")
+        assert response.status_code == 422
+
+    def test_get_products_with_fields(self, client):
+        """Test GET /api/products returns only the selected fields"""
+        response = client.get("/api/products?fields=name,price")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == len(data["products"]) > 0
+        for product in data["products"]:
+            assert set(product) == {"shoe_id", "name", "price"}
+
+    def test_get_products_summary_fields(self, client):
+        """Test GET /api/products?fields=summary returns list-view fields"""
+        data = client.get("/api/products?fields=summary&type=running").json()
+        for product in data["products"]:
+            assert set(product) <= {"shoe_id", "name", "brand", "price", "image_url", "rating"}
+            assert "description" not in product
+
+    def test_get_products_unknown_field(self, client):
+        """Test GET /api/products rejects unknown fields"""
+        response = client.get("/api/products?fields=name,secret")
+        assert response.status_code == 400
+        assert "secret" in response.json()["detail"]
+
+    def test_get_products_sorted_by_price(self, client):
+        """Test GET /api/products?sort=price returns cheapest first"""
+        response = client.get("/api/products?sort=price")
+        assert response.status_code == 200
+        prices = [p["price"] for p in response.json()["products"]]
+        assert prices == sorted(prices)
+        assert len(prices) == 4
+
+    def test_get_products_top_rated_pages(self, client):
+        """Test sorted results page in order with limit and cursor"""
+        first = client.get("/api/products?sort=rating&limit=3").json()
+        second = client.get(
+            f"/api/products?sort=rating&limit=3&cursor={first['next_cursor']}"
+        ).json()
+
+        ratings = [p["rating"] for p in first["products"] + second["products"]]
+        assert ratings == sorted(ratings, reverse=True)
+        assert second["next_cursor"] is None
+
+    def test_get_products_sort_order(self, client):
+        """Test order=desc reverses the price sort"""
+        response = client.get("/api/products?type=running&sort=price&order=desc")
+        assert response.status_code == 200
+        assert [p["shoe_id"] for p in response.json()["products"]] == ["mock-004", "mock-001"]
+
+    def test_get_products_invalid_sort(self, client):
+        """Test unsupported sort fields are rejected"""
+        response = client.get("/api/products?sort=name")
+        assert response.status_code == 422
+
     def test_get_single_product_by_id(self, client):
         """Test GET /api/products/{shoe_id} returns single product"""
         # First get all products to get a valid ID
@@ -119,6 +254,25 @@ class TestProductsEndpoints:
         assert "not found" in response.json()["detail"].lower()
 
 
+class TestProductBatchEndpoint:
+    """Test suite for POST /api/products/batch"""
+
+    def test_batch_lookup(self, client):
+        """Test POST /api/products/batch returns products in request order"""
+        response = client.post(
+            "/api/products/batch", json={"shoe_ids": ["mock-002", "unknown", "mock-001"]}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert [p["shoe_id"] for p in data["products"]] == ["mock-002", "mock-001"]
+        assert data["count"] == 2
+
+    def test_batch_lookup_requires_ids(self, client):
+        """Test POST /api/products/batch with no IDs returns 422"""
+        response = client.post("/api/products/batch", json={"shoe_ids": []})
+        assert response.status_code == 422
+
+
 class TestFeaturedEndpoint:
     """Test suite for /api/featured endpoint"""
 
@@ -132,6 +286,30 @@ class TestFeaturedEndpoint:
         for product in data["products"]:
             assert product["featured"] is True
 
+    def test_get_featured_products_sorted_and_limited(self, client):
+        """Test GET /api/featured is highest rated first, with or without sort=rating"""
+        all_featured = client.get("/api/featured").json()["products"]
+        ratings = [p["rating"] for p in all_featured]
+        assert ratings == sorted(ratings, reverse=True)
+
+        for query in ("limit=1", "limit=1&sort=rating"):
+            response = client.get(f"/api/featured?{query}")
+            assert response.status_code == 200
+            assert response.json()["products"] == all_featured[:1]
+
+    def test_get_featured_products_invalid_sort(self, client):
+        """Test GET /api/featured rejects unknown sort keys"""
+        response = client.get("/api/featured?sort=price")
+        assert response.status_code == 422
+
+    def test_get_featured_products_with_fields(self, client):
+        """Test GET /api/featured supports field selection"""
+        response = client.get("/api/featured?fields=summary")
+        assert response.status_code == 200
+        for product in response.json()["products"]:
+            assert "description" not in product
+            assert "featured" not in product
+
 
 class TestCategoriesEndpoint:
     """Test suite for /api/categories endpoint"""
@@ -149,6 +327,175 @@ class TestCategoriesEndpoint:
         assert len(data["colors"]) > 0
 
 
+class TestFacetsEndpoint:
+    """Test suite for /api/facets endpoint"""
+
+    def test_get_facets(self, client):
+        """Test GET /api/facets counts the whole catalog"""
+        response = client.get("/api/facets")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 4
+        assert data["types"] == {"casual": 1, "formal": 1, "running": 2}
+        assert data["brands"] == {"Adidas": 1, "Clarks": 1, "Nike": 2}
+        assert data["sizes"]["9"] == 4
+
+    def test_get_facets_with_filters(self, client):
+        """Test GET /api/facets counts only matching products"""
+        response = client.get("/api/facets?type=running&size=11")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert data["colors"] == {"black": 1, "red": 1}
+        assert "casual" not in data["types"]
+
+    def test_get_facets_invalid_price_range(self, client):
+        """Test GET /api/facets rejects an inverted price range"""
+        response = client.get("/api/facets?price_min=100&price_max=50")
+        assert response.status_code == 400
+
+
+class TestConditionalGet:
+    """Test suite for ETag / If-None-Match on catalog reads"""
+
+    def test_catalog_reads_carry_etag(self, client):
+        """Test catalog GET responses have an ETag and Cache-Control"""
+        for path in ["/api/products", "/api/featured", "/api/categories", "/api/products/mock-001"]:
+            response = client.get(path)
+            assert response.status_code == 200
+            assert response.headers["etag"].startswith('W/"')
+            assert response.headers["cache-control"].startswith("public, max-age=")
+
+    def test_matching_etag_returns_304_without_reading(self, client):
+        """Test If-None-Match with the current ETag skips the endpoint"""
+        etag = client.get("/api/products").headers["etag"]
+
+        with patch("app.main.dynamodb_client.get_all_products") as mock_read:
+            response = client.get("/api/products", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        mock_read.assert_not_called()
+
+    def test_stale_etag_returns_body(self, client):
+        """Test a different catalog version gets a full response"""
+        response = client.get("/api/products", headers={"If-None-Match": 'W/"old"'})
+
+        assert response.status_code == 200
+        assert len(response.json()["products"]) > 0
+
+    def test_content_etag_without_catalog_version(self, client):
+        """Test the body hash is used when no catalog version exists"""
+        with patch("app.main.dynamodb_client.get_content_version", return_value=None):
+            etag = client.get("/api/categories").headers["etag"]
+            response = client.get("/api/categories", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+
+    def test_repeated_read_served_from_response_cache(self, client):
+        """Test an identical request returns the stored bytes without reading"""
+        first = client.get("/api/products?type=running&sort=price")
+
+        with patch("app.main.dynamodb_client.get_products_by_filters") as mock_read:
+            second = client.get("/api/products?sort=price&type=running")
+
+        mock_read.assert_not_called()
+        assert second.content == first.content
+        assert second.json()["count"] == len(first.json()["products"])
+
+    def test_response_cache_keyed_on_catalog_version(self, client):
+        """Test a new catalog version rebuilds the response"""
+        client.get("/api/featured")
+
+        with patch("app.main.dynamodb_client.get_content_version", return_value="v2"):
+            with patch(
+                "app.main.dynamodb_client.get_featured_products", return_value=[]
+            ) as mock_read:
+                response = client.get("/api/featured")
+
+        mock_read.assert_called_once()
+        assert response.json()["products"] == []
+
+    def test_table_reads_tagged_with_body_hash(self, table_client):
+        """Test writes without a metadata rebuild still change the ETag"""
+        client, table = table_client
+        etag = client.get("/api/products").headers["etag"]
+        assert client.get("/api/products", headers={"If-None-Match": etag}).status_code == 304
+
+        table.put_item(Item=shoe_item("new"))
+        response = client.get("/api/products", headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert "new" in [p["shoe_id"] for p in response.json()["products"]]
+
+    def test_table_reads_not_served_from_response_cache(self, table_client):
+        """Test endpoints agree after writes that skip the metadata rebuild"""
+        client, table = table_client
+        assert [p["shoe_id"] for p in client.get("/api/products").json()["products"]] == \
+            ["s0", "s1", "s2"]
+
+        table.put_item(Item=shoe_item("new", type="boots"))
+        table.delete_item(Key={"shoe_id": "s0"})
+        products = client.get("/api/products").json()
+
+        assert sorted(p["shoe_id"] for p in products["products"]) == ["new", "s1", "s2"]
+        assert products["count"] == 3
+        assert client.get("/api/products/s0").status_code == 404
+        assert [p["shoe_id"] for p in client.get("/api/products?type=boots").json()["products"]] == \
+            ["new"]
+        assert response_cache.snapshot()["entries"] == 0
+
+    def test_errors_and_other_endpoints_not_tagged(self, client):
+        """Test 404s and non-catalog endpoints get no ETag"""
+        assert "etag" not in client.get("/api/products/nope").headers
+        assert "etag" not in client.get("/health").headers
+
+
+class TestCompression:
+    """Test suite for gzip responses"""
+
+    def test_large_response_gzipped(self, client):
+        """Test product lists are gzipped for clients that accept it"""
+        response = client.get("/api/products", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert len(response.json()["products"]) > 0
+
+    def test_identity_without_accept_encoding(self, client):
+        """Test clients that do not accept gzip get the plain body"""
+        response = client.get("/api/products", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert len(response.json()["products"]) > 0
+
+    def test_cached_response_reuses_compressed_bytes(self, client):
+        """Test the gzip encoding is stored with the cached body and reused"""
+        client.get("/api/products", headers={"Accept-Encoding": "gzip"})
+        stored = response_cache.snapshot()["bytes"]
+
+        with patch("app.http_cache.gzip.compress") as mock_compress:
+            response = client.get("/api/products", headers={"Accept-Encoding": "gzip"})
+
+        mock_compress.assert_not_called()
+        assert response.headers["content-encoding"] == "gzip"
+        assert response_cache.snapshot()["bytes"] == stored
+
+    def test_small_and_streamed_responses_not_gzipped(self, client):
+        """Test responses under the minimum size and SSE streams stay plain"""
+        small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        stream = client.post(
+            "/api/search/stream",
+            json={"query": "black running shoes"},
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in stream.headers
+
+
 class TestSearchEndpoint:
     """Test suite for /api/search endpoint"""
 
@@ -176,6 +523,173 @@ class TestSearchEndpoint:
         assert "session_id" in data
         assert data["session_id"] is not None
 
+    def test_search_fast_path_skips_agent(self, client):
+        """Test simple searches are answered from the catalog"""
+        with patch("app.main.bedrock_client.invoke_agent") as mock_invoke:
+            response = client.post("/api/search", json={"query": "black running shoes"})
+
+        assert response.status_code == 200
+        mock_invoke.assert_not_called()
+        data = response.json()
+        assert [p["shoe_id"] for p in data["products"]] == ["mock-004"]
+        assert data["agent_response"] == "I found 1 match for black running shoes."
+        assert data["session_id"]
+
+    def test_search_free_text_uses_agent(self, client):
+        """Test queries the parser does not understand go to the agent"""
+        response = client.post("/api/search", json={"query": "something for a wedding"})
+
+        assert response.status_code == 200
+        assert response.json()["products"][0]["shoe_id"] == "mock-form-1"
+
+    def test_search_catalog_error_falls_back_to_agent(self, client):
+        """Test a failing catalog read sends the search to the agent instead of failing it"""
+        with patch("app.main.get_query_parser", side_effect=RuntimeError("throttled")):
+            response = client.post("/api/search", json={"query": "comfortable shoes for a wedding"})
+            stream = client.post("/api/search/stream", json={"query": "comfortable shoes for a wedding"})
+
+        assert response.status_code == 200
+        assert response.json()["products"][0]["shoe_id"] == "mock-form-1"
+        assert parse_sse(stream.text)[-1][0] == "done"
+
+    def test_search_filter_error_falls_back_to_agent(self, client):
+        """Test a failing fast-path query is answered by the agent"""
+        with patch(
+            "app.main.dynamodb_client.get_products_by_filters",
+            side_effect=RuntimeError("throttled"),
+        ), patch("app.main.bedrock_client.invoke_agent") as mock_invoke:
+            mock_invoke.return_value = {
+                "agent_response": "ok", "products": [], "session_id": "s-1"
+            }
+            response = client.post("/api/search", json={"query": "black running shoes"})
+
+        assert response.status_code == 200
+        mock_invoke.assert_called_once()
+
+    def test_search_follow_up_uses_agent(self, client):
+        """Test searches in an agent session skip the fast path"""
+        with patch("app.main.bedrock_client.invoke_agent") as mock_invoke:
+            mock_invoke.return_value = {
+                "agent_response": "ok", "products": [], "session_id": "s-1"
+            }
+            client.post("/api/search", json={"query": "red shoes", "session_id": "s-1"})
+
+        mock_invoke.assert_called_once()
+
+    def test_metrics_report_fast_path(self, client):
+        """Test GET /api/metrics reports fast path hits per query class"""
+        client.post("/api/search", json={"query": "red running shoes under $100"})
+
+        response = client.get("/api/metrics")
+        assert response.status_code == 200
+        search = response.json()["search"]
+        assert search["classes"]["color+price_max+type"]["fast_path_hits"] >= 1
+
+    def test_search_repeated_query_uses_cache(self, client):
+        """Test a repeated agent search is answered from the result cache"""
+        with patch("app.main.bedrock_client.invoke_agent") as mock_invoke:
+            mock_invoke.return_value = {
+                "agent_response": "Try these",
+                "products": [],
+                "session_id": "s-1",
+            }
+            first = client.post("/api/search", json={"query": "Shoes for a wedding!"})
+            second = client.post("/api/search", json={"query": "shoes for a  wedding"})
+
+        mock_invoke.assert_called_once()
+        assert second.json()["agent_response"] == "Try these"
+        assert second.json()["session_id"] != first.json()["session_id"]
+
+    def test_search_cache_skipped_without_snapshot(self, table_client):
+        """Test agent results are not cached when reads go straight to the table"""
+        client, _ = table_client
+        with patch("app.main.bedrock_client.invoke_agent") as mock_invoke:
+            mock_invoke.return_value = {
+                "agent_response": "ok", "products": [], "session_id": "s-1"
+            }
+            client.post("/api/search", json={"query": "shoes for a wedding"})
+            client.post("/api/search", json={"query": "shoes for a wedding"})
+
+        assert mock_invoke.call_count == 2
+
+    def test_search_cache_version_error_is_a_miss(self, client):
+        """Test a failing catalog version lookup sends the search to the agent"""
+        with patch(
+            "app.main.dynamodb_client.get_content_version",
+            side_effect=RuntimeError("throttled"),
+        ):
+            response = client.post("/api/search", json={"query": "shoes for a wedding"})
+            stream = client.post("/api/search/stream", json={"query": "shoes for a wedding"})
+
+        assert response.status_code == 200
+        assert parse_sse(stream.text)[-1][0] == "done"
+
+    def test_search_cache_skips_follow_ups_and_fallbacks(self, client):
+        """Test session searches and fallback answers are not cached"""
+        with patch("app.main.bedrock_client.invoke_agent") as mock_invoke:
+            mock_invoke.return_value = {
+                "agent_response": "ok", "products": [], "session_id": "s-1", "fallback": True
+            }
+            client.post("/api/search", json={"query": "shoes for a wedding"})
+            client.post("/api/search", json={"query": "shoes for a wedding"})
+            client.post("/api/search", json={"query": "more", "session_id": "s-1"})
+            client.post("/api/search", json={"query": "more", "session_id": "s-1"})
+
+        assert mock_invoke.call_count == 4
+
+    def test_search_stream_uses_cache(self, client):
+        """Test a completed stream is cached for later searches"""
+        client.post("/api/search/stream", json={"query": "something for a wedding"})
+
+        with patch("app.main.bedrock_client.invoke_agent") as mock_invoke:
+            response = client.post("/api/search", json={"query": "Something for a wedding?"})
+
+        mock_invoke.assert_not_called()
+        assert response.json()["agent_response"].startswith("Here are some formal options")
+        assert response.json()["products"][0]["shoe_id"] == "mock-form-1"
+        assert client.get("/api/metrics").json()["search_cache"]["hits"] >= 1
+
+    def test_search_stream_relays_agent_events(self, client):
+        """Test POST /api/search/stream sends text, products and done events"""
+        response = client.post("/api/search/stream", json={"query": "something for a wedding"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_sse(response.text)
+        names = [name for name, _ in events]
+        assert names[0] == "text"
+        assert names[-2:] == ["products", "done"]
+        text = "".join(data["text"] for name, data in events if name == "text")
+        assert text.startswith("Here are some formal options")
+        assert events[-2][1]["products"][0]["shoe_id"] == "mock-form-1"
+
+    def test_search_stream_fast_path(self, client):
+        """Test streamed simple searches answer from the catalog"""
+        response = client.post("/api/search/stream", json={"query": "black running shoes"})
+
+        events = parse_sse(response.text)
+        assert [name for name, _ in events] == ["text", "products", "done"]
+        assert [p["shoe_id"] for p in events[1][1]["products"]] == ["mock-004"]
+
+    def test_search_stream_reports_agent_errors(self, client):
+        """Test an agent failure mid-stream becomes an error event"""
+        def failing_stream(query, session_id=None):
+            yield "text", "Looking"
+            raise RuntimeError("throttled")
+
+        with patch("app.main.bedrock_client.stream_agent", side_effect=failing_stream):
+            response = client.post("/api/search/stream", json={"query": "shoes for hiking"})
+
+        events = parse_sse(response.text)
+        assert events[0] == ("text", {"text": "Looking"})
+        assert events[-1][0] == "error"
+        assert "throttled" in events[-1][1]["detail"]
+
+    def test_search_stream_rejects_empty_query(self, client):
+        """Test validation happens before the stream starts"""
+        response = client.post("/api/search/stream", json={"query": " "})
+        assert response.status_code == 400
+
     def test_search_empty_query(self, client):
         """Test POST /api/search with empty query returns 400"""
         search_query = {"query": ""}
@@ -200,3 +714,78 @@ class TestSearchEndpoint:
         response = client.post("/api/search", json=search_query)
         assert response.status_code == 400
         assert "length" in response.json()["detail"].lower()
+
+
+class TestBlockingCallsOffEventLoop:
+    """Test suite for running boto3 calls on dedicated executors"""
+
+    @pytest.mark.asyncio
+    async def test_products_latency_flat_during_slow_search(self):
+        """Test /api/products stays fast while slow /api/search calls are in flight"""
+        agent_delay = 0.5
+
+        def slow_invoke_agent(query, session_id=None):
+            time.sleep(agent_delay)  # Blocking, like a real boto3 call
+            return {"agent_response": "done", "products": [], "session_id": "s"}
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            with patch("app.main.bedrock_client.invoke_agent", side_effect=slow_invoke_agent):
+                searches = [
+                    asyncio.create_task(client.post("/api/search", json={"query": f"shoes {i}"}))
+                    for i in range(4)
+                ]
+                await asyncio.sleep(0.05)  # Let the searches reach the agent pool
+
+                latencies = []
+                for _ in range(5):
+                    start = time.perf_counter()
+                    response = await client.get("/api/products")
+                    latencies.append(time.perf_counter() - start)
+                    assert response.status_code == 200
+
+                assert not any(task.done() for task in searches)
+                search_responses = await asyncio.gather(*searches)
+
+        assert all(r.status_code == 200 for r in search_responses)
+        assert max(latencies) < agent_delay / 2
+
+
+class TestColdStart:
+    """Test suite for what the Lambda handler loads at import"""
+
+    def test_handler_import_defers_aws_sdk_and_numpy(self):
+        """boto3, botocore and NumPy are only imported once a request needs them"""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, lambda_handler; "
+                "print(sorted(m for m in ('boto3', 'botocore', 'numpy') if m in sys.modules))",
+            ],
+            cwd=Path(__file__).parent.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip() == "[]"
+
+    def test_mock_mode_reads_skip_botocore(self):
+        """Mock mode reads, including the consistency check, never load botocore"""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys\n"
+                "from app.dynamodb_client import DynamoDBClient\n"
+                "client = DynamoDBClient('ShoeInventory', mock_mode=True)\n"
+                "client.get_all_products(); client.get_categories()\n"
+                "client.check_categories_consistency()\n"
+                "print('botocore' in sys.modules)",
+            ],
+            cwd=Path(__file__).parent.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip() == "False"
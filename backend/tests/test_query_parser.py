@@ -0,0 +1,95 @@
+"""
+Test cases for the rule-based search query parser.
+"""
+import pytest
+
+from app.query_parser import QueryParser, SearchStats, describe_filters, fast_path_response
+
+TYPES = ["athletic", "boots", "casual", "formal", "running", "sandals", "sneakers"]
+COLORS = ["black", "blue", "brown", "gray", "red", "white"]
+
+
+@pytest.fixture
+def parser():
+    """Create a parser for the seed catalog's categories"""
+    return QueryParser(TYPES, COLORS)
+
+
+class TestQueryParser:
+    """Test suite for QueryParser.parse"""
+
+    @pytest.mark.parametrize("query,filters", [
+        ("red running shoes under $100", {"color": "red", "type": "running", "price_max": 100.0}),
+        ("Show me grey boots in size 10.5", {"color": "gray", "type": "boots", "size": 10.5}),
+        ("black sneakers between $50 and $120",
+         {"color": "black", "type": "sneakers", "price_min": 50.0, "price_max": 120.0}),
+        ("$60-$90 sandals", {"type": "sandals", "price_min": 60.0, "price_max": 90.0}),
+        ("casual shoes 80 or less", {"type": "casual", "price_max": 80.0}),
+        ("I need a boot", {"type": "boots"}),
+        ("white shoes over 75 dollars", {"color": "white", "price_min": 75.0}),
+    ])
+    def test_confident_queries(self, parser, query, filters):
+        """Test simple searches are fully understood"""
+        result = parser.parse(query)
+
+        assert result["confident"] is True
+        assert result["filters"] == filters
+        assert result["query_class"] == "+".join(sorted(filters))
+
+    @pytest.mark.parametrize("query,query_class", [
+        ("comfortable shoes for a wedding", "free_text"),
+        ("red or blue running shoes", "partial"),
+        ("running shoes for flat feet", "partial"),
+        ("formal shoes under $100 over $200", "partial"),
+        ("boots in size 15", "partial"),
+        ("cheap shoes", "free_text"),
+    ])
+    def test_queries_left_to_the_agent(self, parser, query, query_class):
+        """Test anything not fully understood is not confident"""
+        result = parser.parse(query)
+
+        assert result["confident"] is False
+        assert result["query_class"] == query_class
+
+    def test_only_catalog_values_match(self):
+        """Test categories come from the catalog, not a fixed list"""
+        parser = QueryParser(["running"], ["red"])
+
+        assert parser.parse("red boots")["confident"] is False
+        assert parser.parse("red running shoes")["confident"] is True
+
+
+class TestFastPathResponse:
+    """Test suite for templated responses"""
+
+    def test_describe_filters(self):
+        """Test filters read as a noun phrase"""
+        assert describe_filters({"color": "red", "type": "running", "price_max": 100.0}) == \
+            "red running shoes under $100"
+        assert describe_filters({"type": "boots", "size": 9.5, "price_min": 50.0}) == \
+            "boots in size 9.5 over $50"
+
+    def test_response_mentions_count(self):
+        """Test the response reports the number of matches"""
+        assert fast_path_response({"type": "boots"}, 3) == "I found 3 boots for you."
+        assert "couldn't find" in fast_path_response({"type": "boots"}, 0)
+
+
+class TestSearchStats:
+    """Test suite for fast path metrics"""
+
+    def test_hit_rate_and_latency_saved(self):
+        """Test per-class hit rate and saved latency against the agent mean"""
+        stats = SearchStats()
+        stats.record("type", fast_path=True, seconds=0.01)
+        stats.record("type", fast_path=True, seconds=0.03)
+        stats.record("free_text", fast_path=False, seconds=2.0)
+
+        report = stats.snapshot()
+
+        assert report["queries"] == 3
+        assert report["hit_rate"] == pytest.approx(2 / 3)
+        assert report["classes"]["type"]["hit_rate"] == 1.0
+        assert report["classes"]["type"]["avg_fast_path_ms"] == pytest.approx(20.0)
+        assert report["classes"]["type"]["latency_saved_ms"] == pytest.approx(3960.0)
+        assert report["classes"]["free_text"]["latency_saved_ms"] is None
@@ -0,0 +1,87 @@
+"""
+Test cases for the search result cache.
+"""
+from unittest.mock import patch
+
+from app.search_cache import SearchCache, normalize_query
+
+
+class TestNormalizeQuery:
+    """Test suite for normalize_query"""
+
+    def test_case_punctuation_and_whitespace(self):
+        """Test case, punctuation and spacing differences are ignored"""
+        assert normalize_query("  Red   Running shoes! ") == "red running shoes"
+        assert normalize_query("shoes, for a wedding?") == "shoes for a wedding"
+
+    def test_prices_are_canonical(self):
+        """Test currency symbols, words and number formats are normalized"""
+        expected = "red running shoes under 100"
+        assert normalize_query("Red running shoes under $100") == expected
+        assert normalize_query("red running shoes under 100.00 dollars") == expected
+        assert normalize_query("boots under $1,000") == "boots under 1000"
+
+    def test_decimal_sizes_kept(self):
+        """Test decimal points inside numbers survive punctuation removal"""
+        assert normalize_query("size 9.50 boots.") == "size 9.5 boots"
+
+
+class TestSearchCache:
+    """Test suite for SearchCache"""
+
+    def test_hit_after_put(self):
+        """Test a normalized repeat of a query hits"""
+        cache = SearchCache()
+        cache.put("Red shoes under $100", "v1", {"agent_response": "a", "products": []})
+
+        assert cache.get("red shoes under 100", "v1") == {"agent_response": "a", "products": []}
+        assert cache.snapshot()["hits"] == 1
+
+    def test_keyed_on_catalog_version(self):
+        """Test a new catalog version misses"""
+        cache = SearchCache()
+        cache.put("red shoes", "v1", {"agent_response": "a", "products": []})
+
+        assert cache.get("red shoes", "v2") is None
+        assert cache.snapshot()["misses"] == 1
+
+    def test_unknown_version_never_cached(self):
+        """Test results without a catalog version are neither stored nor served"""
+        cache = SearchCache()
+        cache.put("red shoes", None, {"agent_response": "a", "products": []})
+
+        assert cache.get("red shoes", None) is None
+        assert cache.snapshot()["entries"] == 0
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted when full"""
+        cache = SearchCache(max_entries=2)
+        cache.put("a", "v1", {"n": 1})
+        cache.put("b", "v1", {"n": 2})
+        cache.get("a", "v1")
+        cache.put("c", "v1", {"n": 3})
+
+        assert cache.get("b", "v1") is None
+        assert cache.get("a", "v1") == {"n": 1}
+        assert cache.snapshot()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test entries expire after the TTL"""
+        cache = SearchCache(ttl_seconds=10)
+        with patch("app.search_cache.time.monotonic", return_value=100.0):
+            cache.put("a", "v1", {"n": 1})
+        with patch("app.search_cache.time.monotonic", return_value=111.0):
+            assert cache.get("a", "v1") is None
+
+        snapshot = cache.snapshot()
+        assert snapshot["expirations"] == 1
+        assert snapshot["entries"] == 0
+
+    def test_disabled_with_zero_ttl(self):
+        """Test a TTL of 0 turns the cache off"""
+        cache = SearchCache(ttl_seconds=0)
+        cache.put("a", "v1", {"n": 1})
+
+        assert not cache.enabled
+        assert cache.get("a", "v1") is None
+        assert cache.snapshot()["entries"] == 0
@@ -0,0 +1,126 @@
+"""
+Serialization micro-benchmarks for the trusted construction path.
+
+Each test builds the same response twice: the strict way the endpoints used
+to (ShoeProduct(**item) per item, then FastAPI validating the returned model
+against response_model and encoding it with json.dumps) and the trusted way
+(bulk validation plus model_construct, serialized by pydantic-core). The
+bodies must be identical. Timings are only reported, since wall-clock
+comparisons are unreliable on a loaded CI runner; run with -s to see them.
+"""
+import json
+import random
+import time
+
+from pydantic import TypeAdapter
+
+from app.models import (
+    ProductDetail,
+    ProductListResponse,
+    SearchResponse,
+    ShoeProduct,
+    catalog_products,
+)
+
+TYPES = ["running", "casual", "formal", "athletic", "boots"]
+COLORS = ["red", "blue", "black", "white", "brown"]
+
+
+def make_items(count):
+    """Catalog items shaped like DynamoDBClient output"""
+    rng = random.Random(7)
+    return [
+        {
+            "shoe_id": f"shoe-{i:05d}",
+            "name": f"Shoe {i}",
+            "brand": "Nike",
+            "type": rng.choice(TYPES),
+            "color": rng.choice(COLORS),
+            "sizes": [8, 9.5, 10, 11],
+            "price": round(rng.uniform(30, 250), 2),
+            "rating": round(rng.uniform(3, 5), 1),
+            "image_url": f"https://placehold.co/300x300?text=Shoe+{i}",
+            "description": "Benchmark item",
+            "featured": i % 10 == 0,
+        }
+        for i in range(count)
+    ]
+
+
+def fastapi_encode(response_model, content):
+    """Approximate FastAPI's handling of a returned model: validate, dump, json.dumps"""
+    adapter = TypeAdapter(response_model)
+    data = adapter.dump_python(adapter.validate_python(content), mode="json")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def best_of(func, loops, repeat=5):
+    """Fastest of `repeat` runs of `loops` calls, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def compare(name, strict, trusted, loops=1):
+    """Check both paths produce the same JSON and print their timings"""
+    assert json.loads(trusted()) == json.loads(strict())
+    strict_time = best_of(strict, loops)
+    trusted_time = best_of(trusted, loops)
+    print(
+        f"\n{name}: strict {strict_time * 1000:.2f} ms, trusted {trusted_time * 1000:.2f} ms "
+        f"({strict_time / trusted_time:.1f}x)"
+    )
+
+
+class TestSerializationBenchmark:
+    """Micro-benchmarks of list, search and detail response serialization"""
+
+    def test_product_list(self):
+        """Test ProductListResponse.from_catalog against per-item construction"""
+        items = make_items(5000)
+
+        compare(
+            "list (5000 products)",
+            lambda: fastapi_encode(
+                ProductListResponse,
+                ProductListResponse(products=[ShoeProduct(**item) for item in items]),
+            ),
+            lambda: ProductListResponse.from_catalog(items).model_dump_json().encode(),
+        )
+
+    def test_search_response(self):
+        """Test a fast path SearchResponse built from catalog items"""
+        items = make_items(50)
+
+        compare(
+            "search (50 products, x100)",
+            lambda: fastapi_encode(
+                SearchResponse,
+                SearchResponse(
+                    agent_response="I found 50 shoes for you.",
+                    products=[ShoeProduct(**item) for item in items],
+                    session_id="session-1",
+                ),
+            ),
+            lambda: SearchResponse.model_construct(
+                agent_response="I found 50 shoes for you.",
+                products=catalog_products(items),
+                session_id="session-1",
+            ).model_dump_json().encode(),
+            loops=100,
+        )
+
+    def test_product_detail(self):
+        """Test ProductDetail serialized directly against FastAPI re-validation"""
+        item = make_items(1)[0]
+
+        compare(
+            "detail (x1000)",
+            lambda: fastapi_encode(ProductDetail, ProductDetail(**item)),
+            lambda: ProductDetail.model_validate(item).model_dump_json().encode(),
+            loops=1000,
+        )
@@ -1,9 +1,15 @@
 # Script to populate DynamoDB - to be implemented
 import decimal
+import os
+import sys
 
 import boto3
 import json
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+
+from app.dynamodb_client import DynamoDBClient  # noqa: E402
+
 data = json.load(open('seed_data.json'), parse_float=decimal.Decimal)
 
 dynamodb = boto3.resource('dynamodb')
@@ -11,4 +17,16 @@ table = dynamodb.Table('ShoeInventory')
 
 
 for shoe in data:
-    table.put_item(Item=shoe)
\ No newline at end of file
+    # Composite key for the type_color-price-index GSI
+    shoe['type_color'] = f"{shoe['type']}#{shoe['color']}"
+    # Only featured shoes get featured_key, keeping featured-rating-index sparse
+    if shoe.get('featured'):
+        shoe['featured_key'] = 'featured'
+    table.put_item(Item=shoe)
+
+# /api/categories and the catalog version are read from the metadata item,
+# so rebuild it whenever products are written
+meta = DynamoDBClient(
+    table_name='ShoeInventory', region=dynamodb.meta.client.meta.region_name
+).rebuild_categories()
+print(f"Loaded {len(data)} shoes; catalog metadata rebuilt (version {meta['version']})")
@@ -1,10 +1,11 @@
-import { useState } from 'react';
-import { searchProducts } from '../services/api';
+import { useRef, useState } from 'react';
+import { streamSearchProducts } from '../services/api';
 
 export const useAISearch = () => {
   const [results, setResults] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  const controllerRef = useRef(null);
 
   const search = async (query) => {
     if (!query.trim()) {
@@ -12,23 +13,46 @@ export const useAISearch = () => {
       return;
     }
 
+    // Cancel a search that is still streaming
+    controllerRef.current?.abort();
+    const controller = new AbortController();
+    controllerRef.current = controller;
+
     setLoading(true);
     setError(null);
+    setResults(null);
     try {
-      const data = await searchProducts(query);
-      setResults(data);
+      // Render the agent's text as it streams in; products arrive as one event
+      await streamSearchProducts(
+        query,
+        {
+          onText: (chunk) =>
+            setResults((prev) => ({
+              products: [],
+              ...prev,
+              agent_response: (prev?.agent_response || '') + chunk,
+            })),
+          onProducts: (products) =>
+            setResults((prev) => ({ agent_response: '', ...prev, products })),
+          onDone: (sessionId) =>
+            setResults((prev) => ({ agent_response: '', products: [], ...prev, session_id: sessionId })),
+        },
+        controller.signal,
+      );
     } catch (err) {
+      if (err.name === 'AbortError') return;
       setError(err.message || 'Search failed');
       setResults(null);
     } finally {
-      setLoading(false);
+      if (controllerRef.current === controller) setLoading(false);
     }
   };
 
   const clearResults = () => {
+    controllerRef.current?.abort();
     setResults(null);
     setError(null);
   };
 
   return { results, loading, error, search, clearResults };
-};
\ No newline at end of file
+};
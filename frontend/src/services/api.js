@@ -9,7 +9,8 @@ const api = axios.create({
   },
 });
 
-// Browse products with optional filters
+// Browse products with optional filters.
+// Pass filters.limit to page; the response's next_cursor goes back in as filters.cursor.
 export const getProducts = async (filters = {}) => {
   try {
     const params = new URLSearchParams();
@@ -19,6 +20,11 @@ export const getProducts = async (filters = {}) => {
     if (filters.size) params.append('size', filters.size);
     if (filters.price_min) params.append('price_min', filters.price_min);
     if (filters.price_max) params.append('price_max', filters.price_max);
+    if (filters.limit) params.append('limit', filters.limit);
+    if (filters.cursor) params.append('cursor', filters.cursor);
+    if (filters.fields) params.append('fields', filters.fields);
+    if (filters.sort) params.append('sort', filters.sort);
+    if (filters.order) params.append('order', filters.order);
 
     const response = await api.get(`/api/products?${params.toString()}`);
     return response.data;
@@ -39,10 +45,21 @@ export const getProductById = async (id) => {
   }
 };
 
+// Get several products by ID in one request (order follows ids)
+export const getProductsByIds = async (ids) => {
+  try {
+    const response = await api.post('/api/products/batch', { shoe_ids: ids });
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching products:', error);
+    throw error;
+  }
+};
+
 // Get featured products
-export const getFeaturedProducts = async () => {
+export const getFeaturedProducts = async (fields) => {
   try {
-    const response = await api.get('/api/featured');
+    const response = await api.get('/api/featured', { params: fields ? { fields } : {} });
     return response.data;
   } catch (error) {
     console.error('Error fetching featured products:', error);
@@ -61,6 +78,56 @@ export const searchProducts = async (query) => {
   }
 };
 
+// Natural language AI search, streamed as Server-Sent Events.
+// handlers.onText(chunk), handlers.onProducts(products) and handlers.onDone(sessionId)
+// are called as events arrive; resolves when the stream ends.
+export const streamSearchProducts = async (query, handlers = {}, signal) => {
+  const response = await fetch(`${API_BASE_URL}/api/search/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ query }),
+    signal,
+  });
+
+  if (!response.ok) {
+    const body = await response.json().catch(() => ({}));
+    throw new Error(body.detail || `Search failed (${response.status})`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  const dispatch = (block) => {
+    let event = 'message';
+    let data = '';
+    for (const line of block.split('\n')) {
+      if (line.startsWith('event: ')) event = line.slice(7);
+      else if (line.startsWith('data: ')) data += line.slice(6);
+    }
+    if (!data) return;
+
+    const payload = JSON.parse(data);
+    if (event === 'text') handlers.onText?.(payload.text);
+    else if (event === 'products') handlers.onProducts?.(payload.products);
+    else if (event === 'done') handlers.onDone?.(payload.session_id);
+    else if (event === 'error') throw new Error(payload.detail);
+  };
+
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+
+    buffer += decoder.decode(value, { stream: true });
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      dispatch(buffer.slice(0, boundary));
+      buffer = buffer.slice(boundary + 2);
+    }
+  }
+  if (buffer.trim()) dispatch(buffer);
+};
+
 // Get categories
 export const getCategories = async () => {
   try {
@@ -72,4 +139,23 @@ export const getCategories = async () => {
   }
 };
 
+// Get product counts per type, color, brand and size for the given filters
+export const getFacets = async (filters = {}) => {
+  try {
+    const params = new URLSearchParams();
+
+    if (filters.type) params.append('type', filters.type);
+    if (filters.color) params.append('color', filters.color);
+    if (filters.size) params.append('size', filters.size);
+    if (filters.price_min) params.append('price_min', filters.price_min);
+    if (filters.price_max) params.append('price_max', filters.price_max);
+
+    const response = await api.get(`/api/facets?${params.toString()}`);
+    return response.data;
+  } catch (error) {
+    console.error('Error fetching facets:', error);
+    throw error;
+  }
+};
+
 export default api;
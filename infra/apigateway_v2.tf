@@ -8,7 +8,8 @@ resource "aws_apigatewayv2_api" "api" {
   cors_configuration {
     allow_origins     = ["https://${local.full_domain}"]
     allow_methods     = ["GET", "POST", "OPTIONS"]
-    allow_headers     = ["Content-Type", "Authorization"]
+    allow_headers     = ["Content-Type", "Authorization", "If-None-Match"]
+    expose_headers    = ["ETag"]
     allow_credentials = true
     max_age           = 3600
   }
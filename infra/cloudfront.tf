@@ -9,6 +9,50 @@ resource "aws_cloudfront_origin_access_control" "frontend" {
   signing_protocol                  = "sigv4"
 }
 
+# API reads (products, featured, categories, facets) are cached at the edge for
+# as long as the backend's Cache-Control allows, keyed on the full query string.
+# CloudFront revalidates expired entries with If-None-Match, which the backend
+# answers with a 304 from the catalog version alone.
+resource "aws_cloudfront_cache_policy" "api" {
+  name        = "shop-api-origin-cache-control"
+  comment     = "Honor the API's Cache-Control; vary on query string"
+  min_ttl     = 0
+  default_ttl = 0
+  max_ttl     = 3600
+
+  parameters_in_cache_key_and_forwarded_to_origin {
+    enable_accept_encoding_gzip   = true
+    enable_accept_encoding_brotli = true
+
+    cookies_config {
+      cookie_behavior = "none"
+    }
+    headers_config {
+      header_behavior = "none"
+    }
+    query_strings_config {
+      query_string_behavior = "all"
+    }
+  }
+}
+
+# Handle SPA routing - serve index.html for app routes (paths without a file extension)
+resource "aws_cloudfront_function" "spa_routing" {
+  name    = "shop-spa-routing"
+  runtime = "cloudfront-js-2.0"
+  comment = "Rewrite client-side routes to /index.html"
+  publish = true
+  code    = <<-EOT
+    function handler(event) {
+      var request = event.request;
+      if (!request.uri.includes('.')) {
+        request.uri = '/index.html';
+      }
+      return request;
+    }
+  EOT
+}
+
 resource "aws_cloudfront_distribution" "frontend" {
   enabled             = true
   is_ipv6_enabled     = true
@@ -23,6 +67,32 @@ resource "aws_cloudfront_distribution" "frontend" {
     origin_access_control_id = aws_cloudfront_origin_access_control.frontend.id
   }
 
+  origin {
+    domain_name = local.api_domain
+    origin_id   = "API-${local.api_domain}"
+
+    custom_origin_config {
+      http_port              = 80
+      https_port             = 443
+      origin_protocol_policy = "https-only"
+      origin_ssl_protocols   = ["TLSv1.2"]
+    }
+  }
+
+  # Same-origin API access through the CDN: point VITE_API_GATEWAY_URL at the
+  # site domain to have catalog reads served from the edge. Searches (POST)
+  # pass straight through, since CloudFront never caches POST responses.
+  ordered_cache_behavior {
+    path_pattern             = "/api/*"
+    allowed_methods          = ["DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"]
+    cached_methods           = ["GET", "HEAD"]
+    target_origin_id         = "API-${local.api_domain}"
+    cache_policy_id          = aws_cloudfront_cache_policy.api.id
+    origin_request_policy_id = "b689b0a8-53d0-40ab-baf2-68738e2966ac" # Managed-AllViewerExceptHostHeader
+    viewer_protocol_policy   = "redirect-to-https"
+    compress                 = true
+  }
+
   default_cache_behavior {
     allowed_methods  = ["GET", "HEAD", "OPTIONS"]
     cached_methods   = ["GET", "HEAD"]
@@ -40,20 +110,15 @@ resource "aws_cloudfront_distribution" "frontend" {
     default_ttl            = 3600
     max_ttl                = 86400
     compress               = true
-  }
 
-  # Handle SPA routing - return index.html for 404s
-  custom_error_response {
-    error_code         = 404
-    response_code      = 200
-    response_page_path = "/index.html"
+    function_association {
+      event_type   = "viewer-request"
+      function_arn = aws_cloudfront_function.spa_routing.arn
+    }
   }
 
-  custom_error_response {
-    error_code         = 403
-    response_code      = 200
-    response_page_path = "/index.html"
-  }
+  # SPA routing is done by the spa_routing function on the default behavior.
+  # custom_error_response would also rewrite API 404s into index.html.
 
   restrictions {
     geo_restriction {
@@ -7,4 +7,69 @@ resource "aws_dynamodb_table" "shoe-inventory-table" {
     name = "shoe_id"
     type = "S"
   }
-}
\ No newline at end of file
+
+  attribute {
+    name = "type"
+    type = "S"
+  }
+
+  attribute {
+    name = "color"
+    type = "S"
+  }
+
+  # "<type>#<color>", written by data/populate_db.py
+  attribute {
+    name = "type_color"
+    type = "S"
+  }
+
+  attribute {
+    name = "price"
+    type = "N"
+  }
+
+  # Set only on featured products, which keeps featured-rating-index sparse
+  attribute {
+    name = "featured_key"
+    type = "S"
+  }
+
+  attribute {
+    name = "rating"
+    type = "N"
+  }
+
+  # Indexes used by the backend's filter query planner. Price is the sort
+  # key on each, so price ranges are key conditions and results come back
+  # price-sorted.
+  global_secondary_index {
+    name            = "type-price-index"
+    hash_key        = "type"
+    range_key       = "price"
+    projection_type = "ALL"
+  }
+
+  global_secondary_index {
+    name            = "color-price-index"
+    hash_key        = "color"
+    range_key       = "price"
+    projection_type = "ALL"
+  }
+
+  global_secondary_index {
+    name            = "type_color-price-index"
+    hash_key        = "type_color"
+    range_key       = "price"
+    projection_type = "ALL"
+  }
+
+  # Sparse index: only items carrying featured_key appear in it, so the
+  # homepage query reads the featured shoes and nothing else
+  global_secondary_index {
+    name            = "featured-rating-index"
+    hash_key        = "featured_key"
+    range_key       = "rating"
+    projection_type = "ALL"
+  }
+}
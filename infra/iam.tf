@@ -26,7 +26,8 @@ resource "aws_iam_policy" "database_read_policy"{
         Action = [
           "dynamodb:GetItem",
           "dynamodb:Query",
-          "dynamodb:Scan"
+          "dynamodb:Scan",
+          "dynamodb:DescribeTable"
         ]
         Effect = "Allow",
         Resource = aws_dynamodb_table.shoe-inventory-table.arn
@@ -1,6 +1,17 @@
 data "archive_file" "search_shoes" {
   type = "zip"
-  source_file = "../lambda/search_shoes/lambda_function.py"
+
+  source {
+    content  = file("../lambda/search_shoes/lambda_function.py")
+    filename = "lambda_function.py"
+  }
+
+  # Wire-format helpers shared with the backend API
+  source {
+    content  = file("../backend/app/dynamodb_codec.py")
+    filename = "dynamodb_codec.py"
+  }
+
   output_path = "../lambda/search_shoes/lambda_function.zip"
 }
 
@@ -11,6 +22,18 @@ resource "aws_lambda_function" "search_shoes" {
   handler       = "lambda_function.lambda_handler"
   runtime       = "python3.11"
   source_code_hash = data.archive_file.search_shoes.output_base64sha256
+
+  environment {
+    variables = {
+      SCAN_SEGMENTS           = "0"
+      MAX_AGENT_RESULTS       = "10"
+      SUMMARY_THRESHOLD       = "50"
+      CATALOG_TTL_SECONDS     = "300"
+      CATALOG_MAX_AGE_SECONDS = "900"
+      LOG_LEVEL               = "INFO"
+      LOG_SAMPLE_RATE         = "0.1"
+    }
+  }
 }
 
 # Allow Bedrock to invoke the search_shoes Lambda
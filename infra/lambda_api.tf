@@ -36,8 +36,10 @@ resource "aws_iam_role_policy" "api_lambda_dynamodb" {
         Effect = "Allow"
         Action = [
           "dynamodb:GetItem",
+          "dynamodb:BatchGetItem",
           "dynamodb:Scan",
-          "dynamodb:Query"
+          "dynamodb:Query",
+          "dynamodb:DescribeTable"
         ]
         Resource = [
           aws_dynamodb_table.shoe-inventory-table.arn,
@@ -84,6 +86,8 @@ resource "aws_lambda_function" "api" {
       BEDROCK_AGENT_ALIAS_ID = var.bedrock_agent_alias_id
       AWS_REGION_NAME        = var.aws_region
       MOCK_MODE              = "false"
+      CATALOG_CACHE_TTL_SECONDS = "60"
+      DYNAMODB_SCAN_SEGMENTS    = "0"
       CORS_ORIGINS_STR       = "https://${local.full_domain}"
     }
   }
@@ -1,24 +1,186 @@
 import boto3
 import json
-from decimal import Decimal
-from boto3.dynamodb.conditions import Attr
+import logging
+import math
+import os
+import random
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 
+try:
+    from dynamodb_codec import deserialize_item
+except ImportError:  # running from the repo rather than the packaged zip
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', 'backend', 'app'))
+    from dynamodb_codec import deserialize_item
 
-class DecimalEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            if obj % 1 == 0:
-                return int(obj)
-            return float(obj)
-        return super().default(obj)
+TABLE_NAME = 'ShoeInventory'
 
-dynamodb = boto3.resource('dynamodb')
-table = dynamodb.Table('ShoeInventory')
+# Parallel scan segments; 1 scans page by page, 0 derives from table size
+SCAN_SEGMENTS = int(os.environ.get('SCAN_SEGMENTS', '1'))
+SCAN_SEGMENT_TARGET_BYTES = 4 * 1024 * 1024
+MAX_SCAN_SEGMENTS = 16
 
-def scan_table(shoe_parameters):
-    filter_expression = None
+# Warm containers keep the catalog in memory. After CATALOG_TTL_SECONDS it is
+# revalidated against the version in the catalog metadata item (see
+# DynamoDBClient.rebuild_categories); 0 scans on every invocation. That item
+# only changes when it is rebuilt, so a catalog older than
+# CATALOG_MAX_AGE_SECONDS is scanned again even if the version matches.
+CATALOG_TTL_SECONDS = float(os.environ.get('CATALOG_TTL_SECONDS', '300'))
+CATALOG_MAX_AGE_SECONDS = float(os.environ.get('CATALOG_MAX_AGE_SECONDS', '900'))
+CATALOG_META_ID = '__catalog_meta__'
 
-    # Shoe Parameters
+# Fields the agent needs to describe a match; the backend hydrates the rest
+# from its own catalog by shoe_id
+AGENT_FIELDS = ('shoe_id', 'name', 'brand', 'type', 'color', 'price', 'rating')
+
+# The agent gets at most MAX_AGENT_RESULTS matches, best first. Above
+# SUMMARY_THRESHOLD matches it gets a summary instead, so it can ask the
+# user to narrow the search rather than read hundreds of items.
+MAX_AGENT_RESULTS = int(os.environ.get('MAX_AGENT_RESULTS', '10'))
+SUMMARY_THRESHOLD = int(os.environ.get('SUMMARY_THRESHOLD', '50'))
+
+# Logging: LOG_LEVEL=DEBUG adds full event dumps. The one-line invocation
+# summary is written for a LOG_SAMPLE_RATE fraction of invocations; errors
+# are always logged.
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_SAMPLE_RATE = float(os.environ.get('LOG_SAMPLE_RATE', '0.1'))
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per log line, with the record's 'fields' merged in."""
+
+    def format(self, record):
+        entry = {'level': record.levelname, 'message': record.getMessage()}
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def build_logger():
+    log = logging.getLogger('search_shoes')
+    if not log.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(JsonFormatter())
+        log.addHandler(handler)
+    log.setLevel(LOG_LEVEL)
+    # The Lambda runtime's root handler would print every record a second time
+    log.propagate = False
+    return log
+
+
+logger = build_logger()
+
+
+def log_invocation(summary, started):
+    """Write the sampled one-line summary of an invocation."""
+    if summary.get('error') is None and random.random() >= LOG_SAMPLE_RATE:
+        return
+    level = logging.ERROR if summary.get('error') else logging.INFO
+    if logger.isEnabledFor(level):
+        summary['latency_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        logger.log(level, 'invocation', extra={'fields': summary})
+
+
+# The low-level client returns wire JSON, which deserialize_item decodes
+# straight to ints and floats instead of the resource layer's Decimals
+dynamodb = boto3.client('dynamodb')
+
+# Module level, so it survives between invocations of a warm container
+_catalog = {'items': None, 'version': None, 'checked_at': 0.0, 'scanned_at': 0.0}
+
+
+def resolve_scan_segments():
+    if SCAN_SEGMENTS > 0:
+        return min(SCAN_SEGMENTS, MAX_SCAN_SEGMENTS)
+    try:
+        description = dynamodb.describe_table(TableName=TABLE_NAME)['Table']
+        table_size = int(description.get('TableSizeBytes') or 0)
+    except Exception:
+        table_size = 0
+    return max(1, min(MAX_SCAN_SEGMENTS, math.ceil(table_size / SCAN_SEGMENT_TARGET_BYTES)))
+
+
+def scan_segment(scan_kwargs):
+    scan_kwargs = dict(scan_kwargs, TableName=TABLE_NAME)
+    items = []
+    while True:
+        response = dynamodb.scan(**scan_kwargs)
+        items.extend(deserialize_item(item) for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    return items
+
+
+def parallel_scan(**scan_kwargs):
+    total_segments = resolve_scan_segments()
+    if total_segments <= 1:
+        return scan_segment(scan_kwargs)
+
+    segment_kwargs = [
+        dict(scan_kwargs, Segment=segment, TotalSegments=total_segments)
+        for segment in range(total_segments)
+    ]
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        segments = list(executor.map(scan_segment, segment_kwargs))
+    return [item for items in segments for item in items]
+
+
+def read_catalog_version():
+    """Version of the stored catalog from its metadata item (one small GetItem)."""
+    response = dynamodb.get_item(
+        TableName=TABLE_NAME,
+        Key={'shoe_id': {'S': CATALOG_META_ID}},
+        ProjectionExpression='#version',
+        ExpressionAttributeNames={'#version': 'version'},
+    )
+    return deserialize_item(response.get('Item', {})).get('version')
+
+
+def load_catalog():
+    """
+    Return (products, cache status) from the warm-container cache.
+
+    Within CATALOG_TTL_SECONDS of the last check the cached catalog is used
+    without touching the table ("hit"). After that the metadata version is
+    read: if it is unchanged the cache is kept for another TTL
+    ("revalidated"), otherwise the table is scanned again ("miss"). Writes
+    that skip the metadata rebuild leave the version unchanged, so the cache
+    is never revalidated past CATALOG_MAX_AGE_SECONDS since the last scan.
+    """
+    now = time.monotonic()
+    if CATALOG_TTL_SECONDS <= 0:
+        return scan_catalog(), 'disabled'
+
+    if _catalog['items'] is not None and now - _catalog['checked_at'] < CATALOG_TTL_SECONDS:
+        return _catalog['items'], 'hit'
+
+    if (
+        _catalog['items'] is not None
+        and _catalog['version'] is not None
+        and now - _catalog['scanned_at'] < CATALOG_MAX_AGE_SECONDS
+    ):
+        if read_catalog_version() == _catalog['version']:
+            _catalog['checked_at'] = now
+            return _catalog['items'], 'revalidated'
+
+    # Read the version first, so a write during the scan only causes an extra reload
+    version = read_catalog_version()
+    _catalog.update(items=scan_catalog(), version=version, checked_at=now, scanned_at=now)
+    return _catalog['items'], 'miss'
+
+
+def scan_catalog():
+    """Scan every product (all pages and segments), without the metadata item."""
+    return [item for item in parallel_scan() if item.get('shoe_id') != CATALOG_META_ID]
+
+
+def filter_items(items, shoe_parameters):
+    """Apply the agent's type, color, size and price filters in memory."""
     shoe_type = shoe_parameters.get('type')
     shoe_color = shoe_parameters.get('color')
     shoe_size = shoe_parameters.get('size')
@@ -26,48 +188,92 @@ def scan_table(shoe_parameters):
     shoe_max_price = shoe_parameters.get('max_price')
 
     if shoe_type:
-        condition = Attr('type').eq(shoe_type)
-        if filter_expression is None:
-            filter_expression = condition
-        else:
-            filter_expression = filter_expression & condition
-
+        items = [item for item in items if item.get('type') == shoe_type]
     if shoe_color:
-        condition = Attr('color').eq(shoe_color)
-        if filter_expression is None:
-            filter_expression = condition
-        else:
-            filter_expression = filter_expression & condition
-
+        items = [item for item in items if item.get('color') == shoe_color]
     if shoe_size:
-        condition = Attr('size').eq(shoe_size)
-        if filter_expression is None:
-            filter_expression = condition
-        else:
-            filter_expression = filter_expression & condition
-
+        size = float(shoe_size)
+        items = [
+            item for item in items
+            if item.get('size') == size or size in (item.get('sizes') or ())
+        ]
     if shoe_min_price:
-        condition = Attr('price').gte(shoe_min_price)
-        if filter_expression is None:
-            filter_expression = condition
-        else:
-            filter_expression = filter_expression & condition
-
+        low = float(shoe_min_price)
+        items = [item for item in items if 'price' in item and item['price'] >= low]
     if shoe_max_price:
-        condition = Attr('price').lte(shoe_max_price)
-        if filter_expression is None:
-            filter_expression = condition
-        else:
-            filter_expression = filter_expression & condition
+        high = float(shoe_max_price)
+        items = [item for item in items if 'price' in item and item['price'] <= high]
+    return items
+
+
+def search_catalog(shoe_parameters):
+    """Return (matching products, catalog cache status)."""
+    items, cache_status = load_catalog()
+    return filter_items(items, shoe_parameters), cache_status
+
+
+def target_price(shoe_parameters):
+    """Price the user is aiming for: mid-range, or the single bound given."""
+    low = shoe_parameters.get('min_price')
+    high = shoe_parameters.get('max_price')
+    if low and high:
+        return (float(low) + float(high)) / 2
+    if low or high:
+        return float(low or high)
+    return None
+
+
+def rank_results(items, shoe_parameters):
+    """Best matches first: highest rating, then price closest to the target (cheapest if none)."""
+    target = target_price(shoe_parameters)
+
+    def sort_key(item):
+        price = item.get('price', 0)
+        fit = abs(price - target) if target is not None else price
+        return (-(item.get('rating') or 0), fit, item.get('shoe_id', ''))
+
+    return sorted(items, key=sort_key)
+
+
+def summarize_results(items):
+    """Counts by brand and color and price quartiles for a large result set."""
+    prices = sorted(item['price'] for item in items if 'price' in item)
+    summary = {
+        'by_brand': dict(Counter(item.get('brand', 'unknown') for item in items).most_common()),
+        'by_color': dict(Counter(item.get('color', 'unknown') for item in items).most_common()),
+    }
+    if len(prices) >= 2:
+        q1, median, q3 = statistics.quantiles(prices, n=4, method='inclusive')
+        summary['price_quartiles'] = {
+            'min': prices[0], 'q1': round(q1, 2), 'median': round(median, 2),
+            'q3': round(q3, 2), 'max': prices[-1],
+        }
+    return summary
+
+
+def compact_results(items, shoe_parameters=None):
+    """
+    Agent response body: match count plus the AGENT_FIELDS of the top matches,
+    or a summary instead of products when there are too many to list.
+    """
+    body = {'count': len(items)}
+    if len(items) > SUMMARY_THRESHOLD:
+        body['summary'] = summarize_results(items)
+        return body
+
+    top = rank_results(items, shoe_parameters or {})[:MAX_AGENT_RESULTS]
+    body['truncated'] = len(items) > len(top)
+    body['products'] = [
+        {field: item[field] for field in AGENT_FIELDS if field in item} for item in top
+    ]
+    return body
 
-    if filter_expression:
-        objects = table.scan(FilterExpression=filter_expression)
-    else:
-        objects = table.scan()
-    return objects['Items']
 
 def lambda_handler(event, context):
-    print("Received event:", json.dumps(event, default=str))
+    started = time.perf_counter()
+    summary = {}
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug('event', extra={'fields': {'event': event}})
 
     try:
         # Check if this is a Bedrock Agent invocation
@@ -77,8 +283,7 @@ def lambda_handler(event, context):
             function = event.get('function', '')
             parameters = event.get('parameters', [])
 
-            print(f"Action Group: {action_group}, Function: {function}")
-            print(f"Parameters: {parameters}")
+            summary.update(action_group=action_group, function=function)
 
             # Convert parameters list to dict
             shoe_parameters = {}
@@ -94,13 +299,18 @@ def lambda_handler(event, context):
                             pass
                     shoe_parameters[name] = value
 
-            print(f"Shoe parameters: {shoe_parameters}")
+            summary['parameters'] = sorted(shoe_parameters)
 
-            scanned_objects = scan_table(shoe_parameters)
-            print(f"Found {len(scanned_objects)} shoes")
+            scanned_objects, summary['catalog_cache'] = search_catalog(shoe_parameters)
+            summary['results'] = len(scanned_objects)
 
-            # Format response for Bedrock Agent
-            result_text = json.dumps(scanned_objects, cls=DecimalEncoder)
+            # Format response for Bedrock Agent. Full documents would be
+            # tokenized by the agent and echoed in the trace, so send only
+            # what it needs to phrase the answer.
+            result_text = json.dumps(
+                compact_results(scanned_objects, shoe_parameters),
+                separators=(',', ':'),
+            )
 
             return {
                 'messageVersion': '1.0',
@@ -123,7 +333,9 @@ def lambda_handler(event, context):
                 body = json.loads(body)
 
             shoe_parameters = body.get('ShoeParameters', {})
-            scanned_objects = scan_table(shoe_parameters)
+            summary.update(function='api', parameters=sorted(shoe_parameters))
+            scanned_objects, summary['catalog_cache'] = search_catalog(shoe_parameters)
+            summary['results'] = len(scanned_objects)
 
             return {
                 "statusCode": 200,
@@ -131,11 +343,11 @@ def lambda_handler(event, context):
                     "Content-Type": "application/json",
                     "Access-Control-Allow-Origin": "*"
                 },
-                "body": json.dumps(scanned_objects, cls=DecimalEncoder)
+                "body": json.dumps(scanned_objects)
             }
 
     except Exception as e:
-        print(f"Error: {str(e)}")
+        summary['error'] = str(e)
         # Return error in Bedrock format if it looks like a Bedrock request
         if 'agent' in event or 'actionGroup' in event:
             return {
@@ -157,3 +369,5 @@ def lambda_handler(event, context):
                 "statusCode": 500,
                 "body": json.dumps({"error": str(e)})
             }
+    finally:
+        log_invocation(summary, started)
@@ -0,0 +1,283 @@
+"""
+Test cases for the search_shoes Lambda function.
+Catalog loading is patched per test; table reads use a moto table.
+"""
+import os
+import sys
+from decimal import Decimal
+
+import pytest
+
+# The module creates its boto3 resource at import time
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import lambda_function  # noqa: E402
+from lambda_function import compact_results, rank_results, summarize_results  # noqa: E402
+
+
+def shoe(shoe_id, price, rating=None, **fields):
+    """An item as scan_catalog returns it (wire-decoded ints and floats)"""
+    item = {"shoe_id": shoe_id, "price": price, "name": f"Shoe {shoe_id}",
+            "description": "not sent to the agent", **fields}
+    if rating is not None:
+        item["rating"] = rating
+    return item
+
+
+class TestRankResults:
+    """Test suite for ordering agent results"""
+
+    def test_highest_rating_first(self):
+        """Test items are ordered by rating, best first"""
+        items = [shoe("a", 100, 4.0), shoe("b", 100, 4.8), shoe("c", 100, 4.5)]
+
+        assert [i["shoe_id"] for i in rank_results(items, {})] == ["b", "c", "a"]
+
+    def test_rating_ties_cheapest_first_without_price_filter(self):
+        """Test equal ratings fall back to the lowest price"""
+        items = [shoe("a", 120, 4.5), shoe("b", 80, 4.5), shoe("c", 100, 4.5)]
+
+        assert [i["shoe_id"] for i in rank_results(items, {})] == ["b", "c", "a"]
+
+    def test_rating_ties_closest_to_target_price(self):
+        """Test equal ratings are ordered by distance from the requested range's midpoint"""
+        items = [shoe("a", 50, 4.5), shoe("b", 110, 4.5), shoe("c", 95, 4.5)]
+
+        ranked = rank_results(items, {"min_price": 80.0, "max_price": 120.0})
+
+        assert [i["shoe_id"] for i in ranked] == ["c", "b", "a"]
+
+    def test_full_ties_ordered_by_shoe_id(self):
+        """Test identical rating and price keep a deterministic order"""
+        items = [shoe("z", 100, 4.5), shoe("m", 100, 4.5), shoe("a", 100, 4.5)]
+
+        assert [i["shoe_id"] for i in rank_results(items, {})] == ["a", "m", "z"]
+
+    def test_unrated_items_last(self):
+        """Test items without a rating rank below rated ones"""
+        items = [shoe("a", 50), shoe("b", 200, 3.0)]
+
+        assert [i["shoe_id"] for i in rank_results(items, {})] == ["b", "a"]
+
+    def test_empty_results(self):
+        """Test ranking no items returns an empty list"""
+        assert rank_results([], {"max_price": 100.0}) == []
+
+
+class TestSummarizeResults:
+    """Test suite for summaries of large result sets"""
+
+    def test_counts_and_quartiles(self):
+        """Test counts by brand and color and the price quartiles"""
+        items = [
+            shoe(str(i), price, brand="Nike" if i < 3 else "Puma", color="red")
+            for i, price in enumerate([40, 60, 80, 100, 120])
+        ]
+
+        summary = summarize_results(items)
+
+        assert summary["by_brand"] == {"Nike": 3, "Puma": 2}
+        assert summary["by_color"] == {"red": 5}
+        assert summary["price_quartiles"] == {
+            "min": 40.0, "q1": 60.0, "median": 80.0, "q3": 100.0, "max": 120.0,
+        }
+
+    def test_empty_results(self):
+        """Test an empty result set has empty counts and no quartiles"""
+        assert summarize_results([]) == {"by_brand": {}, "by_color": {}}
+
+
+class TestCompactResults:
+    """Test suite for the agent response body"""
+
+    def test_payload_shape(self):
+        """Test the body lists only AGENT_FIELDS of the ranked matches"""
+        items = [shoe("a", 100, 4.0, brand="Nike", type="running", color="red", sizes=[9]),
+                 shoe("b", 90, 4.9, brand="Puma", type="running", color="red", sizes=[10])]
+
+        body = compact_results(items, {})
+
+        assert set(body) == {"count", "truncated", "products"}
+        assert body["count"] == 2
+        assert body["truncated"] is False
+        assert [p["shoe_id"] for p in body["products"]] == ["b", "a"]
+        assert all(set(p) <= set(lambda_function.AGENT_FIELDS) for p in body["products"])
+        assert "description" not in body["products"][0]
+        assert "sizes" not in body["products"][0]
+
+    def test_truncated_to_max_results(self, monkeypatch):
+        """Test only the top MAX_AGENT_RESULTS matches are listed"""
+        monkeypatch.setattr(lambda_function, "MAX_AGENT_RESULTS", 2)
+        items = [shoe(str(i), 100, 3.0 + i / 10) for i in range(5)]
+
+        body = compact_results(items, {})
+
+        assert body["count"] == 5
+        assert body["truncated"] is True
+        assert [p["shoe_id"] for p in body["products"]] == ["4", "3"]
+
+    def test_summary_above_threshold(self, monkeypatch):
+        """Test a summary replaces the product list above SUMMARY_THRESHOLD"""
+        monkeypatch.setattr(lambda_function, "SUMMARY_THRESHOLD", 3)
+        items = [shoe(str(i), 50 + i, 4.0, brand="Nike", color="blue") for i in range(4)]
+
+        body = compact_results(items, {})
+
+        assert set(body) == {"count", "summary"}
+        assert body["count"] == 4
+        assert body["summary"]["by_brand"] == {"Nike": 4}
+
+    def test_empty_results(self):
+        """Test no matches give an empty, untruncated product list"""
+        assert compact_results([], {}) == {"count": 0, "truncated": False, "products": []}
+
+
+class TestLoadCatalog:
+    """Test suite for the warm-container catalog cache"""
+
+    @pytest.fixture
+    def table(self, monkeypatch):
+        """Fake clock, metadata version and scans; returns the mutable state"""
+        state = {"now": 1000.0, "version": "v1", "catalog": [shoe("a", 100)], "scans": 0}
+
+        def scan_catalog():
+            state["scans"] += 1
+            return list(state["catalog"])
+
+        monkeypatch.setattr(lambda_function, "_catalog", {
+            "items": None, "version": None, "checked_at": 0.0, "scanned_at": 0.0,
+        })
+        monkeypatch.setattr(lambda_function, "CATALOG_TTL_SECONDS", 300.0)
+        monkeypatch.setattr(lambda_function, "CATALOG_MAX_AGE_SECONDS", 900.0)
+        monkeypatch.setattr(lambda_function.time, "monotonic", lambda: state["now"])
+        monkeypatch.setattr(lambda_function, "read_catalog_version", lambda: state["version"])
+        monkeypatch.setattr(lambda_function, "scan_catalog", scan_catalog)
+        return state
+
+    def test_first_load_is_miss(self, table):
+        """Test a cold container scans the table"""
+        items, status = lambda_function.load_catalog()
+
+        assert status == "miss"
+        assert [i["shoe_id"] for i in items] == ["a"]
+        assert table["scans"] == 1
+
+    def test_hit_within_ttl(self, table):
+        """Test the cached catalog is used without reading the table within the TTL"""
+        lambda_function.load_catalog()
+        table["now"] += 299
+        table["version"] = "v2"
+
+        _, status = lambda_function.load_catalog()
+
+        assert status == "hit"
+        assert table["scans"] == 1
+
+    def test_revalidated_when_version_unchanged(self, table):
+        """Test an unchanged metadata version keeps the catalog for another TTL"""
+        lambda_function.load_catalog()
+        table["now"] += 301
+
+        _, status = lambda_function.load_catalog()
+        table["now"] += 200
+        _, next_status = lambda_function.load_catalog()
+
+        assert status == "revalidated"
+        assert next_status == "hit"
+        assert table["scans"] == 1
+
+    def test_miss_when_version_changed(self, table):
+        """Test a new metadata version rescans the table"""
+        lambda_function.load_catalog()
+        table["now"] += 301
+        table["version"] = "v2"
+        table["catalog"] = [shoe("a", 100), shoe("b", 90)]
+
+        items, status = lambda_function.load_catalog()
+
+        assert status == "miss"
+        assert [i["shoe_id"] for i in items] == ["a", "b"]
+        assert table["scans"] == 2
+
+    def test_rescanned_after_max_age_without_version_change(self, table):
+        """Test writes without a metadata rebuild are picked up after CATALOG_MAX_AGE_SECONDS"""
+        lambda_function.load_catalog()
+        table["catalog"] = [shoe("b", 90)]
+        for _ in range(2):
+            table["now"] += 301
+            assert lambda_function.load_catalog()[1] == "revalidated"
+
+        table["now"] += 301
+        items, status = lambda_function.load_catalog()
+
+        assert status == "miss"
+        assert [i["shoe_id"] for i in items] == ["b"]
+
+    def test_missing_version_always_rescans(self, table):
+        """Test a table without a metadata item is rescanned after every TTL"""
+        table["version"] = None
+        lambda_function.load_catalog()
+        table["now"] += 301
+
+        assert lambda_function.load_catalog()[1] == "miss"
+        assert table["scans"] == 2
+
+    def test_disabled(self, table, monkeypatch):
+        """Test CATALOG_TTL_SECONDS=0 scans on every call"""
+        monkeypatch.setattr(lambda_function, "CATALOG_TTL_SECONDS", 0.0)
+
+        assert lambda_function.load_catalog()[1] == "disabled"
+        assert lambda_function.load_catalog()[1] == "disabled"
+        assert table["scans"] == 2
+
+
+class TestTableReads:
+    """Test suite for scanning and versioning through the low-level client"""
+
+    @pytest.fixture
+    def table(self, monkeypatch):
+        """Moto ShoeInventory table the module's client reads"""
+        import boto3
+        from moto import mock_aws
+
+        with mock_aws():
+            table = boto3.resource("dynamodb", region_name="us-east-1").create_table(
+                TableName="ShoeInventory",
+                KeySchema=[{"AttributeName": "shoe_id", "KeyType": "HASH"}],
+                AttributeDefinitions=[{"AttributeName": "shoe_id", "AttributeType": "S"}],
+                BillingMode="PAY_PER_REQUEST",
+            )
+            monkeypatch.setattr(
+                lambda_function, "dynamodb", boto3.client("dynamodb", region_name="us-east-1")
+            )
+            yield table
+
+    def test_scan_decodes_numbers(self, table):
+        """Test scanned items have ints and floats instead of Decimals"""
+        table.put_item(Item={"shoe_id": "a", "price": Decimal("89.99"),
+                             "sizes": [Decimal("9"), Decimal("9.5")], "rating": Decimal("4")})
+        table.put_item(Item={"shoe_id": lambda_function.CATALOG_META_ID, "version": "v1"})
+
+        items = lambda_function.scan_catalog()
+
+        assert items == [{"shoe_id": "a", "price": 89.99, "sizes": [9, 9.5], "rating": 4}]
+        assert lambda_function.filter_items(items, {"size": 9.0, "max_price": 90.0}) == items
+
+    def test_parallel_scan_reads_every_segment(self, table, monkeypatch):
+        """Test a segmented scan returns every item once"""
+        monkeypatch.setattr(lambda_function, "SCAN_SEGMENTS", 4)
+        for i in range(20):
+            table.put_item(Item={"shoe_id": f"s{i:02d}", "price": Decimal(i)})
+
+        items = lambda_function.scan_catalog()
+
+        assert sorted(item["shoe_id"] for item in items) == [f"s{i:02d}" for i in range(20)]
+
+    def test_read_catalog_version(self, table):
+        """Test the version comes from the metadata item, or None without one"""
+        assert lambda_function.read_catalog_version() is None
+
+        table.put_item(Item={"shoe_id": lambda_function.CATALOG_META_ID, "version": "v1"})
+
+        assert lambda_function.read_catalog_version() == "v1"
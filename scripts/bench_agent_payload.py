@@ -0,0 +1,91 @@
+"""
+Benchmark the search_shoes action group body: full documents vs compact results.
+
+The agent's observation trace carries the Lambda's TEXT body verbatim, and the
+agent reads all of it as input tokens. This script builds result sets from a
+synthetic catalog and reports, per result size, the body bytes and a rough
+token estimate (about 4 bytes per token) for the old full-document body and the
+compact {count, products} body, plus the backend-side cost of parsing each
+body (and, for the compact one, hydrating full products from an in-memory
+catalog as the snapshot cache does). The top-N cap and summary mode are
+turned off so the two formats list the same products; with them on, the
+compact body stays bounded whatever the result size. The latency the agent itself saves on
+fewer input tokens needs a live agent and is not measured here.
+
+Usage (from the repo root):
+    python scripts/bench_agent_payload.py
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+sys.path.insert(0, str(PROJECT_ROOT / "lambda" / "search_shoes"))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ["MAX_AGENT_RESULTS"] = os.environ["SUMMARY_THRESHOLD"] = str(10**9)
+
+from app.bedrock_client import BedrockClient  # noqa: E402
+from bench_common import best_of, make_catalog  # noqa: E402
+from lambda_function import compact_results  # noqa: E402
+
+RESULT_SIZES = [5, 25, 100, 500]
+DESCRIPTION = "Lightweight mesh upper with a cushioned midsole for all-day comfort"
+
+
+def trace_for(body: str) -> dict:
+    """Wrap a Lambda body the way it appears in the agent's trace event."""
+    return {"trace": {"orchestrationTrace": {"observation": {
+        "actionGroupInvocationOutput": {"text": body}
+    }}}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    catalog = make_catalog(args.items, description=DESCRIPTION)
+    for i, product in enumerate(catalog):
+        product.update(featured=i % 10 == 0, stock=True)
+    by_id = {product["shoe_id"]: product for product in catalog}
+    client = BedrockClient(
+        agent_id="bench",
+        agent_alias_id="bench",
+        mock_mode=True,
+        product_loader=lambda ids: [by_id[i] for i in ids if i in by_id],
+    )
+
+    print(
+        f"{'results':>7} {'full (B)':>10} {'compact (B)':>11} {'reduction':>9} "
+        f"{'~tokens saved':>13} {'full parse (ms)':>15} {'compact+hydrate (ms)':>20}"
+    )
+    for size in RESULT_SIZES:
+        items = catalog[:size]
+        full_body = json.dumps(items)
+        compact_body = json.dumps(compact_results(items), separators=(",", ":"))
+
+        def full_path():
+            return BedrockClient._extract_products(trace_for(full_body))
+
+        def compact_path():
+            return client._hydrate_products(BedrockClient._extract_products(trace_for(compact_body)))
+
+        assert sorted(compact_path(), key=lambda p: p["shoe_id"]) == full_path()
+
+        full_bytes = len(full_body.encode())
+        compact_bytes = len(compact_body.encode())
+        full_ms = best_of(full_path, args.repeat) * 1000
+        compact_ms = best_of(compact_path, args.repeat) * 1000
+        print(
+            f"{size:>7} {full_bytes:>10} {compact_bytes:>11} "
+            f"{1 - compact_bytes / full_bytes:>8.0%} {(full_bytes - compact_bytes) // 4:>13} "
+            f"{full_ms:>15.3f} {compact_ms:>20.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark dict filtering vs the columnar CatalogIndex on a synthetic catalog.
+
+Both paths answer the same filter combinations over the same in-memory
+products: DynamoDBClient._filter_products (list comprehensions over dicts,
+what the snapshot cache used before) and CatalogIndex.select (bitmap
+intersections plus NumPy price masks). CatalogIndex.count is timed too, since
+counts come from bitmap cardinality without selecting products. Sorted
+top-k queries compare sorted() over the filtered dicts with the index's
+presorted arrays / partial selection.
+Building the index is a one-off cost per snapshot load and is reported
+separately. No AWS account or moto is needed.
+
+Usage (from the repo root):
+    python scripts/bench_catalog_filters.py --items 1000000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from app.catalog_index import CatalogIndex  # noqa: E402
+from app.dynamodb_client import DynamoDBClient  # noqa: E402
+from bench_common import best_of, make_catalog  # noqa: E402
+
+QUERIES = [
+    {"type": "running"},
+    {"color": "black", "size": 9.5},
+    {"type": "boots", "color": "brown", "price_max": 120.0},
+    {"price_min": 75.0, "price_max": 80.0},
+    {"type": "running", "color": "red", "size": 10.0, "price_min": 50.0, "price_max": 200.0},
+]
+
+
+SORTED_QUERIES = [
+    ({"sort_by": "rating", "limit": 10}, {}),
+    ({"sort_by": "price", "limit": 20}, {"type": "running"}),
+    ({"sort_by": "price", "descending": True, "limit": 50}, {"color": "black", "size": 9.5}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"Generating {args.items} products...")
+    products = make_catalog(args.items)
+
+    start = time.perf_counter()
+    index = CatalogIndex(products)
+    print(f"Built CatalogIndex in {time.perf_counter() - start:.2f}s")
+
+    print(
+        f"{'filters':<70} {'dicts (ms)':>10} {'index (ms)':>10} {'speedup':>8} "
+        f"{'count (ms)':>10} {'hits':>8}"
+    )
+    for filters in QUERIES:
+        expected = DynamoDBClient._filter_products(products, **filters)
+        assert index.select(**filters) == expected
+        assert index.count(**filters) == len(expected)
+
+        dicts = best_of(lambda: DynamoDBClient._filter_products(products, **filters), args.repeat)
+        selected = best_of(lambda: index.select(**filters), args.repeat)
+        counted = best_of(lambda: index.count(**filters), args.repeat)
+        label = ", ".join(f"{k}={v}" for k, v in filters.items())
+        print(
+            f"{label:<70} {dicts * 1000:>10.1f} {selected * 1000:>10.1f} "
+            f"{dicts / selected:>7.1f}x {counted * 1000:>10.2f} {len(expected):>8}"
+        )
+
+    print()
+    print(f"{'sorted query':<70} {'dicts (ms)':>10} {'index (ms)':>10} {'speedup':>8}")
+    for sort, filters in SORTED_QUERIES:
+        sign = -1 if sort.get("descending", sort["sort_by"] == "rating") else 1
+
+        def dict_top_k():
+            matches = DynamoDBClient._filter_products(products, **filters)
+            return sorted(matches, key=lambda p: sign * p[sort["sort_by"]])[:sort["limit"]]
+
+        assert index.select(**sort, **filters) == dict_top_k()
+
+        dicts = best_of(dict_top_k, args.repeat)
+        selected = best_of(lambda: index.select(**sort, **filters), args.repeat)
+        label = ", ".join(f"{k}={v}" for k, v in {**sort, **filters}.items())
+        print(f"{label:<70} {dicts * 1000:>10.1f} {selected * 1000:>10.2f} {dicts / selected:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Synthetic catalog and timing helpers shared by the bench_*.py scripts.
+
+Scripts run from the repo root as `python scripts/bench_<name>.py`, which puts
+this directory on sys.path, so they import it as `bench_common`.
+"""
+import random
+import time
+from typing import Callable, Optional
+
+TYPES = ["running", "casual", "formal", "athletic", "boots"]
+COLORS = ["red", "blue", "black", "white", "brown"]
+BRANDS = ["Nike", "Adidas", "Clarks", "Puma", "New Balance"]
+SIZES = [6.0, 6.5, 7.0, 7.5, 8.0, 8.5, 9.0, 9.5, 10.0, 10.5, 11.0, 11.5, 12.0, 13.0]
+
+
+def make_catalog(item_count: int, description: Optional[str] = None) -> list:
+    """
+    Build a reproducible synthetic catalog shaped like ShoeInventory items.
+
+    Args:
+        item_count: Number of products
+        description: If given, every product also gets an image_url and
+            this description, for benchmarks that measure full bodies
+
+    Returns:
+        List of product dicts with plain int and float numbers
+    """
+    rng = random.Random(42)
+    catalog = []
+    for i in range(item_count):
+        product = {
+            "shoe_id": f"shoe-{i:07d}",
+            "name": f"Synthetic Shoe {i}",
+            "brand": rng.choice(BRANDS),
+            "type": rng.choice(TYPES),
+            "color": rng.choice(COLORS),
+            "sizes": sorted(rng.sample(SIZES, rng.randint(2, 6))),
+            "price": round(rng.uniform(30, 250), 2),
+            "rating": round(rng.uniform(3, 5), 1),
+        }
+        if description is not None:
+            product["image_url"] = f"https://placehold.co/300x300?text=Shoe+{i}"
+            product["description"] = description
+        catalog.append(product)
+    return catalog
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    """Run func repeat times and return the fastest wall-clock time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
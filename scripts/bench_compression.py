@@ -0,0 +1,57 @@
+"""
+Report raw vs gzip sizes of /api/products bodies for the seed and synthetic catalogs.
+
+Bodies are serialized the way the endpoint does (ProductListResponse.from_catalog)
+and compressed at several zlib levels, timing each level, to pick
+GZIP_COMPRESS_LEVEL. ResponseCache compresses a cached body once per catalog
+version, so the time column is paid once per body rather than per request for
+cached reads. No AWS account or moto is needed.
+
+Usage (from the repo root):
+    python scripts/bench_compression.py --sizes 10000 100000
+"""
+import argparse
+import gzip
+import json
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from app.models import ProductListResponse  # noqa: E402
+from bench_common import best_of, make_catalog  # noqa: E402
+
+LEVELS = [1, 6, 9]
+
+
+def report(label: str, items: list, repeat: int):
+    body = ProductListResponse.from_catalog(items).model_dump_json().encode()
+    columns = [f"{len(body) / 1024:>10.1f}"]
+    for level in LEVELS:
+        compressed = gzip.compress(body, compresslevel=level, mtime=0)
+        seconds = best_of(lambda: gzip.compress(body, compresslevel=level, mtime=0), repeat)
+        columns.append(
+            f"{len(compressed) / 1024:>9.1f} {len(compressed) / len(body):>6.1%} {seconds * 1000:>8.1f}"
+        )
+    print(f"{label:<18} {' '.join(columns)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    header = " ".join(f"{f'L{level} KiB':>9} {'ratio':>6} {'ms':>8}" for level in LEVELS)
+    print(f"{'catalog':<18} {'raw KiB':>10} {header}")
+
+    seed = json.loads((PROJECT_ROOT / "data" / "seed_data.json").read_text())
+    report(f"seed ({len(seed)})", seed, args.repeat)
+    for size in args.sizes:
+        catalog = make_catalog(size, description="Synthetic benchmark item")
+        report(f"synthetic ({size})", catalog, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark decoding DynamoDB wire items: TypeDeserializer vs dynamodb_codec.
+
+The old read path went through the boto3 resource layer, which runs every
+attribute through TypeDeserializer (building a Decimal per number), and then
+converted the top-level Decimals to floats for JSON. The new path decodes the
+low-level client's wire JSON straight into ints and floats. This script times
+both on synthetic ShoeInventory items; no AWS account or moto is needed.
+
+Usage (from the repo root):
+    python scripts/bench_deserializer.py --items 100000
+"""
+import argparse
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from app.dynamodb_codec import deserialize_item  # noqa: E402
+from bench_common import BRANDS, COLORS, TYPES, best_of  # noqa: E402
+
+
+def make_wire_items(item_count: int) -> list:
+    """Build items in the wire format the low-level client returns."""
+    serializer = TypeSerializer()
+    items = []
+    for i in range(item_count):
+        item = {
+            "shoe_id": f"shoe-{i:07d}",
+            "name": f"Synthetic Shoe {i}",
+            "brand": BRANDS[i % len(BRANDS)],
+            "type": TYPES[i % len(TYPES)],
+            "color": COLORS[(i // 5) % len(COLORS)],
+            "sizes": [Decimal("8"), Decimal("9.5"), Decimal("11")],
+            "price": Decimal(str(40 + (i % 160))) + Decimal("0.99"),
+            "rating": Decimal("4.2"),
+            "featured": i % 10 == 0,
+            "description": "Synthetic benchmark item",
+        }
+        items.append({k: serializer.serialize(v) for k, v in item.items()})
+    return items
+
+
+def resource_path(items: list) -> list:
+    """The old path: TypeDeserializer, then top-level Decimal -> float."""
+    deserializer = TypeDeserializer()
+    products = []
+    for item in items:
+        product = {k: deserializer.deserialize(v) for k, v in item.items()}
+        products.append({
+            k: float(v) if isinstance(v, Decimal) else v for k, v in product.items()
+        })
+    return products
+
+
+def codec_path(items: list) -> list:
+    """The new path: decode wire values straight to Python numbers."""
+    return [deserialize_item(item) for item in items]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    items = make_wire_items(args.items)
+
+    baseline = best_of(lambda: resource_path(items), args.repeat)
+    codec = best_of(lambda: codec_path(items), args.repeat)
+
+    print(f"{'path':>16} {'best (s)':>10} {'us/item':>8} {'speedup':>8}")
+    for name, seconds in [("TypeDeserializer", baseline), ("dynamodb_codec", codec)]:
+        per_item = seconds / args.items * 1e6
+        print(f"{name:>16} {seconds:>10.3f} {per_item:>8.2f} {baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark search_shoes handler overhead: old print logging vs the JSON logger.
+
+The old handler printed the full event, the parameters and two more lines on
+every invocation. This script replays that output ("before") and compares it
+with the structured logger at several LOG_LEVEL / LOG_SAMPLE_RATE settings.
+The catalog is preloaded into the warm-container cache, so only the handler's
+own work is timed; all log output goes to os.devnull. No AWS account is needed.
+
+Usage (from the repo root):
+    python scripts/bench_lambda_logging.py --invocations 20000
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "lambda" / "search_shoes"))
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import lambda_function  # noqa: E402
+
+# A Bedrock Agent event of realistic size (agent metadata, session attributes)
+EVENT = {
+    "messageVersion": "1.0",
+    "agent": {"name": "shoe-search", "id": "AGENT123", "alias": "ALIAS123", "version": "1"},
+    "sessionId": "8f1c2a4e-1d2b-4c5d-9e8f-0a1b2c3d4e5f",
+    "sessionAttributes": {},
+    "promptSessionAttributes": {},
+    "inputText": "red running shoes under $100 in size 10",
+    "actionGroup": "search_shoes",
+    "function": "search_shoes",
+    "parameters": [
+        {"name": "type", "type": "string", "value": "running"},
+        {"name": "color", "type": "string", "value": "red"},
+        {"name": "max_price", "type": "number", "value": "100"},
+    ],
+}
+
+
+def legacy_logging(event):
+    """The prints the handler used to make on every invocation."""
+    print("Received event:", json.dumps(event, default=str))
+    print(f"Action Group: {event['actionGroup']}, Function: {event['function']}")
+    print(f"Parameters: {event['parameters']}")
+    print(f"Shoe parameters: {dict((p['name'], p['value']) for p in event['parameters'])}")
+    print("Found 3 shoes")
+
+
+def make_catalog(item_count: int) -> list:
+    colors = ["red", "blue", "black", "white", "brown"]
+    types = ["running", "casual", "formal", "athletic", "boots"]
+    return [
+        {
+            "shoe_id": f"shoe-{i:05d}",
+            "name": f"Shoe {i}",
+            "brand": "Nike",
+            "type": types[i % len(types)],
+            "color": colors[(i // 5) % len(colors)],
+            "price": 40 + i % 160,
+            "rating": 4.0 + (i % 10) / 10,
+        }
+        for i in range(item_count)
+    ]
+
+
+def time_invocations(count: int, before=None) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        if before:
+            before(EVENT)
+        lambda_function.lambda_handler(EVENT, None)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--invocations", type=int, default=20_000)
+    parser.add_argument("--items", type=int, default=200)
+    args = parser.parse_args()
+
+    lambda_function.CATALOG_TTL_SECONDS = float("inf")
+    lambda_function._catalog.update(
+        items=make_catalog(args.items), version="bench", checked_at=time.monotonic()
+    )
+
+    runs = [
+        ("before: print full event", "CRITICAL", 0.0, legacy_logging),
+        ("after: INFO, sample 1.0", "INFO", 1.0, None),
+        ("after: INFO, sample 0.1", "INFO", 0.1, None),
+        ("after: DEBUG (event dumps)", "DEBUG", 1.0, None),
+    ]
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for handler in lambda_function.logger.handlers:
+            handler.setStream(devnull)
+
+        results = []
+        for label, level, sample_rate, before in runs:
+            lambda_function.logger.setLevel(level)
+            lambda_function.LOG_SAMPLE_RATE = sample_rate
+            seconds = time_invocations(args.invocations, before)
+            results.append((label, seconds / args.invocations * 1e6))
+
+    baseline = results[0][1]
+    print(f"{'configuration':<28} {'us/invocation':>14} {'vs before':>10}")
+    for label, per_call in results:
+        print(f"{label:<28} {per_call:>14.1f} {per_call / baseline:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
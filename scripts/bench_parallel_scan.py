@@ -0,0 +1,125 @@
+"""
+Benchmark page-by-page vs segmented parallel scans of ShoeInventory.
+
+DynamoDBClient.get_all_products runs against a stub of the low-level client
+that serves pre-serialized wire pages the way DynamoDB does: at most 1 MB
+per page, items split across segments, and LastEvaluatedKey to continue.
+Each call sleeps for --latency-ms plus --ms-per-mb for the bytes it returns,
+modelling the round trip and read throughput of one segment, which is what
+parallel segments overlap. The client's own work (building requests and
+decoding every item) runs for real, so the speedup is capped by that
+GIL-bound share. No AWS account or moto is needed; moto serializes items
+in-process at a few ms each, which would swamp the simulated latency.
+
+Usage (from the repo root):
+    python scripts/bench_parallel_scan.py --items 100000 --segments 1 2 4 8 0
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from boto3.dynamodb.types import TypeSerializer
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+from app.dynamodb_client import DynamoDBClient  # noqa: E402
+from bench_common import BRANDS, COLORS, TYPES  # noqa: E402
+
+PAGE_BYTES = 1024 * 1024
+
+
+def make_wire_items(item_count: int) -> list:
+    """Build ShoeInventory items in wire format, with their approximate sizes."""
+    serializer = TypeSerializer()
+    items = []
+    for i in range(item_count):
+        item = {
+            "shoe_id": f"shoe-{i:07d}",
+            "name": f"Synthetic Shoe {i}",
+            "brand": BRANDS[i % len(BRANDS)],
+            "type": TYPES[i % len(TYPES)],
+            "color": COLORS[(i // 5) % len(COLORS)],
+            "sizes": [Decimal("8"), Decimal("9.5"), Decimal("11")],
+            "price": Decimal(str(40 + (i % 160))),
+            "rating": Decimal("4.2"),
+            "description": "Synthetic benchmark item " * 4,
+        }
+        wire = {name: serializer.serialize(value) for name, value in item.items()}
+        items.append((wire, len(json.dumps(wire))))
+    return items
+
+
+class SimulatedScanClient:
+    """Stand-in for the boto3 DynamoDB client's scan and describe_table."""
+
+    def __init__(self, items: list, latency_ms: float, ms_per_mb: float):
+        self.items = items
+        self.latency_ms = latency_ms
+        self.ms_per_mb = ms_per_mb
+        self.calls = 0
+
+    def describe_table(self, TableName):
+        return {"Table": {"TableSizeBytes": sum(size for _, size in self.items)}}
+
+    def scan(self, TableName, Segment=0, TotalSegments=1, ExclusiveStartKey=None, **kwargs):
+        self.calls += 1
+        # Segment s holds every TotalSegments-th item; the key is a position in it
+        position = int(ExclusiveStartKey["position"]["N"]) if ExclusiveStartKey else Segment
+        page, page_bytes = [], 0
+        while position < len(self.items) and page_bytes < PAGE_BYTES:
+            wire, size = self.items[position]
+            page.append(wire)
+            page_bytes += size
+            position += TotalSegments
+
+        time.sleep((self.latency_ms + page_bytes / PAGE_BYTES * self.ms_per_mb) / 1000)
+        response = {"Items": page, "Count": len(page), "ScannedCount": len(page)}
+        if position < len(self.items):
+            response["LastEvaluatedKey"] = {"position": {"N": str(position)}}
+        return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--segments", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--ms-per-mb", type=float, default=100.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    items = make_wire_items(args.items)
+    table_mb = sum(size for _, size in items) / PAGE_BYTES
+    print(
+        f"{args.items} items, {table_mb:.1f} MB; {args.latency_ms:g} ms per call "
+        f"+ {args.ms_per_mb:g} ms per MB"
+    )
+
+    baseline = None
+    print(f"{'segments':>9} {'calls':>6} {'best (s)':>10} {'speedup':>8} {'items':>8}")
+    for segments in args.segments:
+        client = DynamoDBClient(table_name="ShoeInventory", scan_segments=segments)
+        stub = client._boto_client = SimulatedScanClient(items, args.latency_ms, args.ms_per_mb)
+
+        timings = []
+        for _ in range(args.repeat):
+            stub.calls = 0
+            start = time.perf_counter()
+            products = client.get_all_products()
+            timings.append(time.perf_counter() - start)
+
+        best = min(timings)
+        baseline = baseline or best
+        label = f"auto ({client._resolve_scan_segments()})" if segments == 0 else segments
+        print(f"{label:>9} {stub.calls:>6} {best:>10.3f} {baseline / best:>7.2f}x {len(products):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark /api/products requests per second with and without the response cache.
+
+Requests go through the FastAPI app in-process (httpx ASGITransport), with
+the catalog served from memory as the snapshot cache does, so the numbers
+isolate the API's own work: building ShoeProduct models, validating them and
+encoding the ProductListResponse ("before"), versus returning the stored JSON
+bytes ("after"). Each catalog size is measured for the full list and for a
+filtered query. No AWS account or moto is needed.
+
+Usage (from the repo root):
+    python scripts/bench_response_cache.py --sizes 100 10000 100000
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from app import main  # noqa: E402
+from bench_common import make_catalog  # noqa: E402
+
+# main configures INFO logging; per-request httpx lines would swamp the output
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+QUERIES = ["/api/products", "/api/products?type=running&color=black"]
+
+
+async def requests_per_second(client: httpx.AsyncClient, url: str, seconds: float) -> float:
+    """Send sequential requests for about `seconds` and return the rate."""
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds or count < 3:
+        response = await client.get(url)
+        assert response.status_code == 200
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+async def run(sizes: list, seconds: float):
+    transport = httpx.ASGITransport(app=main.app)
+    print(f"{'products':>8} {'query':<42} {'before (req/s)':>14} {'after (req/s)':>13} {'speedup':>8}")
+    for size in sizes:
+        catalog = make_catalog(size, description="Synthetic benchmark item")
+
+        def filtered(**filters):
+            return main.dynamodb_client._filter_products(catalog, **{
+                k: filters.get(k) for k in ("type", "color", "size", "price_min", "price_max")
+            })
+
+        with patch.object(main.dynamodb_client, "get_all_products", lambda fields=None: catalog), \
+             patch.object(main.dynamodb_client, "get_products_by_filters", filtered), \
+             patch.object(main.dynamodb_client, "get_catalog_version", lambda: f"bench-{size}"):
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for url in QUERIES:
+                    main.response_cache.clear()
+                    main.response_cache.max_bytes = 0
+                    before = await requests_per_second(client, url, seconds)
+
+                    main.response_cache.max_bytes = 1024 * 1024 * 1024
+                    await client.get(url)  # fill the cache
+                    after = await requests_per_second(client, url, seconds)
+
+                    label = url.removeprefix("/api/products") or "(all)"
+                    print(f"{size:>8} {label:<42} {before:>14.1f} {after:>13.1f} {after / before:>7.1f}x")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 100_000])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.seconds))
+
+
+if __name__ == "__main__":
+    main_cli()
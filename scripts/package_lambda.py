@@ -1,11 +1,19 @@
 """
 Script to package the FastAPI backend for Lambda deployment.
 Creates a zip file with all dependencies compatible with Lambda (Linux x86_64).
+
+The package ships precompiled bytecode: /var/task is read-only, so without
+__pycache__ every cold start compiles the app and its dependencies again.
+An import-time profile (python -X importtime) of the handler is printed
+before and after compiling, and the raw log is kept in build/importtime.log.
 """
+import compileall
 import os
+import py_compile
 import shutil
 import subprocess
 import sys
+from collections import defaultdict
 from pathlib import Path
 
 # Paths
@@ -13,6 +21,13 @@ PROJECT_ROOT = Path(__file__).parent.parent
 BACKEND_DIR = PROJECT_ROOT / "backend"
 BUILD_DIR = PROJECT_ROOT / "build" / "lambda"
 OUTPUT_FILE = BACKEND_DIR / "lambda_package.zip"
+IMPORTTIME_LOG = PROJECT_ROOT / "build" / "importtime.log"
+
+# Must match the function runtime (infra/lambda_api.tf)
+LAMBDA_PYTHON_VERSION = "3.11"
+
+# Packages listed in the import-time summary
+IMPORTTIME_TOP_PACKAGES = 10
 
 
 def clean_build_dir():
@@ -28,12 +43,14 @@ def install_dependencies():
 
     # Production dependencies only
     prod_requirements = [
-        "fastapi",
+        "fastapi>=0.115.10",
+        "starlette>=0.46.0",
         "boto3",
         "pydantic",
         "pydantic-settings",
         "python-dotenv",
         "mangum",
+        "numpy",
     ]
 
     # Create temporary requirements file
@@ -50,7 +67,7 @@ def install_dependencies():
         "-t", str(BUILD_DIR),
         "--platform", "manylinux2014_x86_64",
         "--implementation", "cp",
-        "--python-version", "3.11",
+        "--python-version", LAMBDA_PYTHON_VERSION,
         "--only-binary", ":all:",
         "--upgrade",
         "--quiet"
@@ -66,7 +83,7 @@ def install_dependencies():
             "-t", str(BUILD_DIR),
             "--platform", "manylinux2014_x86_64",
             "--implementation", "cp",
-            "--python-version", "3.11",
+            "--python-version", LAMBDA_PYTHON_VERSION,
             "--upgrade",
             "--quiet"
         ], check=True)
@@ -126,6 +143,74 @@ def cleanup_build():
     print("Cleanup complete.")
 
 
+def compile_bytecode():
+    """Precompile the package so the runtime does not compile it on every cold start."""
+    if f"{sys.version_info.major}.{sys.version_info.minor}" != LAMBDA_PYTHON_VERSION:
+        print(
+            f"WARNING: Skipping bytecode: Python {sys.version_info.major}.{sys.version_info.minor} "
+            f"cannot write bytecode for the python{LAMBDA_PYTHON_VERSION} runtime."
+        )
+        return
+
+    # Zip files do not keep mtimes exactly, so validate by hash (never, in fact:
+    # the package is immutable once deployed)
+    compileall.compile_dir(
+        str(BUILD_DIR),
+        quiet=1,
+        workers=0,
+        invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+    )
+    print("Compiled bytecode.")
+
+
+def profile_imports(label: str):
+    """
+    Import the handler from the build directory under -X importtime and summarize.
+
+    Runs without site-packages (-S) so only packaged modules are found, and
+    without writing bytecode (-B) so the build directory is left as it was.
+
+    Args:
+        label: Name of this measurement in the output and the log
+
+    Returns:
+        Total import time of lambda_handler in seconds, or None if it could
+        not be imported here (e.g. wheels built for another platform)
+    """
+    result = subprocess.run(
+        [sys.executable, "-S", "-B", "-X", "importtime", "-c", "import lambda_handler"],
+        cwd=BUILD_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        last_line = result.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        print(f"WARNING: Could not profile imports ({label}): {last_line[0]}")
+        return None
+
+    IMPORTTIME_LOG.parent.mkdir(parents=True, exist_ok=True)
+    with IMPORTTIME_LOG.open("a") as log:
+        log.write(f"# {label}\n{result.stderr}\n")
+
+    # Lines look like "import time:  self [us] | cumulative | module"
+    self_by_package = defaultdict(int)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        module = module.strip()
+        self_by_package[module.split(".")[0]] += int(self_us)
+        if module == "lambda_handler":
+            total_us = int(cumulative_us)
+
+    print(f"Import time ({label}): {total_us / 1000:.0f} ms")
+    top = sorted(self_by_package.items(), key=lambda item: -item[1])[:IMPORTTIME_TOP_PACKAGES]
+    for package, self_us in top:
+        print(f"  {package:<24} {self_us / 1000:>8.1f} ms {self_us / total_us:>6.1%}")
+    return total_us / 1_000_000
+
+
 def create_zip():
     """Create the Lambda deployment package."""
     if OUTPUT_FILE.exists():
@@ -158,6 +243,18 @@ def main():
     install_dependencies()
     copy_application_code()
     cleanup_build()
+
+    if IMPORTTIME_LOG.exists():
+        IMPORTTIME_LOG.unlink()
+    source_seconds = profile_imports("source only")
+    compile_bytecode()
+    compiled_seconds = profile_imports("precompiled")
+    if source_seconds and compiled_seconds:
+        print(
+            f"Handler import: {source_seconds * 1000:.0f} ms -> {compiled_seconds * 1000:.0f} ms "
+            f"({1 - compiled_seconds / source_seconds:.0%} less). Full log: {IMPORTTIME_LOG}"
+        )
+
     create_zip()
 
     print("=" * 60)
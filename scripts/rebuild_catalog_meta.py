@@ -0,0 +1,43 @@
+"""
+Rebuild or verify the catalog metadata item in ShoeInventory.
+
+The backend answers /api/categories from a single metadata item instead of
+scanning the table. Run this after loading or changing products:
+
+    python scripts/rebuild_catalog_meta.py           # rebuild from a full scan
+    python scripts/rebuild_catalog_meta.py --check   # compare with a full scan
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "backend"))
+
+from app.dynamodb_client import DynamoDBClient  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the catalog metadata item")
+    parser.add_argument("--check", action="store_true", help="Only report drift")
+    parser.add_argument("--table", default=os.getenv("DYNAMODB_TABLE_NAME", "ShoeInventory"))
+    parser.add_argument("--region", default=os.getenv("AWS_REGION", "us-east-1"))
+    args = parser.parse_args()
+
+    client = DynamoDBClient(table_name=args.table, region=args.region)
+
+    if args.check:
+        report = client.check_categories_consistency()
+        print(json.dumps(report, indent=2))
+        sys.exit(0 if report["consistent"] else 1)
+
+    meta = client.rebuild_categories()
+    print(f"Rebuilt catalog metadata: {meta['item_count']} products, "
+          f"{len(meta['types'])} types, {len(meta['colors'])} colors, "
+          f"version {meta['version']}")
+
+
+if __name__ == "__main__":
+    main()